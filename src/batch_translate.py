@@ -0,0 +1,236 @@
+"""
+Traducción por lotes de videos grabados, sin cámara ni interfaz gráfica.
+
+Cada archivo se procesa en un proceso del pool, con su propia instancia de
+MediaPipe Hands y su propio predictor. Cada proceso limita los hilos de
+TensorFlow a su parte de los núcleos, para que entre todos no los saturen. Dentro de un archivo primero se
+extraen los keypoints de todos los frames, se remuestrean sobre la misma
+rejilla de LIVE_SAMPLE_FPS que usan la captura de muestras y la GUI (así cada
+ventana cubre el mismo tiempo que en el entrenamiento, sea cual sea el FPS
+del video) y después se puntúan todas las ventanas deslizantes en pasadas por
+lotes. Por eso el backend por defecto es
+`keras`: los modelos TFLite se exportan con lote 1 y puntúan las ventanas
+una a una.
+
+Uso:
+    python src/batch_translate.py VIDEO_O_CARPETA [...] -o predicciones.jsonl
+           [--workers 4] [--threads-per-worker 2] [--backend keras] [--batch-size 256] [--window-step 1]
+           [--min-confidence 0.0]
+
+El formato de salida se deduce de la extensión (.jsonl o .csv).
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import csv
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import cv2
+import numpy as np
+from utils.constants import SEQUENCE_LENGTH, KEYPOINT_DIM, MODELS_PATH, BATCH_BACKEND, LIVE_SAMPLE_FPS
+from utils.keypoints import extract_keypoints, SequenceSampler
+from utils.predictor import load_predictor, load_label_map, resolve_backend, BACKENDS
+
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv', '.webm', '.m4v')
+OUTPUT_FIELDS = ['file', 'start_frame', 'end_frame', 'start_s', 'end_s', 'label', 'confidence']
+
+# Estado por proceso del pool (se crea una vez en `init_worker`)
+_worker = {}
+
+
+def find_videos(paths):
+    """Expande archivos y carpetas en una lista ordenada de videos."""
+    videos = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                videos.extend(os.path.join(root, f) for f in files if f.lower().endswith(VIDEO_EXTENSIONS))
+        elif os.path.isfile(path):
+            videos.append(path)
+        else:
+            print(f"Advertencia: no se encontró '{path}'.")
+    return sorted(videos)
+
+
+def extract_video_keypoints(video_path, hands):
+    """Devuelve (keypoints (T, KEYPOINT_DIM), tiempos en segundos (T,), fps) de un video."""
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise IOError(f"No se puede abrir el video '{video_path}'")
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    capacity = max(int(cap.get(cv2.CAP_PROP_FRAME_COUNT)), SEQUENCE_LENGTH)
+    keypoints = np.zeros((capacity, KEYPOINT_DIM), dtype=np.float32)
+    timestamps = np.zeros(capacity, dtype=np.float64)
+
+    n_frames = 0
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        if n_frames == capacity:
+            # El conteo de frames del contenedor puede ser inexacto
+            capacity *= 2
+            keypoints = np.resize(keypoints, (capacity, KEYPOINT_DIM))
+            timestamps = np.resize(timestamps, capacity)
+        pos_ms = cap.get(cv2.CAP_PROP_POS_MSEC)
+        timestamps[n_frames] = pos_ms / 1000 if pos_ms > 0 else n_frames / fps
+        results = hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        extract_keypoints(results, out=keypoints[n_frames])
+        n_frames += 1
+    cap.release()
+    return keypoints[:n_frames], timestamps[:n_frames], fps
+
+
+def resample_to_grid(keypoints, timestamps, fps=LIVE_SAMPLE_FPS):
+    """Lleva los keypoints de cada frame a la rejilla de `fps` muestras por segundo.
+
+    Devuelve (keypoints por muestra, instante de cada muestra en la rejilla,
+    frame de origen de cada muestra). Como en tiempo real, un frame que llega
+    tras varios instantes de la rejilla ocupa todos esos huecos. Con `fps=None`
+    cada frame es una muestra.
+    """
+    if fps is None or len(timestamps) == 0:
+        return keypoints, timestamps, np.arange(len(timestamps))
+    sampler = SequenceSampler(length=None, fps=fps)
+    sampler.start('video', timestamps[0])
+    sources = []
+    for i, timestamp in enumerate(timestamps):
+        sample = sampler.offer(timestamp)
+        if sample is not None:
+            sources.extend([i] * len(sample[1]))
+    sources = np.array(sources, dtype=np.int64)
+    times = timestamps[0] + np.arange(len(sources)) / fps
+    return keypoints[sources], times, sources
+
+
+def score_windows(predictor, keypoints, batch_size, window_step=1):
+    """Puntúa todas las ventanas deslizantes en lotes. Devuelve (índices de inicio, probabilidades)."""
+    if len(keypoints) < SEQUENCE_LENGTH:
+        return np.zeros(0, dtype=int), np.zeros((0, 0), dtype=np.float32)
+    # Vista (n_ventanas, SEQUENCE_LENGTH, KEYPOINT_DIM) sin copiar los datos
+    windows = np.lib.stride_tricks.sliding_window_view(keypoints, SEQUENCE_LENGTH, axis=0)
+    windows = windows.transpose(0, 2, 1)[::window_step]
+    starts = np.arange(0, len(keypoints) - SEQUENCE_LENGTH + 1, window_step)
+    probs = [predictor.predict_batch(np.ascontiguousarray(windows[i:i + batch_size]))
+             for i in range(0, len(windows), batch_size)]
+    return starts, np.concatenate(probs)
+
+
+def init_worker(backend, models_path, threads):
+    # Antes de importar TensorFlow: sus grupos de hilos se dimensionan al cargarse
+    for var in ('OMP_NUM_THREADS', 'TF_NUM_INTRAOP_THREADS'):
+        os.environ[var] = str(threads)
+    os.environ['TF_NUM_INTEROP_THREADS'] = '1'
+    if resolve_backend(backend, models_path) == 'keras':
+        import tensorflow as tf
+
+        tf.config.threading.set_intra_op_parallelism_threads(threads)
+        tf.config.threading.set_inter_op_parallelism_threads(1)
+    import mediapipe as mp
+
+    _worker['hands'] = mp.solutions.hands.Hands(
+        static_image_mode=False, max_num_hands=2, min_detection_confidence=0.5)
+    _worker['predictor'] = load_predictor(backend, models_path)
+    _worker['label_map'] = load_label_map(models_path, _worker['predictor'])
+
+
+def translate_video(video_path, batch_size, window_step, min_confidence, sample_fps=LIVE_SAMPLE_FPS):
+    """Procesa un video en el proceso actual y devuelve sus filas de salida.
+
+    Los frames de cada fila son los de origen de la primera y la última muestra
+    de la ventana; los tiempos, los de la rejilla de muestreo.
+    """
+    start = time.perf_counter()
+    keypoints, timestamps, fps = extract_video_keypoints(video_path, _worker['hands'])
+    samples, sample_times, sources = resample_to_grid(keypoints, timestamps, sample_fps)
+    starts, probs = score_windows(_worker['predictor'], samples, batch_size, window_step)
+
+    label_map = _worker['label_map']
+    rows = []
+    for start_frame, res in zip(starts, probs):
+        idx = int(np.argmax(res))
+        confidence = float(res[idx])
+        if confidence < min_confidence:
+            continue
+        end = int(start_frame) + SEQUENCE_LENGTH - 1
+        rows.append({
+            'file': video_path,
+            'start_frame': int(sources[start_frame]),
+            'end_frame': int(sources[end]),
+            'start_s': round(float(sample_times[start_frame]), 3),
+            'end_s': round(float(sample_times[end]), 3),
+            'label': label_map[str(idx)],
+            'confidence': round(confidence, 4),
+        })
+    return video_path, rows, len(keypoints), time.perf_counter() - start
+
+
+def write_rows(writer, fmt, rows):
+    for row in rows:
+        if fmt == 'csv':
+            writer.writerow(row)
+        else:
+            writer.write(json.dumps(row, ensure_ascii=False) + '\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('inputs', nargs='+', help="Videos o carpetas con videos")
+    parser.add_argument('-o', '--output', required=True, help="Archivo de salida .jsonl o .csv")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--threads-per-worker', type=int, default=None,
+                        help="Hilos de TensorFlow por proceso (por defecto, núcleos / procesos)")
+    parser.add_argument('--backend', choices=BACKENDS, default=BATCH_BACKEND,
+                        help="Backend del modelo (por defecto, keras: los backends TFLite "
+                             "no procesan lotes y puntúan una ventana por pasada)")
+    parser.add_argument('--models-dir', default=MODELS_PATH)
+    parser.add_argument('--batch-size', type=int, default=256, help="Ventanas por pasada del modelo")
+    parser.add_argument('--window-step', type=int, default=1, help="Puntuar una de cada N ventanas")
+    parser.add_argument('--min-confidence', type=float, default=0.0,
+                        help="Omitir ventanas con confianza menor")
+    args = parser.parse_args()
+
+    videos = find_videos(args.inputs)
+    if not videos:
+        print("No se encontraron videos para procesar.")
+        return
+    fmt = 'csv' if args.output.lower().endswith('.csv') else 'jsonl'
+    workers = max(1, min(args.workers, len(videos)))
+    threads = args.threads_per_worker or max(1, (os.cpu_count() or 1) // workers)
+    print(f"🎬 {len(videos)} videos, {workers} procesos × {threads} hilos, salida {fmt.upper()} en {args.output}")
+    if args.backend != 'keras':
+        print(f"⚠️ Con el backend '{args.backend}' las ventanas pueden puntuarse de una en una "
+              f"(solo 'keras' procesa lotes en una sola pasada).")
+
+    start = time.perf_counter()
+    total_frames = 0
+    with open(args.output, 'w', newline='', encoding='utf-8') as f, \
+            ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                initargs=(args.backend, args.models_dir, threads)) as pool:
+        writer = csv.DictWriter(f, fieldnames=OUTPUT_FIELDS) if fmt == 'csv' else f
+        if fmt == 'csv':
+            writer.writeheader()
+
+        futures = {pool.submit(translate_video, video, args.batch_size, args.window_step,
+                               args.min_confidence): video for video in videos}
+        for done, future in enumerate(as_completed(futures), start=1):
+            try:
+                video, rows, n_frames, elapsed = future.result()
+            except Exception as e:
+                print(f"❌ [{done}/{len(videos)}] Error en {futures[future]}: {e}")
+                continue
+            write_rows(writer, fmt, rows)
+            total_frames += n_frames
+            print(f"✅ [{done}/{len(videos)}] {video}: {n_frames} frames, {len(rows)} ventanas "
+                  f"({n_frames / elapsed:.1f} frames/s)")
+
+    elapsed = time.perf_counter() - start
+    print(f"\nListo: {total_frames} frames en {elapsed:.1f}s ({total_frames / elapsed:.1f} frames/s en total)")
+
+
+if __name__ == "__main__":
+    main()
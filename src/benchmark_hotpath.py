@@ -0,0 +1,189 @@
+"""
+Micro-benchmarks del camino crítico con umbrales de regresión.
+
+Mide cada etapa por separado con entradas sintéticas, sin cámara ni MediaPipe:
+- extracción de keypoints desde resultados simulados de MediaPipe;
+- actualización de la ventana de secuencia;
+- pasada del modelo con lote 1 y con lote N;
+- conversión del frame a QImage y escalado para mostrarlo.
+
+La primera ejecución con --save-baseline guarda las medianas; las siguientes
+las comparan y terminan con código 1 si alguna etapa empeora más que el umbral.
+
+Uso:
+    python src/benchmark_hotpath.py --save-baseline
+    python src/benchmark_hotpath.py [--threshold 25] [--backend keras] [--only keypoints,window]
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import json
+import platform
+import time
+from types import SimpleNamespace
+
+import numpy as np
+from utils.constants import SEQUENCE_LENGTH, KEYPOINT_DIM, MODELS_PATH
+from utils.keypoints import extract_keypoints, SequenceBuffer, LANDMARKS_PER_HAND, MAX_HANDS
+
+BASELINE_PATH = 'data/benchmarks/hotpath_baseline.json'
+FRAME_SHAPE = (480, 640, 3)
+DISPLAY_SIZE = (800, 600)
+BATCH_N = 8
+
+
+def fake_results(n_hands=MAX_HANDS):
+    """Simula la salida de `hands.process()` con `n_hands` manos."""
+    rng = np.random.default_rng(0)
+    hands = []
+    for _ in range(n_hands):
+        landmarks = [SimpleNamespace(x=x, y=y, z=z) for x, y, z in rng.random((LANDMARKS_PER_HAND, 3))]
+        hands.append(SimpleNamespace(landmark=landmarks))
+    return SimpleNamespace(multi_hand_landmarks=hands)
+
+
+def time_stage(fn, runs, warmup=10):
+    """Devuelve las latencias en microsegundos de `runs` llamadas a `fn`."""
+    for _ in range(warmup):
+        fn()
+    latencies = np.empty(runs)
+    for i in range(runs):
+        start = time.perf_counter()
+        fn()
+        latencies[i] = (time.perf_counter() - start) * 1e6
+    return latencies
+
+
+def bench_keypoints():
+    results = fake_results()
+    out = np.zeros(KEYPOINT_DIM, dtype=np.float32)
+    return lambda: extract_keypoints(results, out=out)
+
+
+def bench_window():
+    buffer = SequenceBuffer()
+    frame = np.random.random(KEYPOINT_DIM).astype(np.float32)
+
+    def step():
+        buffer.append(frame)
+        buffer.window()
+    return step
+
+
+def bench_model(backend, models_dir, batch):
+    from benchmark_inference import ensure_models
+    from utils.predictor import load_predictor
+
+    predictor = load_predictor(backend, ensure_models(models_dir))
+    predictor.warmup()
+    windows = np.random.random((batch, SEQUENCE_LENGTH, KEYPOINT_DIM)).astype(np.float32)
+    if batch == 1:
+        return lambda: predictor.predict(windows[0])
+    return lambda: predictor.predict_batch(windows)
+
+
+def bench_qimage():
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtGui import QPixmap
+    from PyQt5.QtWidgets import QApplication
+    from utils.rendering import FrameRenderer
+
+    bench_qimage.app = QApplication.instance() or QApplication([])
+    frame = np.random.randint(0, 255, FRAME_SHAPE, dtype=np.uint8)
+    keypoints = extract_keypoints(fake_results())
+    renderer = FrameRenderer()
+
+    # Mismo camino que SignTranslatorGUI.update_frame, con la superposición de las dos manos
+    def step():
+        QPixmap.fromImage(renderer.render(frame, keypoints, *DISPLAY_SIZE))
+    return step
+
+
+def build_stages(backend, models_dir):
+    return {
+        'keypoints': bench_keypoints,
+        'window': bench_window,
+        'model_batch1': lambda: bench_model(backend, models_dir, 1),
+        f'model_batch{BATCH_N}': lambda: bench_model(backend, models_dir, BATCH_N),
+        'frame_qimage': bench_qimage,
+    }
+
+
+def compare(results, baseline, threshold):
+    """Devuelve las etapas cuya mediana supera a la de referencia en más de `threshold` %."""
+    regressions = []
+    for name, res in results.items():
+        ref = baseline.get('stages', {}).get(name)
+        if ref is None:
+            continue
+        change = (res['p50_us'] / ref['p50_us'] - 1) * 100
+        res['change_pct'] = change
+        if change > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=300)
+    parser.add_argument('--backend', choices=('keras', 'tflite'), default='keras')
+    parser.add_argument('--models-dir', default=MODELS_PATH)
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true', help="Guardar los resultados como referencia")
+    parser.add_argument('--threshold', type=float, default=25.0,
+                        help="Empeoramiento máximo de la mediana respecto a la referencia, en %%")
+    parser.add_argument('--only', help="Etapas separadas por comas (por defecto, todas)")
+    args = parser.parse_args()
+
+    stages = build_stages(args.backend, args.models_dir)
+    if args.only:
+        names = args.only.split(',')
+        unknown = set(names) - set(stages)
+        if unknown:
+            parser.error(f"Etapas desconocidas: {', '.join(sorted(unknown))} (disponibles: {', '.join(stages)})")
+        stages = {name: stages[name] for name in names}
+
+    results = {}
+    for name, setup in stages.items():
+        try:
+            fn = setup()
+        except ImportError as e:
+            print(f"⚠️ Se omite '{name}': {e}")
+            continue
+        latencies = time_stage(fn, args.runs)
+        results[name] = {
+            'p50_us': float(np.percentile(latencies, 50)),
+            'p95_us': float(np.percentile(latencies, 95)),
+        }
+
+    baseline = None
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold) if baseline else []
+
+    print(f"\n{'etapa':<16}{'p50 (µs)':>12}{'p95 (µs)':>12}{'vs ref.':>10}")
+    for name, res in results.items():
+        change = f"{res['change_pct']:+.0f}%" if 'change_pct' in res else '-'
+        mark = '  ❌' if name in regressions else ''
+        print(f"{name:<16}{res['p50_us']:>12.1f}{res['p95_us']:>12.1f}{change:>10}{mark}")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline) or '.', exist_ok=True)
+        with open(args.baseline, 'w') as f:
+            json.dump({'machine': platform.node(), 'backend': args.backend, 'runs': args.runs,
+                       'stages': results}, f, indent=2)
+        print(f"\n💾 Referencia guardada en {args.baseline}")
+    elif baseline is None:
+        print(f"\nℹ️ Sin referencia en {args.baseline}; ejecuta con --save-baseline para crearla.")
+    elif regressions:
+        print(f"\n❌ Regresión de más del {args.threshold:.0f}% en: {', '.join(regressions)}")
+        sys.exit(1)
+    else:
+        print(f"\n✅ Ninguna etapa empeora más del {args.threshold:.0f}%")
+
+
+if __name__ == "__main__":
+    main()
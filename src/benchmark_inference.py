@@ -0,0 +1,124 @@
+"""
+Compara los backends de inferencia: latencia por predicción, tiempo de carga,
+memoria (RSS máxima) y diferencia de salidas respecto a Keras.
+
+Cada backend se mide en un proceso independiente para que la memoria y el
+tiempo de importación de uno no contaminen al otro.
+
+Uso:
+    python src/benchmark_inference.py [--runs 200] [--models-dir src/models]
+
+Si no existe un modelo entrenado se usa uno sin entrenar con la misma arquitectura.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import json
+import subprocess
+import tempfile
+import time
+
+import numpy as np
+from utils.constants import ACTIONS, SEQUENCE_LENGTH, KEYPOINT_DIM, MODELS_PATH
+from utils.metrics import peak_rss_mb
+
+# 'keras-predict' es la referencia: model.predict() por cada ventana
+BENCH_BACKENDS = ('keras-predict', 'keras', 'tflite')
+N_CHECK_WINDOWS = 16
+
+
+def time_calls(fn, runs):
+    """Devuelve las latencias en milisegundos de `runs` llamadas a `fn`."""
+    latencies = np.empty(runs)
+    for i in range(runs):
+        start = time.perf_counter()
+        fn()
+        latencies[i] = (time.perf_counter() - start) * 1000
+    return latencies
+
+
+def ensure_models(models_dir):
+    """Devuelve una carpeta con actions.keras y actions.tflite, creándolos si faltan."""
+    if all(os.path.exists(os.path.join(models_dir, f)) for f in ('actions.keras', 'actions.tflite')):
+        return models_dir
+    from train_model import create_model, export_tflite
+    print(f"⚠️ No se encontraron los modelos en {models_dir}; se usa un modelo sin entrenar.")
+    tmp_dir = tempfile.mkdtemp()
+    model = create_model((SEQUENCE_LENGTH, KEYPOINT_DIM), len(ACTIONS))
+    model.save(os.path.join(tmp_dir, 'actions.keras'))
+    export_tflite(model, os.path.join(tmp_dir, 'actions.tflite'))
+    return tmp_dir
+
+
+def run_backend(backend, models_dir, runs):
+    """Mide un backend dentro del proceso actual."""
+    from utils.predictor import load_predictor
+
+    # La carga incluye la importación perezosa de TensorFlow o del runtime TFLite
+    start = time.perf_counter()
+    predictor = load_predictor('keras' if backend == 'keras-predict' else backend, models_dir)
+    predictor.warmup()
+    load_s = time.perf_counter() - start
+
+    rng = np.random.default_rng(0)
+    windows = rng.random((N_CHECK_WINDOWS, SEQUENCE_LENGTH, KEYPOINT_DIM), dtype=np.float32)
+
+    if backend == 'keras-predict':
+        predict = lambda w: predictor.model.predict(np.expand_dims(w, axis=0), verbose=0)[0]
+    else:
+        predict = predictor.predict
+
+    predict(windows[0])
+    latencies = time_calls(lambda: predict(windows[0]), runs)
+    outputs = np.stack([predict(w) for w in windows])
+
+    return {
+        'backend': backend,
+        'load_s': load_s,
+        'p50_ms': float(np.percentile(latencies, 50)),
+        'p95_ms': float(np.percentile(latencies, 95)),
+        'rss_mb': peak_rss_mb(),
+        'outputs': outputs.tolist(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--models-dir', default=MODELS_PATH)
+    parser.add_argument('--runs', type=int, default=200)
+    parser.add_argument('--backend', choices=BENCH_BACKENDS,
+                        help="Mide solo este backend e imprime el resultado en JSON (uso interno)")
+    args = parser.parse_args()
+
+    if args.backend:
+        print(json.dumps(run_backend(args.backend, args.models_dir, args.runs)))
+        return
+
+    models_dir = ensure_models(args.models_dir)
+    results = []
+    for backend in BENCH_BACKENDS:
+        print(f"⏱️ Midiendo backend '{backend}'...")
+        proc = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--backend', backend,
+             '--models-dir', models_dir, '--runs', str(args.runs)],
+            capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            print(f"❌ Error en '{backend}':\n{proc.stderr[-2000:]}")
+            continue
+        results.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+    reference = next((np.array(r['outputs']) for r in results if r['backend'] == 'keras'), None)
+    print(f"\n📊 Comparación de backends ({args.runs} ejecuciones, lote 1)")
+    print(f"{'backend':<14}{'carga':>9}{'p50':>10}{'p95':>10}{'RSS':>10}{'dif. máx':>11}")
+    for r in results:
+        diff = np.abs(np.array(r['outputs']) - reference).max() if reference is not None else float('nan')
+        rss = f"{r['rss_mb']:.0f} MB" if r['rss_mb'] is not None else "n/d"
+        print(f"{r['backend']:<14}{r['load_s']:>8.2f}s"
+              f"{r['p50_ms']:>7.2f} ms{r['p95_ms']:>7.2f} ms{rss:>10}{diff:>11.1e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Mide el arranque de la GUI: tiempo hasta mostrar la ventana, hasta tener el
+modelo listo (modelo, label map y MediaPipe cargados y calentados) y hasta la
+primera predicción real sobre la cámara o la fuente indicada con --source.
+
+Lanza `main_gui.py --startup-benchmark --no-gate` varias veces (sin la puerta
+de inferencia, para que la primera ventana se prediga aunque no haya manos) y
+resume la mediana. Con `--history` se añade cada resumen a un archivo JSONL
+para ver regresiones.
+
+Uso:
+    python src/benchmark_startup.py [--runs 5] [--backend auto] [--offscreen]
+                                    [--source sesiones/20250101_120000]
+                                    [--history startup_history.jsonl]
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import json
+import statistics
+import subprocess
+import time
+
+from utils.predictor import BACKENDS
+
+GUI_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'main_gui.py')
+
+
+def measure_once(backend, offscreen, source=None):
+    env = dict(os.environ)
+    env['LESAI_LAUNCH_TIME'] = repr(time.time())
+    if offscreen:
+        env['QT_QPA_PLATFORM'] = 'offscreen'
+    command = [sys.executable, GUI_SCRIPT, '--backend', backend, '--startup-benchmark', '--no-gate']
+    if source is not None:
+        command += ['--source', source]
+    proc = subprocess.run(command, capture_output=True, text=True, env=env)
+    for line in proc.stdout.splitlines():
+        if line.startswith('STARTUP '):
+            return json.loads(line[len('STARTUP '):])
+    raise RuntimeError(f"La GUI no informó tiempos de arranque:\n{proc.stderr[-2000:]}")
+
+
+def median_of(runs, event):
+    """Mediana de un evento en las ejecuciones que lo registraron, o None."""
+    values = [r[event] for r in runs if event in r]
+    return statistics.median(values) if values else None
+
+
+def format_time(value):
+    return f"{value:.2f}s" if value is not None else "—"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--backend', choices=BACKENDS, default='auto')
+    parser.add_argument('--offscreen', action='store_true', help="Usar la plataforma Qt 'offscreen' (sin pantalla)")
+    parser.add_argument('--source', help="Video o sesión grabada en lugar de la cámara")
+    parser.add_argument('--history', help="Archivo JSONL donde acumular los resultados")
+    args = parser.parse_args()
+
+    runs = []
+    for i in range(args.runs):
+        times = measure_once(args.backend, args.offscreen, args.source)
+        runs.append(times)
+        # Un evento falta si la GUI terminó antes (error de la fuente o tiempo agotado)
+        print(f"Ejecución {i + 1}/{args.runs}: ventana {format_time(times.get('window'))}, "
+              f"modelo listo {format_time(times.get('model_ready'))}, "
+              f"primera predicción {format_time(times.get('first_prediction'))}")
+
+    summary = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'backend': args.backend,
+        'runs': args.runs,
+        'time_to_window_s': median_of(runs, 'window'),
+        'time_to_model_ready_s': median_of(runs, 'model_ready'),
+        'time_to_first_prediction_s': median_of(runs, 'first_prediction'),
+    }
+    print(f"\n🚀 Mediana: ventana {format_time(summary['time_to_window_s'])}, "
+          f"modelo listo {format_time(summary['time_to_model_ready_s'])}, "
+          f"primera predicción {format_time(summary['time_to_first_prediction_s'])}")
+
+    if args.history:
+        with open(args.history, 'a') as f:
+            f.write(json.dumps(summary) + '\n')
+        print(f"Resultado añadido a {args.history}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,128 +1,139 @@
 """
 Script para capturar muestras de señas directamente como keypoints.
 Este script es interactivo y te guía a través del proceso para hacerlo menos tedioso.
+
+La cámara se lee a su ritmo nativo y cada muestra toma SEQUENCE_LENGTH frames
+a CAPTURE_FPS según su instante, así que las secuencias duran lo mismo en
+cualquier equipo; MediaPipe y el guardado en disco corren en sus propios hilos
+(ver utils/capture.py).
+
+Uso:
+    python src/capture_samples.py [--continuous] [--gap 1.0] [--source 0] [--record sesiones/]
 """
+import sys
 import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import time
 import cv2
-import numpy as np
 import mediapipe as mp
-from utils.constants import ACTIONS, NO_SEQUENCES, SEQUENCE_LENGTH, KEYPOINTS_PATH
+from utils.constants import ACTIONS, NO_SEQUENCES, SEQUENCE_LENGTH, KEYPOINTS_PATH, CAPTURE_FPS
+from utils.capture import SampleCapture
+from utils.frame_source import open_frame_source, SessionRecorder
+from utils.rendering import draw_hands
+
+WINDOW = 'Captura de Señas'
 
 # Crear la carpeta de keypoints si no existe
 os.makedirs(KEYPOINTS_PATH, exist_ok=True)
 
 # Inicializar MediaPipe Hands
-mp_hands = mp.solutions.hands
-mp_drawing = mp.solutions.drawing_utils
-mp_drawing_styles = mp.solutions.drawing_styles
-
-hands = mp_hands.Hands(
+hands = mp.solutions.hands.Hands(
     static_image_mode=False,
     max_num_hands=2,
     min_detection_confidence=0.5,
     min_tracking_confidence=0.5
 )
 
-def extract_keypoints(results):
-    """Extrae 126 keypoints de los resultados de MediaPipe."""
-    keypoints = []
-    if results.multi_hand_landmarks:
-        for hand_landmarks in results.multi_hand_landmarks:
-            for landmark in hand_landmarks.landmark:
-                keypoints.extend([landmark.x, landmark.y, landmark.z])
-    # Rellenar o recortar a 126
-    keypoints = keypoints[:126]
-    while len(keypoints) < 126:
-        keypoints.append(0.0)
-    return np.array(keypoints, dtype=np.float32)
-
-def main():
-    cap = cv2.VideoCapture(0)
-    if not cap.isOpened():
-        print("Error: No se puede acceder a la cámara.")
-        return
-
-    for action in ACTIONS:
-        # Crear la carpeta para la acción
-        action_path = os.path.join(KEYPOINTS_PATH, action)
-        os.makedirs(action_path, exist_ok=True)
-
-        print(f'\n' + '='*50)
-        print(f'PREPÁRATE PARA LA SEÑA: "{action.upper()}"')
-        print(f'Capturaremos {NO_SEQUENCES} muestras.')
-        print(f'Presiona la BARRA ESPACIADORA para comenzar cada muestra.')
-        print(f'Presiona "q" para salir en cualquier momento.')
-        print('='*50)
-
-        for sequence in range(NO_SEQUENCES):
+def show(capture, lines, color, landmarks=False):
+    """Muestra el último frame con texto (y landmarks) y devuelve la tecla pulsada."""
+    item = capture.preview.get(timeout=0.05)
+    if item is not None:
+        # Copia: el mismo frame puede estar pasando por MediaPipe en otro hilo
+        frame = item[2].copy()
+        if landmarks and capture.landmarks.latest is not None:
+            draw_hands(frame, capture.landmarks.latest)
+        for i, (text, scale) in enumerate(lines):
+            cv2.putText(frame, text, (15, 30 + 40 * i), cv2.FONT_HERSHEY_SIMPLEX, scale, color, 2, cv2.LINE_AA)
+        cv2.imshow(WINDOW, frame)
+    return cv2.waitKey(1) & 0xFF
+
+def capture_action(capture, action, continuous, gap):
+    """Graba las NO_SEQUENCES muestras de una acción. Devuelve False si el usuario sale."""
+    action_path = os.path.join(KEYPOINTS_PATH, action)
+    os.makedirs(action_path, exist_ok=True)
+
+    for sequence in range(NO_SEQUENCES):
+        label = f'"{action}" ({sequence+1}/{NO_SEQUENCES})'
+        if not continuous or sequence == 0:
             print(f"\nMuestra {sequence+1}/{NO_SEQUENCES} para '{action}' - ¡LISTO! Presiona ESPACIO para grabar...")
-
             # Esperar a que el usuario presione ESPACIO
             while True:
-                ret, frame = cap.read()
-                if not ret:
-                    continue
-
-                # Mostrar instrucciones en el frame
-                cv2.putText(frame, f'PREPARANDO: "{action}" ({sequence+1}/{NO_SEQUENCES})', 
-                            (15, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2, cv2.LINE_AA)
-                cv2.putText(frame, 'Presiona ESPACIO para grabar', 
-                            (15, 70), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 255), 2, cv2.LINE_AA)
-                cv2.imshow('Captura de Señas - Presiona ESPACIO', frame)
-
-                key = cv2.waitKey(1) & 0xFF
+                key = show(capture, [(f'PREPARANDO: {label}', 1), ('Presiona ESPACIO para grabar', 0.8)], (0, 255, 0))
                 if key == ord(' '):  # Barra espaciadora
                     break
-                elif key == ord('q'):
-                    cap.release()
-                    cv2.destroyAllWindows()
-                    return
-
-            # Grabar la secuencia
-            keypoints_sequence = []
-            for frame_num in range(SEQUENCE_LENGTH):
-                ret, frame = cap.read()
-                if not ret:
-                    break
-
-                # Procesar el frame
-                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                results = hands.process(frame_rgb)
-
-                # Dibujar los landmarks en el frame para feedback visual
-                if results.multi_hand_landmarks:
-                    for hand_landmarks in results.multi_hand_landmarks:
-                        mp_drawing.draw_landmarks(
-                            frame, hand_landmarks, mp_hands.HAND_CONNECTIONS,
-                            mp_drawing_styles.get_default_hand_landmarks_style(),
-                            mp_drawing_styles.get_default_hand_connections_style()
-                        )
-
-                # Extraer y guardar los keypoints
-                keypoints = extract_keypoints(results)
-                keypoints_sequence.append(keypoints)
-
-                # Mostrar feedback en el frame
-                cv2.putText(frame, f'GRABANDO: {action}', (15, 30), 
-                            cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2, cv2.LINE_AA)
-                cv2.putText(frame, f'Frame: {frame_num+1}/{SEQUENCE_LENGTH}', (15, 70), 
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 2, cv2.LINE_AA)
-                cv2.imshow('Captura de Señas - GRABANDO', frame)
-
-                # Pequeña pausa para que la seña sea fluida
-                if cv2.waitKey(50) & 0xFF == ord('q'):
-                    break
-
-            # Guardar la secuencia de keypoints
-            sequence_path = os.path.join(action_path, f"{sequence}.npy")
-            np.save(sequence_path, np.array(keypoints_sequence))
-
-            print(f"  -> Muestra {sequence+1} guardada en {sequence_path}")
-
-    cap.release()
-    cv2.destroyAllWindows()
-    print("\n¡Captura completada con éxito!")
+                if key == ord('q'):
+                    return False
+        else:
+            # Modo continuo: pausa breve para volver a la posición inicial
+            resume = time.perf_counter() + gap
+            while time.perf_counter() < resume:
+                remaining = resume - time.perf_counter()
+                if show(capture, [(f'SIGUIENTE: {label}', 1), (f'en {remaining:.1f}s', 0.8)], (0, 255, 255)) == ord('q'):
+                    return False
+
+        sequence_path = os.path.join(action_path, f"{sequence}.npy")
+        capture.record(sequence_path, action=action, sequence=sequence, fps=CAPTURE_FPS)
+        while capture.sampler.recording:
+            lines = [(f'GRABANDO: {action}', 1), (f'Frame: {capture.sampler.progress}/{SEQUENCE_LENGTH}', 0.8)]
+            if show(capture, lines, (0, 0, 255), landmarks=True) == ord('q'):
+                capture.cancel()
+                return False
+        # Se guarda en segundo plano en cuanto MediaPipe termina de procesarla
+        print(f"  -> Muestra {sequence+1} capturada en {sequence_path}")
+    return True
+
+def main(source=0, record_path=None, continuous=False, gap=1.0):
+    cap = open_frame_source(source)
+    if not cap.isOpened():
+        print("Error: No se puede acceder a la cámara.")
+        return
+    recorder = None
+    if record_path:
+        # Guarda también el video y los keypoints de toda la sesión para reproducirla después
+        recorder = cap = SessionRecorder(cap, os.path.join(record_path, time.strftime('%Y%m%d_%H%M%S')))
+
+    capture = SampleCapture(cap, lambda frame: hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)),
+                            on_keypoints=recorder.add_keypoints if recorder else None)
+    capture.start()
+    completed = True
+    try:
+        for action in ACTIONS:
+            print(f'\n' + '='*50)
+            print(f'PREPÁRATE PARA LA SEÑA: "{action.upper()}"')
+            print(f'Capturaremos {NO_SEQUENCES} muestras de {SEQUENCE_LENGTH} frames a {CAPTURE_FPS} FPS.')
+            if continuous:
+                print(f'Presiona la BARRA ESPACIADORA para empezar; las muestras se graban seguidas, '
+                      f'con {gap:.1f}s de pausa entre ellas.')
+            else:
+                print(f'Presiona la BARRA ESPACIADORA para comenzar cada muestra.')
+            print(f'Presiona "q" para salir en cualquier momento.')
+            print('='*50)
+            if not capture_action(capture, action, continuous, gap):
+                completed = False
+                break
+    finally:
+        capture.stop()
+        cap.release()
+        cv2.destroyAllWindows()
+
+    mediapipe = capture.landmarks.timings.summary()
+    print(f"\n{capture.writer.written} muestras guardadas (MediaPipe p50 {mediapipe['p50_ms']:.1f} ms, "
+          f"cámara {capture.capture.meter.rate:.1f} FPS).")
+    if completed:
+        print("¡Captura completada con éxito!")
     print(f"Los datos se han guardado en: {KEYPOINTS_PATH}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--source', default='0',
+                        help="Índice de cámara, archivo de video o sesión grabada (por defecto, 0)")
+    parser.add_argument('--record', metavar='DIR',
+                        help="Graba la sesión (video, instantes y keypoints) en una subcarpeta de DIR")
+    parser.add_argument('--continuous', action='store_true',
+                        help="Grabar las muestras de cada seña seguidas, sin pulsar ESPACIO en cada una")
+    parser.add_argument('--gap', type=float, default=1.0,
+                        help="Segundos de pausa entre muestras en modo continuo")
+    args = parser.parse_args()
+    main(args.source, args.record, args.continuous, args.gap)
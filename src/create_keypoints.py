@@ -1,47 +1,131 @@
+"""
+Extrae los keypoints de las secuencias de imágenes en DATA_PATH/<acción>/<secuencia>/<frame>.jpg
+y los guarda en KEYPOINTS_PATH/<acción>/<secuencia>.npy.
+
+Las secuencias se reparten entre varios procesos. Cada secuencia se procesa
+con una instancia nueva de MediaPipe Hands, así el seguimiento entre frames
+no arrastra estado de otra secuencia y el resultado no depende del número de
+procesos. Se omiten las secuencias cuyo .npy es más reciente
+que sus imágenes, así que se puede volver a ejecutar tras añadir datos.
+
+Uso:
+    python src/create_keypoints.py [--workers N] [--force]
+"""
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
 import cv2
-import mediapipe as mp
 import numpy as np
 import os
-from utils.constants import ACTIONS, DATA_PATH, KEYPOINTS_PATH, SEQUENCE_LENGTH
-
-mp_hands = mp.solutions.hands
-hands = mp_hands.Hands(static_image_mode=False, max_num_hands=2, min_detection_confidence=0.5)
-
-def extract_keypoints(results):
-    keypoints = []
-    if results.multi_hand_landmarks:
-        for hand_landmarks in results.multi_hand_landmarks:
-            for landmark in hand_landmarks.landmark:
-                keypoints.extend([landmark.x, landmark.y, landmark.z])
-    # Rellenar con ceros si no hay manos detectadas
-    while len(keypoints) < 126:
-        keypoints.append(0)
-    return np.array(keypoints[:126])
-
-def process_all_sequences():
-    for action in ACTIONS:
-        for seq in range(5):  # Solo 5 muestras por acción
-            seq_path = os.path.join(DATA_PATH, action, str(seq))
-            keypoints_list = []
+from utils.constants import ACTIONS, DATA_PATH, KEYPOINTS_PATH, SEQUENCE_LENGTH, KEYPOINT_DIM
+from utils.keypoints import extract_keypoints
 
-            for frame_num in range(SEQUENCE_LENGTH):
-                frame_path = os.path.join(seq_path, f"{frame_num}.jpg")
-                frame = cv2.imread(frame_path)
-                if frame is None:
-                    continue
+# Módulo de manos de MediaPipe, importado una vez por proceso (ver `init_worker`)
+mp_hands = None
 
-                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                results = hands.process(frame_rgb)
-                kp = extract_keypoints(results)
-                keypoints_list.append(kp)
+def init_worker():
+    global mp_hands
+    import mediapipe as mp
+    mp_hands = mp.solutions.hands
 
+def list_frames(seq_path):
+    """Imágenes de una secuencia ordenadas por número de frame."""
+    frames = [f for f in os.listdir(seq_path) if f.endswith('.jpg') and f[:-4].isdigit()]
+    frames.sort(key=lambda f: int(f[:-4]))
+    return [os.path.join(seq_path, f) for f in frames[:SEQUENCE_LENGTH]]
+
+def is_up_to_date(save_path, frame_paths):
+    if not os.path.exists(save_path):
+        return False
+    newest_frame = max(os.path.getmtime(p) for p in frame_paths)
+    return os.path.getmtime(save_path) > newest_frame
+
+def discover_sequences(force=False):
+    """Devuelve (pendientes, omitidas) como listas de (acción, secuencia, frames, destino)."""
+    pending, skipped = [], []
+    for action in ACTIONS:
+        action_path = os.path.join(DATA_PATH, action)
+        if not os.path.isdir(action_path):
+            print(f"Advertencia: No se encontró la carpeta para la acción '{action}'.")
+            continue
+        for seq in sorted(os.listdir(action_path)):
+            seq_path = os.path.join(action_path, seq)
+            if not os.path.isdir(seq_path):
+                continue
+            frame_paths = list_frames(seq_path)
+            if not frame_paths:
+                continue
             save_path = os.path.join(KEYPOINTS_PATH, action, f"{seq}.npy")
-            os.makedirs(os.path.dirname(save_path), exist_ok=True)
-            np.save(save_path, np.array(keypoints_list))
+            item = (action, seq, frame_paths, save_path)
+            if not force and is_up_to_date(save_path, frame_paths):
+                skipped.append(item)
+            else:
+                pending.append(item)
+    return pending, skipped
+
+def process_sequence(frame_paths, save_path):
+    """Procesa una secuencia en el proceso actual. Devuelve el número de frames leídos."""
+    keypoints = np.zeros((SEQUENCE_LENGTH, KEYPOINT_DIM), dtype=np.float32)
+    n_frames = 0
+    if mp_hands is None:
+        init_worker()
+
+    with mp_hands.Hands(static_image_mode=False, max_num_hands=2, min_detection_confidence=0.5) as hands:
+        for frame_path in frame_paths:
+            frame = cv2.imread(frame_path)
+            if frame is None:
+                continue
+
+            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            results = hands.process(frame_rgb)
+            extract_keypoints(results, out=keypoints[n_frames])
+            n_frames += 1
+
+    os.makedirs(os.path.dirname(save_path), exist_ok=True)
+    # Escritura atómica: un .npy a medias no debe pasar por actualizado. El
+    # temporal no termina en .npy para que los cargadores no lo recojan, y se
+    # escribe por descriptor para que np.save no le añada la extensión.
+    tmp_path = save_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.save(f, keypoints[:n_frames])
+    os.replace(tmp_path, save_path)
+    return n_frames
+
+def process_all_sequences(workers=None, force=False):
+    pending, skipped = discover_sequences(force)
+    print(f"Secuencias: {len(pending)} por procesar, {len(skipped)} ya actualizadas.")
+    if not pending:
+        return
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(pending)))
+    start = time.perf_counter()
+    total_frames = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as pool:
+        futures = {pool.submit(process_sequence, frame_paths, save_path): (action, seq)
+                   for action, seq, frame_paths, save_path in pending}
+        for done, future in enumerate(as_completed(futures), start=1):
+            action, seq = futures[future]
+            try:
+                total_frames += future.result()
+            except Exception as e:
+                print(f"Error procesando {action}/{seq}: {e}")
+                continue
+            if done % 10 == 0 or done == len(pending):
+                elapsed = time.perf_counter() - start
+                print(f"  [{done}/{len(pending)}] {total_frames} frames, "
+                      f"{total_frames / elapsed:.1f} frames/s")
+
+    elapsed = time.perf_counter() - start
+    print(f"Listo en {elapsed:.1f}s con {workers} procesos ({total_frames / elapsed:.1f} frames/s).")
 
 if __name__ == "__main__":
-    process_all_sequences()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=None, help="Procesos en paralelo (por defecto, uno por núcleo)")
+    parser.add_argument('--force', action='store_true', help="Reprocesar también las secuencias actualizadas")
+    args = parser.parse_args()
+    process_all_sequences(workers=args.workers, force=args.force)
@@ -0,0 +1,137 @@
+"""
+Registra señas en el índice de embeddings, sin reentrenar el modelo.
+
+Cada seña se añade a partir de unas pocas secuencias de keypoints capturadas
+(KEYPOINTS_PATH/<seña>/*.npy, como las que generan `capture_samples.py` y
+`create_keypoints.py`). El extractor `actions_embedding.tflite` lo guarda
+`train_model.py`; el índice queda en `models/embedding_index.npz`, junto a
+`label_map.json`, y lo usa la GUI con `--backend embedding`. Si el extractor
+ha cambiado (por ejemplo, tras reentrenar), el índice anterior se descarta.
+
+Uso:
+    python src/enroll_sign.py --all                 # registrar las señas de ACTIONS
+    python src/enroll_sign.py por_favor [--samples data/keypoints/por_favor] [--replace]
+    python src/enroll_sign.py --list
+    python src/enroll_sign.py --remove por_favor
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import time
+
+import numpy as np
+from utils.constants import ACTIONS, KEYPOINTS_PATH, MODELS_PATH, SEQUENCE_LENGTH, KEYPOINT_DIM
+from utils.embedding_index import EmbeddingIndex, extractor_fingerprint
+from utils.predictor import TFLitePredictor
+
+# Similitud a partir de la cual se avisa de que una seña nueva se confunde con otra
+SIMILARITY_WARNING = 0.95
+
+
+def load_sequences(samples_dir, max_samples=None):
+    """Carga las secuencias (SEQUENCE_LENGTH, KEYPOINT_DIM) de una carpeta de .npy."""
+    files = sorted(f for f in os.listdir(samples_dir) if f.endswith('.npy'))
+    sequences = []
+    for name in files:
+        sequence = np.load(os.path.join(samples_dir, name))
+        if sequence.shape != (SEQUENCE_LENGTH, KEYPOINT_DIM):
+            print(f"  Advertencia: forma incorrecta en {name}: {sequence.shape}")
+            continue
+        sequences.append(sequence)
+        if max_samples and len(sequences) >= max_samples:
+            break
+    return np.array(sequences, dtype=np.float32)
+
+
+def enroll(index, extractor, label, sequences, replace=False):
+    """Añade las secuencias de `label` al índice y devuelve la seña existente más parecida."""
+    embeddings = np.stack([extractor.predict(sequence).copy() for sequence in sequences])
+    closest = None
+    if replace and label in index:
+        index.remove(label)
+    others = [(other, score) for other, score in index.search(embeddings.mean(axis=0), k=2) if other != label]
+    if others:
+        closest = others[0]
+    index.add(label, embeddings)
+    return closest
+
+
+def lookup_latency_ms(index, dim, runs=1000):
+    query = np.random.random(dim).astype(np.float32)
+    start = time.perf_counter()
+    for _ in range(runs):
+        index.probabilities(query)
+    return (time.perf_counter() - start) / runs * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('sign', nargs='?', help="Nombre de la seña a registrar")
+    parser.add_argument('--samples', help="Carpeta con las secuencias .npy (por defecto, KEYPOINTS_PATH/<seña>)")
+    parser.add_argument('--max-samples', type=int, default=None, help="Usar como máximo N secuencias por seña")
+    parser.add_argument('--all', action='store_true', help="Registrar todas las señas de ACTIONS")
+    parser.add_argument('--replace', action='store_true', help="Descartar las muestras ya registradas de la seña")
+    parser.add_argument('--remove', metavar='SEÑA', help="Eliminar una seña del índice")
+    parser.add_argument('--list', action='store_true', help="Mostrar las señas registradas")
+    parser.add_argument('--quantize', action='store_true', help="Crear el índice en int8 (solo al crearlo)")
+    parser.add_argument('--models-dir', default=MODELS_PATH)
+    args = parser.parse_args()
+
+    index_path = os.path.join(args.models_dir, 'embedding_index.npz')
+    extractor_path = os.path.join(args.models_dir, 'actions_embedding.tflite')
+    if not os.path.exists(extractor_path):
+        parser.error(f"No existe {extractor_path}; ejecuta primero 'python src/train_model.py'.")
+    extractor = TFLitePredictor(extractor_path)
+    dim = extractor.interpreter.get_output_details()[0]['shape'][-1]
+    fingerprint = extractor_fingerprint(extractor_path)
+    index = EmbeddingIndex.load(index_path) if os.path.exists(index_path) else None
+    if index is not None and index.extractor not in (None, fingerprint):
+        print(f"⚠️ {index_path} se registró con otro extractor; se descartan sus {len(index)} señas.")
+        index = None
+    if index is None:
+        index = EmbeddingIndex(dim, args.quantize)
+    index.extractor = fingerprint
+
+    if args.list:
+        for label in index.labels:
+            print(f"  {label}: {index.count(label)} muestras")
+        print(f"{len(index)} señas registradas en {index_path}")
+        return
+    if args.remove:
+        if args.remove not in index:
+            parser.error(f"La seña '{args.remove}' no está registrada")
+        index.remove(args.remove)
+        index.save(index_path)
+        print(f"🗑️ '{args.remove}' eliminada ({len(index)} señas restantes)")
+        return
+
+    if args.all:
+        signs = [(action, os.path.join(KEYPOINTS_PATH, action)) for action in ACTIONS]
+    elif args.sign:
+        signs = [(args.sign, args.samples or os.path.join(KEYPOINTS_PATH, args.sign))]
+    else:
+        parser.error("Indica una seña, --all, --list o --remove")
+
+    for label, samples_dir in signs:
+        if not os.path.isdir(samples_dir):
+            print(f"⚠️ No se encontró la carpeta '{samples_dir}' para '{label}'.")
+            continue
+        sequences = load_sequences(samples_dir, args.max_samples)
+        if len(sequences) == 0:
+            print(f"⚠️ '{label}': no hay secuencias válidas en '{samples_dir}'.")
+            continue
+        closest = enroll(index, extractor, label, sequences, replace=args.replace)
+        print(f"✅ '{label}': {len(sequences)} secuencias añadidas ({index.count(label)} en total)")
+        if closest and closest[1] > SIMILARITY_WARNING:
+            print(f"  ⚠️ Muy parecida a '{closest[0]}' (similitud {closest[1]:.3f}); "
+                  f"puede confundirse con ella.")
+
+    index.save(index_path)
+    print(f"💾 Índice guardado en {index_path}: {len(index)} señas, "
+          f"búsqueda en {lookup_latency_ms(index, dim):.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
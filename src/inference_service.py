@@ -0,0 +1,211 @@
+"""
+Servicio local de inferencia HTTP/WebSocket con micro-lotes.
+
+Los clientes hacen el seguimiento de manos por su cuenta y envían solo la
+ventana de keypoints (SEQUENCE_LENGTH, KEYPOINT_DIM). Las peticiones que
+llegan casi a la vez se agrupan durante una ventana de espera configurable y
+se puntúan en una sola pasada del modelo. Esto solo ocurre con el backend
+`keras` (el predeterminado aquí): los modelos TFLite tienen lote fijo de 1, así
+que con ellos el lote se ejecuta ventana a ventana y agrupar solo añade espera.
+
+Endpoints:
+    POST /predict   cuerpo JSON {"keypoints": [[...], ...]} o binario
+                    (application/octet-stream) con SEQUENCE_LENGTH*KEYPOINT_DIM float32 little-endian
+    GET  /ws        WebSocket: mensajes de texto JSON o binarios con el mismo formato
+    GET  /health    estado y estadísticas de lotes
+
+Respuesta: {"label": "hola", "confidence": 0.93, "probabilities": {...}}
+
+Uso:
+    python src/inference_service.py [--host 127.0.0.1] [--port 8765] [--backend keras]
+           [--max-batch 32] [--max-wait-ms 5]
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from aiohttp import web, WSMsgType
+from utils.constants import SEQUENCE_LENGTH, KEYPOINT_DIM, MODELS_PATH, BATCH_BACKEND
+from utils.predictor import load_predictor, load_label_map, BACKENDS
+
+WINDOW_SHAPE = (SEQUENCE_LENGTH, KEYPOINT_DIM)
+WINDOW_BYTES = SEQUENCE_LENGTH * KEYPOINT_DIM * 4
+
+
+class MicroBatcher:
+    """Agrupa las peticiones concurrentes en lotes para el predictor."""
+
+    def __init__(self, predictor, max_batch=32, max_wait=0.005):
+        self.predictor = predictor
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue = asyncio.Queue()
+        self._batch = np.zeros((max_batch,) + WINDOW_SHAPE, dtype=np.float32)
+        # El modelo se ejecuta fuera del bucle de eventos, en un único hilo
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._task = None
+        self.batches = 0
+        self.requests = 0
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+        self._executor.shutdown(wait=False)
+
+    async def predict(self, window):
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((window, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(pending) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    pending.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            n = len(pending)
+            for i, (window, _) in enumerate(pending):
+                self._batch[i] = window
+            try:
+                probs = await loop.run_in_executor(self._executor, self.predictor.predict_batch, self._batch[:n])
+            except Exception as e:
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, future), res in zip(pending, probs):
+                if not future.done():
+                    future.set_result(res)
+            self.batches += 1
+            self.requests += n
+
+
+def parse_window(data, binary):
+    """Convierte un cuerpo JSON o binario en una ventana float32. Lanza ValueError si no es válido."""
+    if binary:
+        if len(data) != WINDOW_BYTES:
+            raise ValueError(f"Se esperaban {WINDOW_BYTES} bytes (float32 {WINDOW_SHAPE}), llegaron {len(data)}")
+        return np.frombuffer(data, dtype='<f4').reshape(WINDOW_SHAPE)
+    try:
+        payload = json.loads(data)
+        window = np.asarray(payload['keypoints'], dtype=np.float32)
+    except (json.JSONDecodeError, KeyError, TypeError) as e:
+        raise ValueError(f"JSON inválido, se esperaba {{\"keypoints\": [...]}}: {e}")
+    if window.shape != WINDOW_SHAPE:
+        raise ValueError(f"Forma {window.shape} incorrecta, se esperaba {WINDOW_SHAPE}")
+    return window
+
+
+def format_result(res, label_map):
+    idx = int(np.argmax(res))
+    return {
+        'label': label_map[str(idx)],
+        'confidence': float(res[idx]),
+        'probabilities': {label_map[str(i)]: float(p) for i, p in enumerate(res)},
+    }
+
+
+async def handle_predict(request):
+    binary = request.content_type == 'application/octet-stream'
+    try:
+        window = parse_window(await request.read(), binary)
+    except ValueError as e:
+        return web.json_response({'error': str(e)}, status=400)
+    res = await request.app['batcher'].predict(window)
+    return web.json_response(format_result(res, request.app['label_map']))
+
+
+async def handle_ws(request):
+    ws = web.WebSocketResponse()
+    await ws.prepare(request)
+    batcher, label_map = request.app['batcher'], request.app['label_map']
+    async for msg in ws:
+        if msg.type not in (WSMsgType.TEXT, WSMsgType.BINARY):
+            continue
+        try:
+            window = parse_window(msg.data, msg.type == WSMsgType.BINARY)
+        except ValueError as e:
+            await ws.send_json({'error': str(e)})
+            continue
+        await ws.send_json(format_result(await batcher.predict(window), label_map))
+    return ws
+
+
+async def handle_health(request):
+    batcher = request.app['batcher']
+    return web.json_response({
+        'status': 'ok',
+        'backend': batcher.predictor.backend,
+        'batched': batcher.predictor.batched,
+        'requests': batcher.requests,
+        'batches': batcher.batches,
+        'mean_batch': batcher.requests / batcher.batches if batcher.batches else 0.0,
+        'uptime_s': time.perf_counter() - request.app['started'],
+    })
+
+
+def create_app(predictor, label_map, max_batch=32, max_wait=0.005):
+    app = web.Application()
+    app['label_map'] = label_map
+    app['batcher'] = MicroBatcher(predictor, max_batch, max_wait)
+    app['started'] = time.perf_counter()
+
+    async def on_startup(app):
+        app['batcher'].start()
+
+    async def on_cleanup(app):
+        await app['batcher'].stop()
+
+    app.on_startup.append(on_startup)
+    app.on_cleanup.append(on_cleanup)
+    app.router.add_post('/predict', handle_predict)
+    app.router.add_get('/ws', handle_ws)
+    app.router.add_get('/health', handle_health)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--backend', choices=BACKENDS, default=BATCH_BACKEND,
+                        help="Backend del modelo (por defecto, keras: el único que puntúa el lote en una pasada)")
+    parser.add_argument('--models-dir', default=MODELS_PATH)
+    parser.add_argument('--max-batch', type=int, default=32, help="Máximo de peticiones por lote")
+    parser.add_argument('--max-wait-ms', type=float, default=5.0,
+                        help="Tiempo máximo que espera un lote a llenarse")
+    args = parser.parse_args()
+
+    predictor = load_predictor(args.backend, args.models_dir)
+    predictor.warmup()
+    label_map = load_label_map(args.models_dir, predictor)
+    if not predictor.batched:
+        print(f"⚠️ El backend '{predictor.backend}' no procesa lotes: cada petición se puntúa por separado "
+              f"y --max-wait-ms solo añade latencia. Usa --backend keras o --max-wait-ms 0.")
+
+    print(f"🌐 Servicio en http://{args.host}:{args.port} (backend '{predictor.backend}', "
+          f"lotes de hasta {args.max_batch}, espera {args.max_wait_ms:.1f} ms)")
+    app = create_app(predictor, label_map, args.max_batch, args.max_wait_ms / 1000)
+    web.run_app(app, host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
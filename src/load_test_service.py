@@ -0,0 +1,86 @@
+"""
+Generador de carga para `inference_service.py`: mide latencia p50/p99 y peticiones/s.
+
+Uso:
+    python src/load_test_service.py [--url http://127.0.0.1:8765] [--requests 2000]
+           [--concurrency 32] [--mode binary|json|ws]
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import asyncio
+import json
+import time
+
+import aiohttp
+import numpy as np
+from utils.constants import SEQUENCE_LENGTH, KEYPOINT_DIM
+
+
+async def http_worker(session, url, payload, headers, n_requests, latencies):
+    for _ in range(n_requests):
+        start = time.perf_counter()
+        async with session.post(f"{url}/predict", data=payload, headers=headers) as resp:
+            await resp.read()
+            resp.raise_for_status()
+        latencies.append(time.perf_counter() - start)
+
+
+async def ws_worker(session, url, payload, n_requests, latencies):
+    async with session.ws_connect(f"{url}/ws") as ws:
+        for _ in range(n_requests):
+            start = time.perf_counter()
+            await ws.send_bytes(payload)
+            await ws.receive()
+            latencies.append(time.perf_counter() - start)
+
+
+async def run(url, total, concurrency, mode):
+    window = np.random.random((SEQUENCE_LENGTH, KEYPOINT_DIM)).astype('<f4')
+    if mode == 'json':
+        payload = json.dumps({'keypoints': window.tolist()})
+        headers = {'Content-Type': 'application/json'}
+    else:
+        payload = window.tobytes()
+        headers = {'Content-Type': 'application/octet-stream'}
+
+    per_worker = [total // concurrency + (1 if i < total % concurrency else 0) for i in range(concurrency)]
+    latencies = []
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        # Calentamiento
+        async with session.post(f"{url}/predict", data=payload, headers=headers) as resp:
+            resp.raise_for_status()
+
+        start = time.perf_counter()
+        if mode == 'ws':
+            tasks = [ws_worker(session, url, payload, n, latencies) for n in per_worker]
+        else:
+            tasks = [http_worker(session, url, payload, headers, n, latencies) for n in per_worker]
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - start
+
+        async with session.get(f"{url}/health") as resp:
+            health = await resp.json()
+    return np.array(latencies) * 1000, elapsed, health
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default='http://127.0.0.1:8765')
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--mode', choices=('binary', 'json', 'ws'), default='binary')
+    args = parser.parse_args()
+
+    latencies, elapsed, health = asyncio.run(run(args.url, args.requests, args.concurrency, args.mode))
+    print(f"📈 {len(latencies)} peticiones ({args.mode}, concurrencia {args.concurrency}) en {elapsed:.2f}s")
+    print(f"  {len(latencies) / elapsed:.0f} peticiones/s")
+    print(f"  latencia p50 {np.percentile(latencies, 50):.2f} ms, p99 {np.percentile(latencies, 99):.2f} ms")
+    print(f"  lote medio en el servidor: {health['mean_batch']:.1f}")
+
+
+if __name__ == "__main__":
+    main()
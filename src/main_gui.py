@@ -1,23 +1,102 @@
 import sys
 import os
+import time
+import argparse
 import platform
-import threading  # Para que la voz no bloquee la GUI
+import threading
+
+# Instante de arranque del proceso (o del lanzador, si lo indica) para medir el inicio
+LAUNCH_TIME = float(os.environ.get("LESAI_LAUNCH_TIME", time.time()))
+# Con --startup-benchmark, segundos máximos de espera a la primera predicción
+STARTUP_BENCHMARK_TIMEOUT = 60
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import cv2
 import os
-os.environ["QT_QPA_PLATFORM"] = "windows"
-import mediapipe as mp
+if platform.system() == "Windows":
+    os.environ.setdefault("QT_QPA_PLATFORM", "windows")
+# MediaPipe y TensorFlow se importan en segundo plano (ver ModelLoader)
 import numpy as np
-import tensorflow as tf
 import json
-import pyttsx3
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QLabel, QPushButton, 
                             QVBoxLayout, QWidget, QGridLayout, QHBoxLayout,
-                            QFrame, QGroupBox, QProgressBar, QTextEdit, QSplitter)
-from PyQt5.QtCore import QTimer, Qt, QPropertyAnimation, QEasingCurve, pyqtProperty
+                            QFrame, QGroupBox, QProgressBar, QTextEdit, QSplitter, QCheckBox)
+from PyQt5.QtCore import QTimer, Qt, QPropertyAnimation, QEasingCurve, pyqtProperty, QObject, pyqtSignal, QThread
 from PyQt5.QtGui import QImage, QPixmap, QFont, QColor, QPalette, QIcon
-from utils.constants import MODELS_PATH
+from utils.constants import (MODELS_PATH, INFERENCE_STRIDE, PREDICTION_THRESHOLD, MODEL_BACKEND, ROI_TARGET_FPS,
+                             KEYPOINT_DIM, DISPLAY_MAX_FPS)
+from utils.frame_source import open_frame_source, SessionRecorder
+from utils.gating import InferenceGate
+from utils.metrics import LatencyTracker, MetricsExporter
+from utils.pipeline import TranslationPipeline
+from utils.predictor import load_predictor, load_label_map, BACKENDS
+from utils.rendering import FrameRenderer
+from utils.roi import RoiHandTracker
+from utils.text_to_speech import SpeechWorker
+
+class PipelineBridge(QObject):
+    """Lleva los resultados de los hilos del pipeline al hilo principal de Qt.
+
+    Solo se guarda el último frame y la última predicción: si la GUI va por
+    detrás, los valores intermedios se sobrescriben en lugar de acumularse.
+    Los frames no se notifican: la GUI los recoge a su propio ritmo de refresco.
+    """
+    prediction_ready = pyqtSignal()
+
+    def __init__(self):
+        super().__init__()
+        self._lock = threading.Lock()
+        self._frame = None
+        self._keypoints = np.zeros(KEYPOINT_DIM, dtype=np.float32)
+        self._prediction = None
+
+    def publish_frame(self, frame, keypoints):
+        with self._lock:
+            self._frame = frame
+            # Los keypoints son una fila del buffer circular de la etapa: se copian
+            np.copyto(self._keypoints, keypoints)
+
+    def publish_prediction(self, res):
+        with self._lock:
+            pending = self._prediction is not None
+            self._prediction = res
+        if not pending:
+            self.prediction_ready.emit()
+
+    def take_frame(self):
+        """Devuelve (frame, copia de los keypoints) o None si no hay frame nuevo."""
+        with self._lock:
+            frame, self._frame = self._frame, None
+            if frame is None:
+                return None
+            return frame, self._keypoints.copy()
+
+    def take_prediction(self):
+        with self._lock:
+            res, self._prediction = self._prediction, None
+        return res
+
+class ModelLoader(QThread):
+    """Carga y calienta el modelo, el label map y MediaPipe fuera del hilo de la GUI."""
+    loaded = pyqtSignal(object, object, object)  # predictor, hands, label_map
+    failed = pyqtSignal(str)
+
+    def __init__(self, backend):
+        super().__init__()
+        self.backend = backend
+
+    def run(self):
+        try:
+            predictor = load_predictor(self.backend, MODELS_PATH, stride=INFERENCE_STRIDE)
+            predictor.warmup()  # Una pasada de prueba para que la primera predicción sea rápida
+            label_map = load_label_map(MODELS_PATH, predictor)
+
+            import mediapipe as mp
+            hands = mp.solutions.hands.Hands(static_image_mode=False, max_num_hands=2, min_detection_confidence=0.5)
+            hands.process(np.zeros((480, 640, 3), dtype=np.uint8))  # Inicializa el grafo
+            self.loaded.emit(predictor, hands, label_map)
+        except Exception as e:
+            self.failed.emit(str(e))
 
 class AnimatedButton(QPushButton):
     def __init__(self, text, color="#4CAF50"):
@@ -69,7 +148,8 @@ class AnimatedButton(QPushButton):
         return color
 
 class SignTranslatorGUI(QMainWindow):
-    def __init__(self):
+    def __init__(self, backend=MODEL_BACKEND, startup_benchmark=False, metrics_file=None, metrics_interval=10.0,
+                 source=None, realtime=True, record_path=None, roi=False, gate=True, display_fps=DISPLAY_MAX_FPS):
         super().__init__()
         self.setWindowTitle("🖐️🤖 Comunicación Inclusiva con IA")
         self.setWindowIcon(QIcon('assets/icon.png'))
@@ -123,28 +203,108 @@ class SignTranslatorGUI(QMainWindow):
             }
         """)
 
-        # Inicializar MediaPipe
-        self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(static_image_mode=False, max_num_hands=2, min_detection_confidence=0.5)
+        # Modelo y MediaPipe se cargan en segundo plano
+        self.predictor = None
+        self.hands = None
+        self.label_map = {}
+        self.startup_benchmark = startup_benchmark
+        self.startup_times = {}
 
-        # Cargar modelo
-        self.model = tf.keras.models.load_model(f'{MODELS_PATH}/actions.keras')
-        with open(f'{MODELS_PATH}/label_map.json', 'r') as f:
-            self.label_map = json.load(f)
+        # Un único hilo de voz para toda la sesión (para que la voz no bloquee la GUI)
+        self.speech = SpeechWorker()
+        self.speech.start()
 
         # Variables
-        self.sequence = []
+        self.pipeline = None
         self.sentence = []
         self.translation_history = []
-        self.threshold = 0.7
+        self.threshold = PREDICTION_THRESHOLD
         self.cap = None
+        self.source = source
+        self.realtime = realtime
+        self.record_path = record_path
+        self.use_roi = roi
+        # Sin manos o sin movimiento no se ejecuta el modelo (ver utils/gating.py)
+        self.gate = InferenceGate() if gate else None
+        self.roi_tracker = None
         self.current_confidence = 0.0
+        self.session_start = None
+
+        # Escalado y superposición a tamaño de pantalla, y su latencia en el hilo de la GUI
+        self.renderer = FrameRenderer()
+        self.render_timings = LatencyTracker()
+        self.display_fps = display_fps
+        self.metrics_exporter = MetricsExporter(metrics_file, metrics_interval) if metrics_file else None
 
         self.setup_ui()
 
-        # Timer para actualizar video
+        # Puente entre los hilos del pipeline y la GUI
+        self.bridge = PipelineBridge()
+        self.bridge.prediction_ready.connect(self.update_prediction)
+
+        # Timer para refrescar los FPS de cada etapa
         self.timer = QTimer()
-        self.timer.timeout.connect(self.update_frame)
+        self.timer.timeout.connect(self.update_pipeline_stats)
+
+        # El video se refresca a su propio ritmo, independiente del procesamiento
+        self.display_timer = QTimer()
+        self.display_timer.timeout.connect(self.update_frame)
+
+        # La ventana se muestra ya; el botón de inicio se habilita al terminar la carga
+        self.start_btn.setEnabled(False)
+        self.current_translation_label.setText("⏳ Cargando modelo...")
+        self.loader = ModelLoader(backend)
+        self.loader.loaded.connect(self.on_model_loaded)
+        self.loader.failed.connect(self.on_model_failed)
+        self.loader.start()
+
+    def mark_startup(self, event):
+        self.startup_times[event] = time.time() - LAUNCH_TIME
+        # Se informa cuando están la ventana y la primera predicción, lleguen en el orden que lleguen
+        if self.startup_benchmark and {'window', 'first_prediction'} <= set(self.startup_times):
+            self.finish_startup_benchmark()
+
+    def finish_startup_benchmark(self, code=0):
+        print("STARTUP " + json.dumps(self.startup_times), flush=True)
+        self.stop_translation()
+        QApplication.instance().exit(code)
+
+    def on_model_loaded(self, predictor, hands, label_map):
+        self.predictor = predictor
+        self.hands = hands
+        self.label_map = label_map
+        if self.use_roi:
+            # MediaPipe solo procesa la región de las manos, a una escala que mantiene ROI_TARGET_FPS
+            self.roi_tracker = RoiHandTracker(hands, target_fps=ROI_TARGET_FPS)
+        self.speech.prerender(list(label_map.values()))
+        self.mark_startup('model_ready')
+        print(f"Backend de inferencia: {self.predictor.backend}")
+
+        self.start_btn.setEnabled(True)
+        self.current_translation_label.setText("Esperando señas...")
+
+        if self.startup_benchmark:
+            # La primera predicción se marca al recibir el primer resultado de la inferencia
+            QTimer.singleShot(STARTUP_BENCHMARK_TIMEOUT * 1000, lambda: self.finish_startup_benchmark(1))
+            self.start_translation()
+
+    def on_model_failed(self, message):
+        print(f"Error al cargar el modelo: {message}")
+        self.current_translation_label.setText("❌ Error al cargar el modelo")
+        self.current_translation_label.setStyleSheet("""
+            QLabel {
+                background-color: #2d2d2d;
+                border: 2px solid #f44336;
+                border-radius: 12px;
+                padding: 20px;
+                font-size: 28px;
+                font-weight: bold;
+                color: #f44336;
+                min-height: 80px;
+            }
+        """)
+        if self.startup_benchmark:
+            self.finish_startup_benchmark(1)
 
     def setup_ui(self):
         # Widget central y layout principal
@@ -261,11 +421,24 @@ class SignTranslatorGUI(QMainWindow):
         self.words_translated_label = QLabel("Palabras traducidas: 0")
         self.session_time_label = QLabel("Tiempo de sesión: 00:00")
         self.avg_confidence_label = QLabel("Confianza promedio: 0%")
+        self.pipeline_fps_label = QLabel("FPS captura / landmarks / inferencia: - / - / -")
+        self.gate_label = QLabel("Inferencias ejecutadas / omitidas: - / -")
         
-        for label in [self.words_translated_label, self.session_time_label, self.avg_confidence_label]:
+        for label in [self.words_translated_label, self.session_time_label, self.avg_confidence_label,
+                      self.pipeline_fps_label, self.gate_label]:
             label.setStyleSheet("font-size: 14px; padding: 5px; color: #cccccc;")
             self.stats_layout.addWidget(label)
 
+        # Latencias por etapa (opcional, para diagnosticar una cabina lenta)
+        self.stage_latency_check = QCheckBox("Mostrar latencias por etapa")
+        self.stage_latency_check.setStyleSheet("font-size: 13px; padding: 5px; color: #cccccc;")
+        self.stage_latency_label = QLabel()
+        self.stage_latency_label.setStyleSheet("font-family: monospace; font-size: 12px; padding: 5px; color: #cccccc;")
+        self.stage_latency_label.setVisible(False)
+        self.stage_latency_check.toggled.connect(self.stage_latency_label.setVisible)
+        self.stats_layout.addWidget(self.stage_latency_check)
+        self.stats_layout.addWidget(self.stage_latency_label)
+
         # Agregar grupos al panel derecho
         self.right_layout.addWidget(self.translation_group)
         self.right_layout.addWidget(self.history_group)
@@ -276,24 +449,22 @@ class SignTranslatorGUI(QMainWindow):
         self.main_layout.addWidget(self.left_panel, 2)  # 2/3 del espacio
         self.main_layout.addWidget(self.right_panel, 1)  # 1/3 del espacio
 
-    def extract_keypoints(self, results):
-        keypoints = []
-        if results.multi_hand_landmarks:
-            for hand_landmarks in results.multi_hand_landmarks:
-                for landmark in hand_landmarks.landmark:
-                    keypoints.extend([landmark.x, landmark.y, landmark.z])
-        while len(keypoints) < 126:
-            keypoints.append(0)
-        return np.array(keypoints[:126])
+    def process_frame(self, frame):
+        if self.roi_tracker is not None:
+            return self.roi_tracker.process(frame)
+        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        return self.hands.process(frame_rgb)
 
     def start_translation(self):
-        os_name = platform.system().lower()
-        if "windows" in os_name:
-            self.cap = cv2.VideoCapture(0, cv2.CAP_DSHOW)
-        else:
-            self.cap = cv2.VideoCapture("/dev/video0")
+        # Cámara por defecto, o el video/sesión grabada indicado con --source
+        try:
+            self.cap = open_frame_source(self.source, realtime=self.realtime)
+        except IOError as e:
+            # Sesión grabada sin video legible
+            print(e)
+            self.cap = None
 
-        if not self.cap.isOpened():
+        if self.cap is None or not self.cap.isOpened():
             self.current_translation_label.setText("❌ Error: No se puede acceder a la cámara")
             self.current_translation_label.setStyleSheet("""
                 QLabel {
@@ -307,9 +478,10 @@ class SignTranslatorGUI(QMainWindow):
                     min-height: 80px;
                 }
             """)
+            if self.startup_benchmark:
+                self.finish_startup_benchmark(1)
             return
 
-        self.sequence = []
         self.sentence = []
         self.translation_history = []
         self.words_count = 0
@@ -331,10 +503,44 @@ class SignTranslatorGUI(QMainWindow):
             }
         """)
 
-        self.timer.start(30)  # Actualizar cada 30ms
+        on_keypoints = None
+        if self.record_path:
+            session_path = os.path.join(self.record_path, time.strftime('%Y%m%d_%H%M%S'))
+            self.cap = SessionRecorder(self.cap, session_path)
+            on_keypoints = self.cap.add_keypoints
+            print(f"⏺️ Grabando la sesión en {session_path}")
+
+        # Captura, landmarks e inferencia corren en hilos propios
+        self.predictor.reset()
+        if self.roi_tracker is not None:
+            self.roi_tracker.reset()
+        if self.gate is not None:
+            self.gate.reset()
+        self.pipeline = TranslationPipeline(
+            self.cap, self.process_frame, self.predictor,
+            on_frame=self.bridge.publish_frame,
+            on_result=self.bridge.publish_prediction,
+            on_keypoints=on_keypoints,
+            gate=self.gate,
+        )
+        self.render_timings.reset()
+        self.session_start = time.monotonic()
+        self.pipeline.start()
+        self.timer.start(1000)  # Refrescar FPS cada segundo
+        self.display_timer.start(int(1000 / self.display_fps))
 
     def stop_translation(self):
         self.timer.stop()
+        self.display_timer.stop()
+        if self.pipeline:
+            self.pipeline.stop()
+            if self.metrics_exporter:
+                self.metrics_exporter.export(self.stage_timings())
+            self.pipeline = None
+        # Descartar resultados pendientes de los hilos
+        self.bridge.take_frame()
+        self.bridge.take_prediction()
+        self.speech.cancel()
         if self.cap:
             self.cap.release()
             self.cap = None
@@ -364,116 +570,152 @@ class SignTranslatorGUI(QMainWindow):
             }
         """)
 
-    def update_frame(self):
-        ret, frame = self.cap.read()
-        if not ret:
+    def stage_timings(self):
+        timings = self.pipeline.timings()
+        timings['render'] = self.render_timings.summary()
+        return timings
+
+    def update_pipeline_stats(self):
+        if not self.pipeline:
+            return
+        elapsed = int(time.monotonic() - self.session_start)
+        self.session_time_label.setText(f"Tiempo de sesión: {elapsed // 60:02d}:{elapsed % 60:02d}")
+        stats = self.pipeline.stats()
+        self.pipeline_fps_label.setText(
+            f"FPS captura / landmarks / inferencia: {stats['capture_fps']:.0f} / "
+            f"{stats['landmark_fps']:.0f} / {stats['inference_fps']:.0f}"
+        )
+        if self.gate is not None:
+            self.gate_label.setText(
+                f"Inferencias ejecutadas / omitidas: {stats['gate_executed']} / "
+                f"{stats['gate_skipped_idle'] + stats['gate_skipped_still']} "
+                f"(sin manos {stats['gate_skipped_idle']}, sin movimiento {stats['gate_skipped_still']})"
+            )
+
+        timings = self.stage_timings()
+        if self.stage_latency_check.isChecked():
+            lines = [f"{stage:<11} p50 {t['p50_ms']:6.1f} ms  p95 {t['p95_ms']:6.1f} ms  {t['fps']:5.1f} fps"
+                     for stage, t in timings.items()]
+            if self.roi_tracker is not None:
+                lines.append(f"ROI: {self.roi_tracker.mode}, escala {self.roi_tracker.scale:.2f}")
+            self.stage_latency_label.setText("\n".join(lines))
+        if self.metrics_exporter:
+            self.metrics_exporter.maybe_export(timings)
+
+    def update_prediction(self):
+        res = self.bridge.take_prediction()
+        if res is None or not self.pipeline:
             return
+        if 'first_prediction' not in self.startup_times:
+            self.mark_startup('first_prediction')
+            if not self.pipeline:
+                # El benchmark de arranque terminó con esta predicción
+                return
 
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = self.hands.process(frame_rgb)
-
-        # Dibujar landmarks con mejor visualización
-        if results.multi_hand_landmarks:
-            mp_drawing = mp.solutions.drawing_utils
-            mp_drawing_styles = mp.solutions.drawing_styles
-            for hand_landmarks in results.multi_hand_landmarks:
-                mp_drawing.draw_landmarks(
-                    frame, hand_landmarks, self.mp_hands.HAND_CONNECTIONS,
-                    mp_drawing_styles.get_default_hand_landmarks_style(),
-                    mp_drawing_styles.get_default_hand_connections_style()
-                )
-
-        # Extraer keypoints
-        kp = self.extract_keypoints(results)
-        self.sequence.append(kp)
-        self.sequence = self.sequence[-10:]  # Mantener últimos 10 frames
-
-        if len(self.sequence) == 10:
-            res = self.model.predict(np.expand_dims(np.array(self.sequence), axis=0), verbose=0)[0]
-            self.current_confidence = res[np.argmax(res)]
-            
-            # Actualizar barra de confianza
-            confidence_percent = int(self.current_confidence * 100)
-            self.confidence_bar.setValue(confidence_percent)
-            self.confidence_label.setText(f"Confianza: {confidence_percent}%")
+        self.current_confidence = res[np.argmax(res)]
+        
+        # Actualizar barra de confianza
+        confidence_percent = int(self.current_confidence * 100)
+        self.confidence_bar.setValue(confidence_percent)
+        self.confidence_label.setText(f"Confianza: {confidence_percent}%")
+        
+        if self.current_confidence > self.threshold:
+            action_idx = np.argmax(res)
+            action = self.label_map[str(action_idx)]
             
-            if self.current_confidence > self.threshold:
-                action_idx = np.argmax(res)
-                action = self.label_map[str(action_idx)]
+            if not self.sentence or self.sentence[-1] != action:
+                self.sentence.append(action)
+                # Con el backend de streaming, la siguiente seña empieza sin la historia de esta
+                self.predictor.end_segment()
+                if len(self.sentence) > 5:
+                    self.sentence = self.sentence[-5:]
                 
-                if not self.sentence or self.sentence[-1] != action:
-                    self.sentence.append(action)
-                    if len(self.sentence) > 5:
-                        self.sentence = self.sentence[-5:]
-                    
-                    # Actualizar traducción actual
-                    current_text = " ".join(self.sentence)
-                    self.current_translation_label.setText(f"✅ {current_text}")
-                    self.current_translation_label.setStyleSheet("""
-                        QLabel {
-                            background-color: #2d2d2d;
-                            border: 2px solid #4CAF50;
-                            border-radius: 12px;
-                            padding: 20px;
-                            font-size: 28px;
-                            font-weight: bold;
-                            color: #4CAF50;
-                            min-height: 80px;
-                        }
-                    """)
-                    
-                    # Agregar al historial
-                    self.translation_history.append(f"• {action} (Confianza: {confidence_percent}%)")
-                    if len(self.translation_history) > 20:
-                        self.translation_history = self.translation_history[-20:]
-                    
-                    self.history_text.setPlainText("\n".join(reversed(self.translation_history)))
-                    
-                    # Actualizar estadísticas
-                    self.words_count += 1
-                    self.words_translated_label.setText(f"Palabras traducidas: {self.words_count}")
-                    
-                    # Calcular confianza promedio
-                    confidences = [float(line.split('(Confianza: ')[1].split('%')[0]) 
-                                 for line in self.translation_history if 'Confianza:' in line]
-                    if confidences:
-                        avg_conf = sum(confidences) / len(confidences)
-                        self.avg_confidence_label.setText(f"Confianza promedio: {avg_conf:.1f}%")
-                    
-                    # Hablar en un hilo separado para no bloquear la UI
-                    def speak_text():
-                        try:
-                            engine = pyttsx3.init()
-                            engine.say(action)
-                            engine.runAndWait()
-                        except Exception as e:
-                            print(f"Error en TTS: {e}")
-                    
-                    tts_thread = threading.Thread(target=speak_text)
-                    tts_thread.daemon = True
-                    tts_thread.start()
-
-        # Mostrar frame en QLabel con mejor escalado
-        h, w, ch = frame.shape
-        bytes_per_line = ch * w
-        qt_image = QImage(frame.data, w, h, bytes_per_line, QImage.Format_RGB888)
-        pixmap = QPixmap.fromImage(qt_image)
-        
-        # Escalar manteniendo aspecto y ajustando al contenedor
-        scaled_pixmap = pixmap.scaled(
-            self.video_label.width(), 
-            self.video_label.height(), 
-            Qt.KeepAspectRatio, 
-            Qt.SmoothTransformation
-        )
-        self.video_label.setPixmap(scaled_pixmap)
+                # Actualizar traducción actual
+                current_text = " ".join(self.sentence)
+                self.current_translation_label.setText(f"✅ {current_text}")
+                self.current_translation_label.setStyleSheet("""
+                    QLabel {
+                        background-color: #2d2d2d;
+                        border: 2px solid #4CAF50;
+                        border-radius: 12px;
+                        padding: 20px;
+                        font-size: 28px;
+                        font-weight: bold;
+                        color: #4CAF50;
+                        min-height: 80px;
+                    }
+                """)
+                
+                # Agregar al historial
+                self.translation_history.append(f"• {action} (Confianza: {confidence_percent}%)")
+                if len(self.translation_history) > 20:
+                    self.translation_history = self.translation_history[-20:]
+                
+                self.history_text.setPlainText("\n".join(reversed(self.translation_history)))
+                
+                # Actualizar estadísticas
+                self.words_count += 1
+                self.words_translated_label.setText(f"Palabras traducidas: {self.words_count}")
+                
+                # Calcular confianza promedio
+                confidences = [float(line.split('(Confianza: ')[1].split('%')[0]) 
+                             for line in self.translation_history if 'Confianza:' in line]
+                if confidences:
+                    avg_conf = sum(confidences) / len(confidences)
+                    self.avg_confidence_label.setText(f"Confianza promedio: {avg_conf:.1f}%")
+                
+                # Hablar sin bloquear la UI
+                self.speech.say(action)
+
+    def update_frame(self):
+        item = self.bridge.take_frame()
+        if item is None or not self.pipeline:
+            return
+        frame, keypoints = item
+
+        with self.render_timings.time():
+            # Escalar una sola vez al tamaño del contenedor y dibujar las manos a esa resolución
+            image = self.renderer.render(frame, keypoints, self.video_label.width(), self.video_label.height())
+            self.video_label.setPixmap(QPixmap.fromImage(image))
 
     def closeEvent(self, event):
         self.stop_translation()
+        if self.loader.isRunning():
+            self.loader.wait()
+        self.speech.stop()
         event.accept()
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    window = SignTranslatorGUI()
+    parser = argparse.ArgumentParser(description="Traductor de lengua de señas")
+    parser.add_argument('--backend', choices=BACKENDS, default=MODEL_BACKEND,
+                        help="Backend de inferencia ('tflite' no necesita TensorFlow)")
+    parser.add_argument('--startup-benchmark', action='store_true',
+                        help="Imprime los tiempos de arranque y sale (ver benchmark_startup.py)")
+    parser.add_argument('--metrics-file',
+                        help="Exporta las latencias por etapa (.prom: formato Prometheus; otro: JSON lines)")
+    parser.add_argument('--metrics-interval', type=float, default=10.0,
+                        help="Segundos entre exportaciones de métricas")
+    parser.add_argument('--source',
+                        help="Índice de cámara, archivo de video o sesión grabada (por defecto, la cámara)")
+    parser.add_argument('--fast', action='store_true',
+                        help="Reproducir videos y sesiones lo más rápido posible en lugar de a su velocidad original")
+    parser.add_argument('--record', metavar='DIR',
+                        help="Graba cada sesión (video, instantes y keypoints) en una subcarpeta de DIR")
+    parser.add_argument('--roi', action='store_true',
+                        help="Procesar solo la región de las manos con resolución adaptativa (ver utils/roi.py)")
+    parser.add_argument('--no-gate', action='store_true',
+                        help="Ejecutar el modelo en cada ventana, aunque no haya manos ni movimiento")
+    parser.add_argument('--display-fps', type=float, default=DISPLAY_MAX_FPS,
+                        help="Refresco máximo del video en pantalla")
+    args, qt_args = parser.parse_known_args()
+
+    app = QApplication(sys.argv[:1] + qt_args)
+    window = SignTranslatorGUI(backend=args.backend, startup_benchmark=args.startup_benchmark,
+                               metrics_file=args.metrics_file, metrics_interval=args.metrics_interval,
+                               source=args.source, realtime=not args.fast, record_path=args.record,
+                               roi=args.roi, gate=not args.no_gate,
+                               display_fps=args.display_fps)
     window.show()
+    # Se ejecuta en cuanto el bucle de eventos procesa la primera vuelta tras mostrar la ventana
+    QTimer.singleShot(0, lambda: window.mark_startup('window'))
     sys.exit(app.exec_())
\ No newline at end of file
@@ -0,0 +1,205 @@
+"""
+Servidor de traducción para varias cámaras en un solo proceso.
+
+Cada fuente (cámara o video) tiene sus propios hilos de captura y landmarks,
+con su propia instancia de MediaPipe y su ventana de secuencia. Un único
+bucle de inferencia recoge en cada tick las ventanas listas de todas las
+fuentes y las puntúa juntas, así que el modelo se carga una sola vez para
+todas las cabinas. Solo el backend `keras` (el predeterminado aquí) puntúa el
+lote en una sola pasada; los backends TFLite tienen lote fijo de 1 y recorren
+las ventanas una a una.
+
+Uso:
+    python src/multi_stream_server.py 0 1 videos/cabina3.mp4 [--backend keras]
+           [--tick-ms 33] [--output eventos.jsonl] [--duration 60]
+
+Las fuentes numéricas se abren como cámaras; el resto como sesiones grabadas,
+archivos o URLs.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import json
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+from utils.constants import SEQUENCE_LENGTH, KEYPOINT_DIM, MODELS_PATH, BATCH_BACKEND, PREDICTION_THRESHOLD
+from utils.frame_source import open_frame_source
+from utils.gating import InferenceGate
+from utils.metrics import peak_rss_mb
+from utils.pipeline import LatestQueue, LatestWindow, CaptureStage, LandmarkStage
+from utils.predictor import load_predictor, load_label_map, BACKENDS
+
+
+def open_source(source):
+    cap = open_frame_source(source)
+    if not cap.isOpened():
+        raise IOError(f"No se puede abrir la fuente '{source}'")
+    return cap
+
+
+class Stream:
+    """Una fuente de video con sus hilos de captura y landmarks."""
+
+    def __init__(self, stream_id, source):
+        import mediapipe as mp
+
+        self.stream_id = stream_id
+        self.source = source
+        self.cap = open_source(source)
+        self.hands = mp.solutions.hands.Hands(static_image_mode=False, max_num_hands=2,
+                                              min_detection_confidence=0.5)
+        self.frames = LatestQueue(1)
+        self.window = LatestWindow()
+        self.capture = CaptureStage(self.cap, self.frames)
+        # Las cabinas sin nadie delante no envían ventanas al lote
+        self.gate = InferenceGate()
+        self.landmarks = LandmarkStage(self.process_frame, self.frames, self.window, gate=self.gate)
+        self.latencies = deque(maxlen=200)
+        self.predictions = 0
+        self.last_action = None
+
+    def process_frame(self, frame):
+        return self.hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+
+    def start(self):
+        self.capture.start()
+        self.landmarks.start()
+
+    def stop(self):
+        for stage in (self.capture, self.landmarks):
+            stage.stop()
+        for stage in (self.capture, self.landmarks):
+            stage.join(2.0)
+        self.cap.release()
+        self.hands.close()
+
+
+class MultiStreamServer:
+    def __init__(self, streams, predictor, label_map, tick=0.033, threshold=PREDICTION_THRESHOLD,
+                 on_event=None):
+        self.streams = streams
+        self.predictor = predictor
+        self.label_map = label_map
+        self.tick = tick
+        self.threshold = threshold
+        self.on_event = on_event
+        self._batch = np.zeros((len(streams), SEQUENCE_LENGTH, KEYPOINT_DIM), dtype=np.float32)
+        self.batch_sizes = deque(maxlen=500)
+
+    def step(self):
+        """Recoge las ventanas listas de todas las fuentes y las puntúa en un solo lote."""
+        ready = []
+        for stream in self.streams:
+            meta = stream.window.get(self._batch[len(ready)], timeout=0)
+            if meta is not None:
+                ready.append((stream, meta))
+        if not ready:
+            return 0
+
+        probs = self.predictor.predict_batch(self._batch[:len(ready)])
+        now = time.perf_counter()
+        for (stream, (frame_id, timestamp)), res in zip(ready, probs):
+            stream.latencies.append(now - timestamp)
+            stream.predictions += 1
+            self.handle_prediction(stream, res)
+        self.batch_sizes.append(len(ready))
+        return len(ready)
+
+    def handle_prediction(self, stream, res):
+        idx = int(np.argmax(res))
+        confidence = float(res[idx])
+        if confidence <= self.threshold:
+            return
+        action = self.label_map[str(idx)]
+        if action == stream.last_action:
+            return
+        stream.last_action = action
+        if self.on_event is not None:
+            self.on_event({
+                'stream': stream.stream_id,
+                'source': stream.source,
+                'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'label': action,
+                'confidence': round(confidence, 4),
+                'latency_ms': round(stream.latencies[-1] * 1000, 1),
+            })
+
+    def run(self, duration=None, stats_interval=5.0):
+        for stream in self.streams:
+            stream.start()
+        start = last_stats = time.perf_counter()
+        cpu_start = cpu_last = time.process_time()
+        try:
+            while duration is None or time.perf_counter() - start < duration:
+                tick_start = time.perf_counter()
+                self.step()
+                if tick_start - last_stats >= stats_interval:
+                    cpu_now = time.process_time()
+                    self.print_stats((cpu_now - cpu_last) / (tick_start - last_stats))
+                    last_stats, cpu_last = tick_start, cpu_now
+                time.sleep(max(0.0, self.tick - (time.perf_counter() - tick_start)))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            for stream in self.streams:
+                stream.stop()
+        elapsed = time.perf_counter() - start
+        self.print_stats((time.process_time() - cpu_start) / elapsed)
+
+    def print_stats(self, cpu_fraction):
+        # Sin lotes reales, las ventanas de un tick se puntúan una tras otra
+        batch = "lote medio" if self.predictor.batched else "ventanas por tick (sin lotes)"
+        print(f"\n📊 {len(self.streams)} fuentes | {batch} "
+              f"{np.mean(self.batch_sizes) if self.batch_sizes else 0:.1f} | "
+              f"CPU {cpu_fraction * 100:.0f}% ({cpu_fraction * 100 / len(self.streams):.0f}% por fuente) | "
+              f"RSS máx. {peak_rss_mb() or 0:.0f} MB")
+        for stream in self.streams:
+            lat = np.array(stream.latencies) * 1000 if stream.latencies else np.zeros(1)
+            print(f"  [{stream.stream_id}] {stream.source}: captura {stream.capture.meter.rate:.0f} fps, "
+                  f"landmarks {stream.landmarks.meter.rate:.0f} fps, {stream.predictions} predicciones "
+                  f"({stream.gate.skipped} omitidas), "
+                  f"latencia p50 {np.percentile(lat, 50):.0f} ms / p95 {np.percentile(lat, 95):.0f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('sources', nargs='+', help="Índices de cámara, archivos de video o URLs")
+    parser.add_argument('--backend', choices=BACKENDS, default=BATCH_BACKEND,
+                        help="Backend del modelo (por defecto, keras: el único que puntúa el lote en una pasada)")
+    parser.add_argument('--models-dir', default=MODELS_PATH)
+    parser.add_argument('--tick-ms', type=float, default=33.0, help="Periodo del bucle de inferencia")
+    parser.add_argument('--output', help="Archivo JSONL para las palabras reconocidas (por defecto, stdout)")
+    parser.add_argument('--duration', type=float, default=None, help="Segundos de ejecución (por defecto, hasta Ctrl+C)")
+    parser.add_argument('--stats-interval', type=float, default=5.0)
+    args = parser.parse_args()
+
+    predictor = load_predictor(args.backend, args.models_dir)
+    predictor.warmup()
+    label_map = load_label_map(args.models_dir, predictor)
+    if not predictor.batched:
+        print(f"⚠️ El backend '{predictor.backend}' no procesa lotes: las ventanas de todas las fuentes "
+              f"se puntúan una a una. Usa --backend keras para agruparlas.")
+
+    out = open(args.output, 'a', encoding='utf-8') if args.output else sys.stdout
+
+    def on_event(event):
+        out.write(json.dumps(event, ensure_ascii=False) + '\n')
+        out.flush()
+
+    streams = [Stream(i, source) for i, source in enumerate(args.sources)]
+    print(f"🎥 {len(streams)} fuentes, backend '{predictor.backend}', tick {args.tick_ms:.0f} ms")
+    server = MultiStreamServer(streams, predictor, label_map, tick=args.tick_ms / 1000, on_event=on_event)
+    try:
+        server.run(duration=args.duration, stats_interval=args.stats_interval)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
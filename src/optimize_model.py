@@ -0,0 +1,161 @@
+"""
+Optimización del modelo entrenado: cuantización y poda, con un informe comparativo.
+
+A partir de `models/actions.keras` genera estas variantes TFLite:
+- float32: la exportación normal, como referencia;
+- dynamic: pesos int8, activaciones en float;
+- float16: pesos en float16;
+- int8: pesos y activaciones int8, calibradas con ventanas del dataset;
+- pruned: poda por magnitud con un ajuste fino corto, exportada en float32.
+
+Cada variante se evalúa sobre la misma partición de prueba que `train_model.py`
+(precisión), se mide su tamaño (también comprimido con gzip, donde se nota la
+poda) y su latencia en CPU con lote 1. El informe se guarda en JSON junto a
+las variantes.
+
+Uso:
+    python src/optimize_model.py [--sparsity 0.5] [--prune-epochs 5] [--deploy int8]
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import gzip
+import json
+import shutil
+import time
+
+import numpy as np
+from utils.constants import MODELS_PATH
+from utils.predictor import TFLitePredictor
+
+VARIANTS = ('float32', 'dynamic', 'float16', 'int8', 'pruned')
+
+
+def evaluate_tflite(path, X, labels, runs=200):
+    """Precisión sobre (X, labels) y latencias en ms de una predicción con lote 1."""
+    predictor = TFLitePredictor(path)
+    predictions = np.array([np.argmax(predictor.predict(window)) for window in X])
+    window = X[0]
+    predictor.predict(window)
+    latencies = np.empty(runs)
+    for i in range(runs):
+        start = time.perf_counter()
+        predictor.predict(window)
+        latencies[i] = (time.perf_counter() - start) * 1000
+    return float(np.mean(predictions == labels)), latencies
+
+
+def gzip_size(path):
+    with open(path, 'rb') as f:
+        return len(gzip.compress(f.read(), compresslevel=9))
+
+
+def prune_model(model, X, y, train_idx, sparsity, epochs, batch_size):
+    """Copia del modelo con la fracción `sparsity` de cada kernel a cero tras un ajuste fino."""
+    import tensorflow as tf
+    from utils.training import make_dataset, MagnitudePruning, compute_pruning_masks
+
+    pruned = tf.keras.models.clone_model(model)
+    pruned.set_weights(model.get_weights())
+    pruned.compile(optimizer=tf.keras.optimizers.Adam(1e-4), loss='categorical_crossentropy', metrics=['accuracy'])
+    if epochs > 0:
+        train_ds = make_dataset(X, y, train_idx, batch_size, training=True, augment=False)
+        pruned.fit(train_ds, epochs=epochs, verbose=0,
+                   callbacks=[MagnitudePruning(sparsity, ramp_epochs=max(1, epochs - 1))])
+    # Asegura la dispersión final aunque no haya ajuste fino
+    for variable, mask in compute_pruning_masks(pruned, sparsity):
+        variable.assign(variable * mask)
+    return pruned
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--models-dir', default=MODELS_PATH)
+    parser.add_argument('--output-dir', default=None, help="Carpeta de las variantes (por defecto, <models-dir>/optimized)")
+    parser.add_argument('--variants', default=','.join(VARIANTS), help="Variantes separadas por comas")
+    parser.add_argument('--calibration-samples', type=int, default=200,
+                        help="Ventanas de entrenamiento usadas para calibrar int8")
+    parser.add_argument('--sparsity', type=float, default=0.5, help="Fracción de pesos a podar")
+    parser.add_argument('--prune-epochs', type=int, default=5, help="Épocas de ajuste fino durante la poda")
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--runs', type=int, default=200, help="Predicciones para medir la latencia")
+    parser.add_argument('--deploy', choices=VARIANTS,
+                        help="Copiar la variante elegida a <models-dir>/actions.tflite")
+    args = parser.parse_args()
+
+    variants = args.variants.split(',')
+    unknown = set(variants) - set(VARIANTS)
+    if unknown:
+        parser.error(f"Variantes desconocidas: {', '.join(sorted(unknown))}")
+    output_dir = args.output_dir or os.path.join(args.models_dir, 'optimized')
+    os.makedirs(output_dir, exist_ok=True)
+
+    import tensorflow as tf
+    from train_model import load_data, export_tflite, train_test_indices
+    from utils.training import model_sparsity
+
+    print("Cargando datos y modelo...")
+    X, y = load_data()
+    train_idx, test_idx = train_test_indices(len(X))
+    X_test = np.asarray(X[np.sort(test_idx)], dtype=np.float32)
+    labels_test = np.argmax(y[np.sort(test_idx)], axis=1)
+    calibration = np.asarray(X[np.sort(train_idx[:args.calibration_samples])], dtype=np.float32)
+    model = tf.keras.models.load_model(os.path.join(args.models_dir, 'actions.keras'))
+    keras_acc = float(np.mean(np.argmax(model.predict(X_test, verbose=0), axis=1) == labels_test))
+    print(f"Precisión de actions.keras en prueba: {keras_acc:.2%} ({len(test_idx)} secuencias)")
+
+    report = {'keras_accuracy': keras_acc, 'test_samples': len(test_idx), 'variants': {}}
+    for variant in variants:
+        path = os.path.join(output_dir, f'actions_{variant}.tflite')
+        print(f"\n⚙️ Generando '{variant}'...")
+        entry = {}
+        try:
+            if variant == 'pruned':
+                pruned = prune_model(model, X, y, train_idx, args.sparsity, args.prune_epochs, args.batch_size)
+                pruned.save(os.path.join(output_dir, 'actions_pruned.keras'))
+                export_tflite(pruned, path)
+                entry['sparsity'] = model_sparsity(pruned)
+            else:
+                export_tflite(model, path, quantization=None if variant == 'float32' else variant,
+                              representative_data=calibration)
+            accuracy, latencies = evaluate_tflite(path, X_test, labels_test, args.runs)
+        except Exception as e:
+            print(f"  ❌ Falló: {e}")
+            report['variants'][variant] = {'error': str(e)}
+            continue
+        entry.update({
+            'path': path,
+            'size_kb': os.path.getsize(path) / 1024,
+            'gzip_kb': gzip_size(path) / 1024,
+            'accuracy': accuracy,
+            'p50_ms': float(np.percentile(latencies, 50)),
+            'p95_ms': float(np.percentile(latencies, 95)),
+        })
+        report['variants'][variant] = entry
+
+    report_path = os.path.join(output_dir, 'report.json')
+    with open(report_path, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print(f"\n{'variante':<10}{'precisión':>11}{'tamaño KB':>11}{'gzip KB':>10}{'p50 ms':>9}{'p95 ms':>9}")
+    for variant, entry in report['variants'].items():
+        if 'error' in entry:
+            print(f"{variant:<10}  error: {entry['error'][:60]}")
+            continue
+        print(f"{variant:<10}{entry['accuracy']:>11.2%}{entry['size_kb']:>11.0f}{entry['gzip_kb']:>10.0f}"
+              f"{entry['p50_ms']:>9.3f}{entry['p95_ms']:>9.3f}")
+    print(f"\n📄 Informe guardado en {report_path}")
+
+    if args.deploy:
+        entry = report['variants'].get(args.deploy)
+        if entry is None or 'error' in entry:
+            print(f"❌ No se puede desplegar '{args.deploy}': no se generó correctamente.")
+            sys.exit(1)
+        shutil.copyfile(entry['path'], os.path.join(args.models_dir, 'actions.tflite'))
+        print(f"🚀 '{args.deploy}' copiado a {args.models_dir}/actions.tflite")
+
+
+if __name__ == "__main__":
+    main()
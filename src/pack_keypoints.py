@@ -0,0 +1,32 @@
+"""
+Empaqueta los keypoints de KEYPOINTS_PATH/<acción>/*.npy en un único archivo
+contiguo (PACKED_PATH/keypoints.f32) más un índice de etiquetas.
+
+Solo se añaden las secuencias nuevas y se reescriben las que se han vuelto a
+grabar; con --rebuild se regenera desde cero.
+
+Uso:
+    python src/pack_keypoints.py [--rebuild]
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import time
+
+from utils.constants import KEYPOINTS_PATH, PACKED_PATH
+from utils.dataset import pack_keypoints, read_index
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rebuild', action='store_true', help="Regenerar el dataset completo")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    added, bad_shape = pack_keypoints(KEYPOINTS_PATH, PACKED_PATH, rebuild=args.rebuild)
+    index = read_index(PACKED_PATH)
+    print(f"Añadidas o actualizadas {added} secuencias en {time.perf_counter() - start:.2f}s "
+          f"({bad_shape} omitidas por forma incorrecta).")
+    print(f"Dataset empaquetado en {PACKED_PATH}: {index['count']} secuencias, "
+          f"acciones {index['actions']}")
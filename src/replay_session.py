@@ -0,0 +1,142 @@
+"""
+Reproduce una sesión grabada a través del pipeline completo, sin GUI ni cámara.
+
+Sirve para comparar FPS y latencia entre versiones con exactamente la misma
+entrada: los frames pasan por MediaPipe y el modelo como en la GUI, y al final
+se imprimen las latencias por etapa y la diferencia entre los keypoints
+obtenidos ahora y los grabados.
+
+Uso:
+    python src/main_gui.py --record sesiones/            # grabar una sesión
+    python src/replay_session.py sesiones/20250101_120000 [--fast] [--backend tflite]
+           [--history replay_history.jsonl]
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import json
+import subprocess
+import time
+
+import cv2
+import numpy as np
+from utils.constants import MODELS_PATH, MODEL_BACKEND, INFERENCE_STRIDE, ROI_TARGET_FPS
+from utils.frame_source import ReplaySource
+from utils.gating import InferenceGate
+from utils.pipeline import TranslationPipeline
+from utils.predictor import load_predictor, BACKENDS
+from utils.roi import RoiHandTracker
+
+# Máximo que se espera a que las etapas terminen tras el último frame
+DRAIN_TIMEOUT = 60.0
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def replay(session_path, predictor, realtime=True, roi=False, gate=True):
+    """Ejecuta la sesión en el pipeline y devuelve (pipeline, fuente, keypoints por frame, segundos)."""
+    import mediapipe as mp
+
+    source = ReplaySource(session_path, realtime=realtime)
+    hands = mp.solutions.hands.Hands(static_image_mode=False, max_num_hands=2, min_detection_confidence=0.5)
+    if roi:
+        tracker = RoiHandTracker(hands, target_fps=ROI_TARGET_FPS)
+        process_fn = tracker.process
+    else:
+        process_fn = lambda frame: hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+    keypoints = {}
+
+    def on_keypoints(frame_id, kp):
+        keypoints[frame_id] = kp.copy()
+
+    pipeline = TranslationPipeline(
+        source, process_fn, predictor,
+        on_keypoints=on_keypoints,
+        # Sin esperas entre frames se procesan todos, para que la entrada sea idéntica en cada ejecución
+        lossless=not realtime,
+        gate=InferenceGate() if gate else None,
+    )
+    predictor.reset()
+    start = time.perf_counter()
+    pipeline.start()
+    try:
+        while not source.finished:
+            time.sleep(0.05)
+        # Esperar a que el último frame leído pase por landmarks e inferencia
+        if not pipeline.drain(frames=source.frame_id, timeout=DRAIN_TIMEOUT):
+            print(f"⚠️ El pipeline no terminó de procesar la sesión en {DRAIN_TIMEOUT:.0f}s; "
+                  f"los últimos frames se descartan.")
+    finally:
+        elapsed = time.perf_counter() - start
+        pipeline.stop()
+        source.release()
+        hands.close()
+    return pipeline, source, keypoints, elapsed
+
+
+def landmark_drift(source, keypoints):
+    """Diferencia media absoluta entre los keypoints de la grabación y los de esta ejecución."""
+    common = [i for i in keypoints if i < len(source.has_landmarks) and source.has_landmarks[i]]
+    if not common:
+        return None
+    recorded = source.landmarks[common]
+    current = np.stack([keypoints[i] for i in common])
+    return float(np.abs(recorded - current).mean())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('session', help="Carpeta de la sesión grabada")
+    parser.add_argument('--fast', action='store_true', help="Sin esperas entre frames (mide el rendimiento máximo)")
+    parser.add_argument('--backend', choices=BACKENDS, default=MODEL_BACKEND)
+    parser.add_argument('--models-dir', default=MODELS_PATH)
+    parser.add_argument('--roi', action='store_true', help="Procesar solo la región de las manos (ver utils/roi.py)")
+    parser.add_argument('--no-gate', action='store_true', help="Ejecutar el modelo en todas las ventanas")
+    parser.add_argument('--history', help="Archivo JSONL al que añadir el resultado para comparar versiones")
+    args = parser.parse_args()
+
+    predictor = load_predictor(args.backend, args.models_dir, stride=INFERENCE_STRIDE)
+    predictor.warmup()
+    pipeline, source, keypoints, elapsed = replay(args.session, predictor, realtime=not args.fast, roi=args.roi, gate=not args.no_gate)
+
+    stats = pipeline.stats()
+    timings = pipeline.timings()
+    drift = landmark_drift(source, keypoints)
+    print(f"\n🎞️ {source.meta['frames']} frames grabados, {len(keypoints)} procesados en {elapsed:.1f}s "
+          f"({'rápido' if args.fast else 'tiempo real'}, backend '{predictor.backend}')")
+    print(f"  frames descartados {stats['dropped_frames']}, ventanas descartadas {stats['dropped_windows']}")
+    if not args.no_gate:
+        print(f"  inferencias ejecutadas {stats['gate_executed']}, omitidas sin manos "
+              f"{stats['gate_skipped_idle']} / sin movimiento {stats['gate_skipped_still']}")
+    for stage, t in timings.items():
+        print(f"  {stage:<11} p50 {t['p50_ms']:7.1f} ms  p95 {t['p95_ms']:7.1f} ms  {t['fps']:6.1f} fps")
+    if drift is not None:
+        print(f"  diferencia media de keypoints respecto a la grabación: {drift:.5f}")
+
+    if args.history:
+        with open(args.history, 'a') as f:
+            f.write(json.dumps({
+                'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'revision': git_revision(),
+                'session': os.path.basename(os.path.normpath(args.session)),
+                'realtime': not args.fast,
+                'backend': predictor.backend,
+                'roi': args.roi,
+                'elapsed_s': elapsed,
+                'processed_frames': len(keypoints),
+                'landmark_drift': drift,
+                'stats': stats,
+                'timings': timings,
+            }) + '\n')
+
+
+if __name__ == "__main__":
+    main()
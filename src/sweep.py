@@ -0,0 +1,286 @@
+"""
+Validación cruzada k-fold y búsqueda de hiperparámetros en paralelo.
+
+Cada combinación de la rejilla (o una muestra aleatoria de ella con --random)
+se entrena en cada fold estratificado, en un pool de procesos. Cada proceso
+fija sus hilos de TensorFlow para que entre todos no se repartan más núcleos
+de los que hay. El dataset se preprocesa una sola vez en una caché (.npy) que
+los procesos leen con memmap, y cada entrenamiento se detiene en cuanto la
+pérdida de validación deja de mejorar. La validación sale de los folds de
+entrenamiento, así que el fold de prueba no influye en la parada temprana.
+
+Cada fold terminado se añade a `results.jsonl` junto con la huella del
+dataset y los ajustes del entrenamiento. Si se interrumpe, el mismo comando
+retoma la búsqueda sin repetir lo ya hecho; si cambian los datos o los
+ajustes, los resultados anteriores se ignoran. Al final se escribe
+`summary.csv` con la precisión media y la desviación de cada combinación.
+
+Uso:
+    python src/sweep.py [--folds 5] [--workers 4] [--random 20]
+           [--param architecture=lstm,gru --param learning_rate=0.001,0.0003]
+           [--epochs 100] [--patience 10] [--output data/sweep]
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import csv
+import hashlib
+import itertools
+import json
+import multiprocessing
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+SWEEP_PATH = 'data/sweep'
+# Rejilla por defecto; cada --param reemplaza la lista de un parámetro
+DEFAULT_GRID = {
+    'architecture': ['lstm', 'gru', 'conv', 'mlp'],
+    'width': [0.5, 1.0],
+    'optimizer': ['adam'],
+    'learning_rate': [0.001, 0.0003],
+    'batch_size': [8, 32],
+}
+
+# Estado por proceso del pool (se crea una vez en `init_worker`)
+_worker = {}
+
+
+def parse_value(text):
+    for cast in (int, float):
+        try:
+            return cast(text)
+        except ValueError:
+            pass
+    return text
+
+
+def build_grid(params):
+    grid = dict(DEFAULT_GRID)
+    for param in params:
+        name, _, values = param.partition('=')
+        if name not in DEFAULT_GRID or not values:
+            raise ValueError(f"Parámetro inválido '{param}' (disponibles: {', '.join(DEFAULT_GRID)})")
+        grid[name] = [parse_value(v) for v in values.split(',')]
+    return grid
+
+
+def expand(grid, samples=None, seed=0):
+    """Lista de configuraciones: la rejilla completa o `samples` elegidas al azar sin repetir."""
+    names = list(grid)
+    configs = [dict(zip(names, values)) for values in itertools.product(*(grid[n] for n in names))]
+    if samples is not None and samples < len(configs):
+        configs = random.Random(seed).sample(configs, samples)
+    return configs
+
+
+def trial_id(config):
+    return hashlib.sha1(json.dumps(config, sort_keys=True).encode()).hexdigest()[:10]
+
+
+def cache_dataset(output_dir):
+    """Guarda X e y preprocesados en la carpeta de la búsqueda.
+
+    Devuelve (ruta de X, ruta de y, etiquetas, huella del dataset).
+
+    La caché se reutiliza mientras los datos no cambien (se comprueba una huella).
+    """
+    from train_model import load_data
+
+    X, y = load_data()
+    X = np.asarray(X, dtype=np.float32)
+    labels = np.argmax(y, axis=1)
+    fingerprint = hashlib.sha1(X.tobytes() + labels.tobytes()).hexdigest()
+    x_path, y_path = os.path.join(output_dir, 'X.npy'), os.path.join(output_dir, 'y.npy')
+    meta_path = os.path.join(output_dir, 'dataset.json')
+    if os.path.exists(meta_path):
+        with open(meta_path, 'r') as f:
+            if json.load(f).get('fingerprint') == fingerprint:
+                return x_path, y_path, labels, fingerprint
+    np.save(x_path, X)
+    np.save(y_path, y.astype(np.float32))
+    with open(meta_path, 'w') as f:
+        json.dump({'fingerprint': fingerprint, 'samples': len(X), 'classes': int(y.shape[1])}, f, indent=2)
+    return x_path, y_path, labels, fingerprint
+
+
+def init_worker(x_path, y_path, threads):
+    # Antes de importar TensorFlow: sus grupos de hilos se dimensionan al cargarse
+    for var in ('OMP_NUM_THREADS', 'TF_NUM_INTRAOP_THREADS'):
+        os.environ[var] = str(threads)
+    os.environ['TF_NUM_INTEROP_THREADS'] = '1'
+    os.environ.setdefault('TF_CPP_MIN_LOG_LEVEL', '2')
+    import tensorflow as tf
+
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+    _worker['X'] = np.load(x_path, mmap_mode='r')
+    _worker['y'] = np.load(y_path, mmap_mode='r')
+
+
+def run_fold(config, fold, train_idx, test_idx, epochs, patience, augment, seed):
+    """Entrena `config` en un fold y devuelve su resultado."""
+    import tensorflow as tf
+    from train_model import create_model
+    from utils.training import make_dataset
+
+    start = time.perf_counter()
+    X, y = _worker['X'], _worker['y']
+    tf.keras.utils.set_random_seed(seed + fold)
+    # La parada temprana se decide con una parte de los folds de entrenamiento
+    rng = np.random.default_rng(seed + fold)
+    train_idx = rng.permutation(train_idx)
+    n_val = max(1, int(len(train_idx) * 0.15))
+    val_idx, fit_idx = train_idx[:n_val], train_idx[n_val:]
+
+    optimizer = tf.keras.optimizers.get({'class_name': config['optimizer'],
+                                         'config': {'learning_rate': config['learning_rate']}})
+    model = create_model(X.shape[1:], y.shape[1], config['architecture'], config['width'], optimizer)
+    batch_size = config['batch_size']
+    history = model.fit(
+        make_dataset(X, y, fit_idx, batch_size, training=True, augment=augment, seed=seed + fold),
+        validation_data=make_dataset(X, y, val_idx, batch_size, training=False),
+        epochs=epochs,
+        verbose=0,
+        callbacks=[tf.keras.callbacks.EarlyStopping(monitor='val_loss', patience=patience,
+                                                    restore_best_weights=True)],
+    )
+    loss, accuracy = model.evaluate(make_dataset(X, y, test_idx, batch_size, training=False), verbose=0)
+    return {
+        'accuracy': float(accuracy),
+        'loss': float(loss),
+        'epochs_run': len(history.history['loss']),
+        'seconds': time.perf_counter() - start,
+    }
+
+
+def load_results(path, **settings):
+    """Resultados ya guardados con los mismos `settings` (folds, seed, dataset...), por (trial, fold)."""
+    done = {}
+    if not os.path.exists(path):
+        return done
+    with open(path, 'r') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # Línea a medio escribir por una interrupción
+                continue
+            if all(record.get(key) == value for key, value in settings.items()):
+                done[(record['trial'], record['fold'])] = record
+    return done
+
+
+def summarize(configs, done, folds):
+    rows = []
+    for config in configs:
+        tid = trial_id(config)
+        records = [done[(tid, fold)] for fold in range(folds) if (tid, fold) in done]
+        if not records:
+            continue
+        accuracies = [r['accuracy'] for r in records]
+        rows.append({
+            'trial': tid,
+            **config,
+            'folds_done': len(records),
+            'mean_accuracy': float(np.mean(accuracies)),
+            'std_accuracy': float(np.std(accuracies)),
+            'mean_epochs': float(np.mean([r['epochs_run'] for r in records])),
+        })
+    rows.sort(key=lambda r: (-r['mean_accuracy'], r['std_accuracy']))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--folds', type=int, default=5)
+    parser.add_argument('--param', action='append', default=[], metavar='NOMBRE=V1,V2',
+                        help=f"Valores de un parámetro ({', '.join(DEFAULT_GRID)}); se puede repetir")
+    parser.add_argument('--random', type=int, default=None, metavar='N',
+                        help="Probar N combinaciones al azar en lugar de la rejilla completa")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--epochs', type=int, default=100, help="Máximo de épocas por entrenamiento")
+    parser.add_argument('--patience', type=int, default=10, help="Épocas sin mejorar antes de detenerse")
+    parser.add_argument('--no-augment', action='store_true', help="Desactivar el aumento de datos")
+    parser.add_argument('--workers', type=int, default=max(1, (os.cpu_count() or 1) // 2))
+    parser.add_argument('--threads-per-worker', type=int, default=None,
+                        help="Hilos de TensorFlow por proceso (por defecto, núcleos / procesos)")
+    parser.add_argument('--output', default=SWEEP_PATH)
+    parser.add_argument('--top', type=int, default=10, help="Combinaciones a mostrar al final")
+    args = parser.parse_args()
+
+    from sklearn.model_selection import StratifiedKFold
+
+    try:
+        configs = expand(build_grid(args.param), args.random, args.seed)
+    except ValueError as e:
+        parser.error(str(e))
+    os.makedirs(args.output, exist_ok=True)
+    x_path, y_path, labels, fingerprint = cache_dataset(args.output)
+    splits = list(StratifiedKFold(args.folds, shuffle=True, random_state=args.seed).split(labels, labels))
+
+    results_path = os.path.join(args.output, 'results.jsonl')
+    # Solo se retoman los resultados con la misma partición, datos y entrenamiento
+    settings = {'folds': args.folds, 'seed': args.seed, 'dataset': fingerprint,
+                'epochs': args.epochs, 'patience': args.patience, 'augment': not args.no_augment}
+    done = load_results(results_path, **settings)
+    pending = [(config, fold) for config in configs for fold in range(args.folds)
+               if (trial_id(config), fold) not in done]
+    threads = args.threads_per_worker or max(1, (os.cpu_count() or 1) // args.workers)
+    print(f"🔍 {len(configs)} combinaciones × {args.folds} folds: {len(pending)} pendientes, "
+          f"{len(configs) * args.folds - len(pending)} ya hechas; {args.workers} procesos × {threads} hilos")
+
+    start = time.perf_counter()
+    # 'spawn': TensorFlow no admite continuar en un proceso hijo creado con fork
+    pool = ProcessPoolExecutor(max_workers=args.workers, mp_context=multiprocessing.get_context('spawn'),
+                               initializer=init_worker, initargs=(x_path, y_path, threads))
+    try:
+        with open(results_path, 'a') as f:
+            futures = {
+                pool.submit(run_fold, config, fold, splits[fold][0], splits[fold][1],
+                            args.epochs, args.patience, not args.no_augment, args.seed): (config, fold)
+                for config, fold in pending
+            }
+            for n, future in enumerate(as_completed(futures), start=1):
+                config, fold = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"❌ [{n}/{len(pending)}] {config} fold {fold}: {e}")
+                    continue
+                record = {'trial': trial_id(config), 'fold': fold, **settings, 'config': config, **result}
+                f.write(json.dumps(record) + '\n')
+                f.flush()
+                done[(record['trial'], fold)] = record
+                print(f"✅ [{n}/{len(pending)}] {record['trial']} fold {fold}: {result['accuracy']:.2%} "
+                      f"en {result['epochs_run']} épocas ({result['seconds']:.0f}s)")
+    except KeyboardInterrupt:
+        print("\n⏹️ Interrumpido; los folds terminados quedan guardados y se retoman con el mismo comando.")
+        pool.shutdown(wait=False, cancel_futures=True)
+        sys.exit(1)
+    pool.shutdown()
+
+    rows = summarize(configs, done, args.folds)
+    summary_path = os.path.join(args.output, 'summary.csv')
+    if rows:
+        with open(summary_path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+
+    print(f"\nListo en {time.perf_counter() - start:.0f}s. Mejores combinaciones:")
+    print(f"{'trial':<12}{'precisión':>16}{'épocas':>8}  configuración")
+    for row in rows[:args.top]:
+        config = ', '.join(f"{k}={row[k]}" for k in DEFAULT_GRID)
+        accuracy = f"{row['mean_accuracy']:.2%} ±{row['std_accuracy']:.1%}"
+        print(f"{row['trial']:<12}{accuracy:>16}{row['mean_epochs']:>8.0f}  {config}"
+              + ('' if row['folds_done'] == args.folds else f"  ({row['folds_done']}/{args.folds} folds)"))
+    print(f"\n📄 Tabla completa en {summary_path}")
+
+
+if __name__ == "__main__":
+    main()
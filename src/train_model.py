@@ -2,33 +2,231 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import argparse
 import numpy as np
 import json
 import os
+import tempfile
+import time
 from sklearn.model_selection import train_test_split
 from tensorflow.keras.models import Sequential
-from tensorflow.keras.layers import LSTM, Dense, Dropout
+from tensorflow.keras.layers import LSTM, GRU, Conv1D, Dense, Dropout, Flatten, GlobalAveragePooling1D, Input
 from tensorflow.keras.utils import to_categorical
-from utils.constants import ACTIONS, KEYPOINTS_PATH, SEQUENCE_LENGTH, KEYPOINT_DIM, MODELS_PATH
+from utils.constants import ACTIONS, KEYPOINTS_PATH, PACKED_PATH, SEQUENCE_LENGTH, KEYPOINT_DIM, MODELS_PATH
+from utils.dataset import load_packed, read_index
+from utils.training import make_dataset, ThroughputLogger
+
+TRAINING_STATE_FILE = 'training_state.json'  # Etiquetas y muestras del último entrenamiento
+
+ARCHITECTURES = ('lstm', 'gru', 'conv', 'mlp')
+
+def create_model(input_shape, num_classes, architecture='lstm', width=1.0, optimizer='Adam'):
+    """Crea y compila el clasificador de secuencias.
+
+    Todas las arquitecturas reciben la misma entrada (SEQUENCE_LENGTH, KEYPOINT_DIM):
+    - 'lstm': tres capas LSTM apiladas (el modelo original);
+    - 'gru': lo mismo con GRU, algo más ligera;
+    - 'conv': convoluciones 1-D sobre el eje temporal, sin recurrencia;
+    - 'mlp': la ventana aplanada en capas densas, la más rápida.
+    `width` multiplica el número de unidades de las capas ocultas; `optimizer`
+    es un nombre o una instancia de optimizador de Keras.
+    """
+    def units(n):
+        return max(4, int(round(n * width)))
+
+    if architecture in ('lstm', 'gru'):
+        rnn = LSTM if architecture == 'lstm' else GRU
+        body = [
+            rnn(units(64), return_sequences=True, activation='relu'),
+            rnn(units(128), return_sequences=True, activation='relu'),
+            rnn(units(64), return_sequences=False, activation='relu'),
+        ]
+    elif architecture == 'conv':
+        body = [
+            Conv1D(units(64), 3, padding='same', activation='relu'),
+            Conv1D(units(128), 3, padding='same', activation='relu'),
+            GlobalAveragePooling1D(),
+        ]
+    elif architecture == 'mlp':
+        body = [
+            Flatten(),
+            Dense(units(128), activation='relu'),
+            Dropout(0.3),
+        ]
+    else:
+        raise ValueError(f"Arquitectura desconocida: '{architecture}' (disponibles: {', '.join(ARCHITECTURES)})")
 
-def create_model(input_shape, num_classes):
     model = Sequential([
-        LSTM(64, return_sequences=True, activation='relu', input_shape=input_shape),
-        LSTM(128, return_sequences=True, activation='relu'),
-        LSTM(64, return_sequences=False, activation='relu'),
-        Dense(64, activation='relu'),
+        Input(shape=input_shape),
+        *body,
+        Dense(units(64), activation='relu'),
         Dropout(0.5),
-        Dense(32, activation='relu'),
+        Dense(units(32), activation='relu'),
         Dense(num_classes, activation='softmax')
     ])
-    model.compile(optimizer='Adam', loss='categorical_crossentropy', metrics=['accuracy'])
+    model.compile(optimizer=optimizer, loss='categorical_crossentropy', metrics=['accuracy'])
     return model
 
-def load_data():
-    X, y = [], []
-    label_map = {label: idx for idx, label in enumerate(ACTIONS)}
+def measure_latency(model, runs=200):
+    """Mediana en ms de una predicción con lote 1, exportando el modelo a TFLite como en la GUI."""
+    from utils.predictor import TFLitePredictor
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'candidate.tflite')
+        export_tflite(model, path)
+        predictor = TFLitePredictor(path)
+        window = np.random.random(model.input_shape[1:]).astype(np.float32)
+        predictor.warmup()
+        latencies = np.empty(runs)
+        for i in range(runs):
+            start = time.perf_counter()
+            predictor.predict(window)
+            latencies[i] = (time.perf_counter() - start) * 1000
+    return float(np.median(latencies))
+
+def select_candidate(candidates, latency_budget=None):
+    """Elige el candidato más preciso dentro del presupuesto de latencia (ms).
+
+    Si ninguno cabe en el presupuesto se devuelve el más rápido.
+    """
+    fitting = [c for c in candidates if latency_budget is None or c['latency_ms'] <= latency_budget]
+    if not fitting:
+        return min(candidates, key=lambda c: c['latency_ms'])
+    return max(fitting, key=lambda c: (c['accuracy'], -c['latency_ms']))
+
+QUANTIZATIONS = ('dynamic', 'float16', 'int8')
+
+def export_tflite(model, path, quantization=None, representative_data=None):
+    """Exporta el modelo a TFLite con lote fijo de 1 y solo operaciones nativas.
+
+    El archivo resultante se puede ejecutar con `tflite-runtime`, sin TensorFlow.
+    `quantization` puede ser 'dynamic' (pesos int8), 'float16' (pesos float16)
+    o 'int8' (pesos y activaciones int8, calibradas con `representative_data`,
+    un array de ventanas). La entrada y la salida siguen siendo float32.
+    """
+    import tensorflow as tf
+
+    if quantization == 'int8':
+        # El conversor no sabe calibrar las capas recurrentes como bucle; desenrolladas sí
+        model = unrolled_copy(model)
+    inputs = tf.keras.Input(shape=model.input_shape[1:], batch_size=1)
+    fixed_model = tf.keras.Model(inputs, model(inputs))
+    converter = tf.lite.TFLiteConverter.from_keras_model(fixed_model)
+    converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS]
+    if quantization is not None:
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    if quantization == 'float16':
+        converter.target_spec.supported_types = [tf.float16]
+    elif quantization == 'int8':
+        if representative_data is None:
+            raise ValueError("La cuantización int8 necesita datos de calibración")
+        converter.representative_dataset = lambda: ([w[np.newaxis].astype(np.float32)] for w in representative_data)
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+    tflite_model = converter.convert()
+    with open(path, 'wb') as f:
+        f.write(tflite_model)
+
+def unrolled_copy(model):
+    """Copia del modelo con las capas recurrentes desenrolladas (la longitud de secuencia es fija)."""
+    import tensorflow as tf
+
+    def clone(layer):
+        config = layer.get_config()
+        if isinstance(layer, tf.keras.layers.RNN):
+            config['unroll'] = True
+        return layer.__class__.from_config(config)
+
+    copy = tf.keras.models.clone_model(model, clone_function=clone)
+    copy.set_weights(model.get_weights())
+    return copy
+
+def streaming_model(model):
+    """Versión de un paso del modelo recurrente, con el estado como entrada y salida explícitas.
+
+    Recibe un solo vector de keypoints (1, KEYPOINT_DIM) y el estado de todas
+    las capas recurrentes concatenado en (1, N); devuelve las probabilidades y
+    el estado nuevo. Comparte los pesos con `model`: recorrer una ventana frame
+    a frame desde el estado cero da el mismo resultado que el modelo completo.
+    """
+    import tensorflow as tf
+
+    RNN = tf.keras.layers.RNN
+    layers = list(model.layers)
+    recurrent = [i for i, layer in enumerate(layers) if isinstance(layer, RNN)]
+    if not recurrent or not all(isinstance(layer, RNN) for layer in layers[:recurrent[-1] + 1]):
+        raise ValueError("Solo los modelos recurrentes ('lstm', 'gru') tienen versión de streaming")
+
+    sizes = [layer.units * (2 if isinstance(layer, tf.keras.layers.LSTM) else 1) for layer in layers[:recurrent[-1] + 1]]
+    frame = tf.keras.Input(shape=(model.input_shape[-1],), batch_size=1, name='keypoints')
+    state = tf.keras.Input(shape=(sum(sizes),), batch_size=1, name='state')
+    x = tf.keras.layers.Reshape((1, model.input_shape[-1]))(frame)
+    new_states = []
+    offset = 0
+    for layer in layers:
+        config = layer.get_config()
+        if isinstance(layer, RNN):
+            config.update(return_state=True, stateful=False, unroll=True)
+            step = layer.__class__.from_config(config)
+            # LSTM lleva (h, c) y GRU solo h, cada uno de `units` valores
+            initial = [state[:, offset + k * layer.units:offset + (k + 1) * layer.units]
+                       for k in range(2 if isinstance(layer, tf.keras.layers.LSTM) else 1)]
+            offset += len(initial) * layer.units
+            x, *layer_states = step(x, initial_state=initial)
+            new_states.extend(layer_states)
+        else:
+            step = layer.__class__.from_config(config)
+            x = step(x)
+        step.set_weights(layer.get_weights())
+    new_state = tf.keras.layers.Concatenate(name='new_state')(new_states) if len(new_states) > 1 else new_states[0]
+    return tf.keras.Model([frame, state], [x, new_state])
+
+def export_streaming_tflite(model, path):
+    """Exporta `streaming_model(model)` a TFLite.
+
+    La firma tiene las entradas 'keypoints' y 'state', y las salidas 'output_0'
+    (probabilidades) y 'output_1' (estado nuevo); ver `utils.predictor.StreamingPredictor`.
+    """
+    import tensorflow as tf
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(streaming_model(model))
+    converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS]
+    tflite_model = converter.convert()
+    with open(path, 'wb') as f:
+        f.write(tflite_model)
+
+def embedding_model(model):
+    """Modelo que devuelve la salida de la penúltima capa: el embedding de la ventana."""
+    import tensorflow as tf
+
+    return tf.keras.Model(model.inputs, model.layers[-2].output)
+
+def train_test_indices(num_samples):
+    """División fija de entrenamiento/prueba compartida por el entrenamiento y la optimización."""
+    return train_test_split(np.arange(num_samples), test_size=0.2, random_state=42)
+
+def load_data(actions=ACTIONS, with_sources=False):
+    """Carga las secuencias de `actions`; las etiquetas siguen el orden de esa lista.
 
-    for action in ACTIONS:
+    Con `with_sources=True` devuelve también el origen de cada muestra
+    ('<acción>/<archivo>.npy'), para saber qué muestras ya se usaron al entrenar.
+    """
+    # Preferir el dataset empaquetado: se lee con memmap en lugar de un np.load por archivo
+    if read_index(PACKED_PATH) is not None:
+        X, y, index = load_packed(PACKED_PATH, actions)
+        print(f"Usando dataset empaquetado en '{PACKED_PATH}' ({index['count']} secuencias).")
+        if len(X) == 0:
+            raise ValueError("El dataset empaquetado no contiene ninguna acción de ACTIONS.")
+        y = to_categorical(y, num_classes=len(actions)).astype(int)
+        if not with_sources:
+            return X, y
+        sources = [source for source, label in zip(index['sources'], index['labels'])
+                   if index['actions'][label] in actions]
+        return X, y, sources
+
+    X, y, sources = [], [], []
+    label_map = {label: idx for idx, label in enumerate(actions)}
+
+    for action in actions:
         action_path = os.path.join(KEYPOINTS_PATH, action)
         if not os.path.exists(action_path):
             print(f"Advertencia: No se encontró la carpeta para la acción '{action}'.")
@@ -45,6 +243,7 @@ def load_data():
                 if keypoints.shape == (SEQUENCE_LENGTH, KEYPOINT_DIM):
                     X.append(keypoints)
                     y.append(label_map[action])
+                    sources.append(f"{action}/{seq_file}")
                 else:
                     print(f"Advertencia: Forma incorrecta en {action}/{seq_file}: {keypoints.shape}")
             except Exception as e:
@@ -54,36 +253,247 @@ def load_data():
         raise ValueError("No se cargaron datos. Asegúrate de haber ejecutado 'capture_samples.py'.")
 
     X = np.array(X)
-    y = to_categorical(y, num_classes=len(ACTIONS)).astype(int)
-    return X, y
+    y = to_categorical(y, num_classes=len(actions)).astype(int)
+    return (X, y, sources) if with_sources else (X, y)
 
-if __name__ == "__main__":
+def read_training_state(models_path=MODELS_PATH):
+    """Etiquetas y muestras con las que se entrenó el modelo guardado, o None si no constan."""
+    path = os.path.join(models_path, TRAINING_STATE_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def extend_head(model, num_classes):
+    """Copia del modelo con una capa de salida de `num_classes` unidades.
+
+    Las primeras salidas conservan los pesos (y por tanto los índices) de las
+    etiquetas existentes; las nuevas empiezan con pesos aleatorios. El resto de
+    capas son copias con los mismos pesos.
+    """
+    old_head = model.layers[-1]
+    old_kernel, old_bias = old_head.get_weights()
+    old_classes = old_kernel.shape[1]
+    if num_classes < old_classes:
+        raise ValueError("La capa de salida solo puede crecer: se perderían índices de etiquetas")
+    head = Dense(num_classes, activation='softmax', name=f"{old_head.name}_{num_classes}")
+    # Capas nuevas y no compartidas: las compartidas seguirían enlazadas al grafo del modelo original
+    body = [layer.__class__.from_config(layer.get_config()) for layer in model.layers[:-1]]
+    extended = Sequential([Input(shape=model.input_shape[1:]), *body, head])
+    for copy, layer in zip(body, model.layers[:-1]):
+        copy.set_weights(layer.get_weights())
+    kernel, bias = head.get_weights()
+    kernel[:, :old_classes] = old_kernel
+    bias[:old_classes] = old_bias
+    bias[old_classes:] = old_bias.mean()
+    head.set_weights([kernel, bias])
+    return extended
+
+def incremental_indices(labels, sources, seen_sources, old_classes, replay_per_class, seed=42):
+    """Divide las muestras en nuevas y de repaso para el entrenamiento incremental.
+
+    Son nuevas las que no están en `seen_sources` (o, si no consta, las de
+    etiquetas nuevas); de cada etiqueta anterior se repasan hasta
+    `replay_per_class` muestras ya vistas, para que el modelo no las olvide.
+    """
+    labels = np.asarray(labels)
+    if seen_sources is None:
+        new = labels >= old_classes
+    else:
+        seen = set(seen_sources)
+        new = np.array([source not in seen for source in sources], dtype=bool)
+    rng = np.random.default_rng(seed)
+    replay = []
+    for label in range(old_classes):
+        candidates = np.flatnonzero((labels == label) & ~new)
+        replay.extend(rng.choice(candidates, min(replay_per_class, len(candidates)), replace=False))
+    return np.flatnonzero(new), np.sort(np.array(replay, dtype=np.int64))
+
+def checkpoint_callback(name):
+    """Guarda el entrenamiento al final de cada época; al relanzarlo continúa desde ahí."""
+    import tensorflow as tf
+
+    return tf.keras.callbacks.BackupAndRestore(os.path.join(MODELS_PATH, 'checkpoints', name))
+
+def train_candidates(args, architectures, widths):
+    """Entrena desde cero cada arquitectura y anchura; devuelve (modelo, etiquetas, fuentes)."""
     print("Cargando datos de entrenamiento...")
-    X, y = load_data()
+    X, y, sources = load_data(with_sources=True)
     print(f"Datos cargados: {X.shape[0]} muestras, {X.shape[1]} frames, {X.shape[2]} keypoints")
 
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    # Se dividen índices, no datos: los lotes se leen de X bajo demanda
+    train_idx, test_idx = train_test_indices(len(X))
+    train_ds = make_dataset(X, y, train_idx, args.batch_size, training=True, augment=not args.no_augment)
+    test_ds = make_dataset(X, y, test_idx, args.batch_size, training=False)
+
+    candidates = []
+    for architecture in architectures:
+        for width in widths:
+            name = f"{architecture}x{width:g}"
+            print(f"\nCreando y entrenando el modelo '{name}'...")
+            model = create_model((SEQUENCE_LENGTH, KEYPOINT_DIM), len(ACTIONS), architecture, width)
+            model.fit(
+                train_ds,
+                epochs=args.epochs or 100,
+                validation_data=test_ds,
+                callbacks=[ThroughputLogger(len(train_idx)), checkpoint_callback(name)],
+            )
+            _, accuracy = model.evaluate(test_ds, verbose=0)
+            latency = measure_latency(model)
+            print(f"  '{name}': precisión {accuracy:.2%}, latencia {latency:.3f} ms, {model.count_params()} parámetros")
+            candidates.append({'name': name, 'architecture': architecture, 'width': width, 'model': model,
+                               'accuracy': float(accuracy), 'latency_ms': latency, 'params': model.count_params()})
+
+    best = select_candidate(candidates, args.latency_budget)
+    if args.latency_budget is not None and best['latency_ms'] > args.latency_budget:
+        print(f"⚠️ Ningún candidato cumple {args.latency_budget} ms; se usa el más rápido, '{best['name']}'.")
+    if len(candidates) > 1:
+        print(f"\n{'candidato':<12}{'precisión':>11}{'latencia ms':>13}{'parámetros':>12}")
+        for c in candidates:
+            mark = '  ⭐' if c is best else ''
+            print(f"{c['name']:<12}{c['accuracy']:>11.2%}{c['latency_ms']:>13.3f}{c['params']:>12}{mark}")
+
+    # Registrar la comparación para poder revisar la elección más tarde
+    os.makedirs(MODELS_PATH, exist_ok=True)
+    with open(f'{MODELS_PATH}/model_selection.json', 'w') as f:
+        json.dump({
+            'latency_budget_ms': args.latency_budget,
+            'selected': best['name'],
+            'candidates': [{k: v for k, v in c.items() if k != 'model'} for c in candidates],
+        }, f, indent=4)
+    print(f"\nPrecisión en el conjunto de prueba ('{best['name']}'): {best['accuracy']:.2%}")
+    return best['model'], list(ACTIONS), sources
+
+def train_incremental(args):
+    """Ajusta el modelo guardado a las muestras nuevas; devuelve (modelo, etiquetas, fuentes)."""
+    import tensorflow as tf
+
+    with open(f'{MODELS_PATH}/label_map.json', 'r') as f:
+        label_map = json.load(f)
+    old_labels = [label_map[str(i)] for i in range(len(label_map))]
+    # Las etiquetas existentes conservan su índice; las nuevas de ACTIONS van al final
+    labels = old_labels + [action for action in ACTIONS if action not in old_labels]
+    missing = [label for label in old_labels if label not in ACTIONS]
+    if missing:
+        print(f"⚠️ {', '.join(missing)} ya no está en ACTIONS, pero se mantiene en el modelo.")
+
+    state = read_training_state()
+    X, y, sources = load_data(labels, with_sources=True)
+    new_idx, replay_idx = incremental_indices(np.argmax(y, axis=1), sources, state and state['sources'],
+                                              len(old_labels), args.replay_per_class)
+    if state is None:
+        print("⚠️ No consta con qué muestras se entrenó el modelo: solo las etiquetas nuevas cuentan como nuevas.")
+    if len(new_idx) == 0:
+        print("No hay muestras nuevas desde el último entrenamiento; el modelo no cambia.")
+        return None, labels, sources
+    print(f"Etiquetas nuevas: {labels[len(old_labels):] or 'ninguna'}; "
+          f"{len(new_idx)} muestras nuevas y {len(replay_idx)} de repaso.")
 
-    print("Creando y entrenando el modelo...")
-    model = create_model((SEQUENCE_LENGTH, KEYPOINT_DIM), len(ACTIONS))
-    history = model.fit(
-        X_train, y_train, 
-        epochs=100, 
-        validation_data=(X_test, y_test), 
-        batch_size=8
+    model = extend_head(tf.keras.models.load_model(f'{MODELS_PATH}/actions.keras'), len(labels))
+    head_only = args.finetune == 'head'
+    for layer in model.layers[:-1]:
+        layer.trainable = not head_only
+    learning_rate = args.finetune_lr or (1e-3 if head_only else 1e-4)
+    model.compile(optimizer=tf.keras.optimizers.Adam(learning_rate), loss='categorical_crossentropy',
+                  metrics=['accuracy'])
+
+    subset = np.concatenate([new_idx, replay_idx])
+    fit_pos, val_pos = train_test_indices(len(subset))
+    fit_idx, val_idx = subset[fit_pos], subset[val_pos]
+    val_ds = make_dataset(X, y, val_idx, args.batch_size, training=False)
+    print(f"Ajustando {'solo la capa de salida' if head_only else 'todas las capas'} (lr {learning_rate:g})...")
+    model.fit(
+        make_dataset(X, y, fit_idx, args.batch_size, training=True, augment=not args.no_augment),
+        epochs=args.epochs or 30,
+        validation_data=val_ds,
+        callbacks=[
+            ThroughputLogger(len(fit_idx)),
+            tf.keras.callbacks.EarlyStopping(monitor='val_loss', patience=5, restore_best_weights=True),
+            checkpoint_callback('incremental'),
+        ],
     )
+    for layer in model.layers:
+        layer.trainable = True
+
+    _, accuracy = model.evaluate(val_ds, verbose=0)
+    print(f"\nPrecisión en validación (muestras nuevas y de repaso): {accuracy:.2%}")
+    # Comprobar que no se olvidaron las etiquetas anteriores con las muestras que no se repasaron
+    held_out = np.setdiff1d(np.flatnonzero(np.argmax(y, axis=1) < len(old_labels)), subset)
+    if len(held_out):
+        _, old_accuracy = model.evaluate(make_dataset(X, y, held_out, args.batch_size, training=False), verbose=0)
+        print(f"Precisión en el resto de muestras de etiquetas anteriores: {old_accuracy:.2%}")
+    return model, labels, sources
 
-    # Guardar el modelo
+def save_artifacts(model, labels, sources):
+    """Guarda el modelo, sus exportaciones, el mapa de etiquetas y las muestras usadas."""
     os.makedirs(MODELS_PATH, exist_ok=True)
     model.save(f'{MODELS_PATH}/actions.keras')
     print(f"Modelo guardado en {MODELS_PATH}/actions.keras")
 
+    # Exportar la versión TFLite para el runtime ligero de la GUI
+    export_tflite(model, f'{MODELS_PATH}/actions.tflite')
+    print(f"Modelo TFLite guardado en {MODELS_PATH}/actions.tflite")
+
+    # Extractor de embeddings para registrar señas sin reentrenar (ver src/enroll_sign.py)
+    export_tflite(embedding_model(model), f'{MODELS_PATH}/actions_embedding.tflite')
+    # Las señas registradas con el extractor anterior ya no son comparables. El
+    # índice guarda la huella de su extractor, así que se rechaza al cargarlo y
+    # enroll_sign.py lo rehace; no se borra para no perder las muestras registradas.
+    if os.path.exists(f'{MODELS_PATH}/embedding_index.npz'):
+        print("El índice de embeddings es de un extractor anterior; vuelve a ejecutar 'python src/enroll_sign.py --all'")
+
+    # Variante de un paso por frame con estado explícito (solo modelos recurrentes)
+    streaming_path = f'{MODELS_PATH}/actions_streaming.tflite'
+    try:
+        export_streaming_tflite(model, streaming_path)
+        print(f"Modelo de streaming guardado en {streaming_path}")
+    except ValueError:
+        # No debe quedar una variante de streaming de un modelo anterior
+        if os.path.exists(streaming_path):
+            os.remove(streaming_path)
+
     # Guardar el mapeo de etiquetas
-    label_map_for_saving = {str(idx): action for idx, action in enumerate(ACTIONS)}
+    label_map_for_saving = {str(idx): action for idx, action in enumerate(labels)}
     with open(f'{MODELS_PATH}/label_map.json', 'w') as f:
         json.dump(label_map_for_saving, f, indent=4)
     print(f"Mapeo de etiquetas guardado en {MODELS_PATH}/label_map.json")
 
-    # Imprimir resumen
-    test_loss, test_acc = model.evaluate(X_test, y_test, verbose=0)
-    print(f"\nPrecisión en el conjunto de prueba: {test_acc:.2%}")
\ No newline at end of file
+    # Muestras ya usadas: el próximo entrenamiento incremental solo ajusta las nuevas
+    with open(os.path.join(MODELS_PATH, TRAINING_STATE_FILE), 'w') as f:
+        json.dump({'labels': labels, 'sources': sorted(sources)}, f)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Entrena el modelo de señas")
+    parser.add_argument('--epochs', type=int, default=None,
+                        help="Épocas (por defecto, 100 desde cero y 30 en modo incremental)")
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--no-augment', action='store_true', help="Desactivar el aumento de datos")
+    parser.add_argument('--architectures', default='lstm',
+                        help=f"Arquitecturas candidatas separadas por comas ({', '.join(ARCHITECTURES)})")
+    parser.add_argument('--widths', default='1.0', help="Multiplicadores de anchura separados por comas")
+    parser.add_argument('--latency-budget', type=float, default=None,
+                        help="Latencia máxima por predicción en ms; se guarda el candidato más preciso que la cumpla")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Ajustar el modelo guardado con las muestras y señas nuevas en lugar de entrenar desde cero")
+    parser.add_argument('--finetune', choices=('head', 'all'), default='head',
+                        help="En modo incremental: entrenar solo la capa de salida o todas con lr bajo")
+    parser.add_argument('--finetune-lr', type=float, default=None,
+                        help="Learning rate del ajuste (por defecto, 1e-3 solo salida y 1e-4 todas)")
+    parser.add_argument('--replay-per-class', type=int, default=10,
+                        help="Muestras ya vistas por etiqueta que se repasan en modo incremental")
+    args = parser.parse_args()
+
+    if args.incremental:
+        if not os.path.exists(f'{MODELS_PATH}/actions.keras'):
+            parser.error(f"No hay un modelo en {MODELS_PATH}/actions.keras para ajustar")
+        model, labels, sources = train_incremental(args)
+    else:
+        architectures = args.architectures.split(',')
+        unknown = set(architectures) - set(ARCHITECTURES)
+        if unknown:
+            parser.error(f"Arquitecturas desconocidas: {', '.join(sorted(unknown))}")
+        widths = [float(w) for w in args.widths.split(',')]
+        model, labels, sources = train_candidates(args, architectures, widths)
+
+    if model is not None:
+        save_artifacts(model, labels, sources)
@@ -0,0 +1,56 @@
+"""
+Pruebas de los aumentos de datos por lotes
+"""
+
+import numpy as np
+import tensorflow as tf
+
+from utils.augmentation import (random_mirror, random_scale_translate, random_time_warp,
+                                random_landmark_dropout, augment_batch)
+from utils.constants import SEQUENCE_LENGTH, KEYPOINT_DIM
+
+
+def one_hand_batch(batch_size=8):
+    batch = np.random.uniform(0.2, 0.8, (batch_size, SEQUENCE_LENGTH, KEYPOINT_DIM)).astype(np.float32)
+    batch[:, :, KEYPOINT_DIM // 2:] = 0.0  # Segunda mano ausente
+    return batch
+
+
+def test_augmentations_keep_shape_and_missing_hands():
+    batch = one_hand_batch()
+    for fn in (random_mirror, random_scale_translate, random_time_warp,
+               random_landmark_dropout, augment_batch):
+        out = fn(tf.constant(batch)).numpy()
+        assert out.shape == batch.shape
+        assert np.all(out[:, :, KEYPOINT_DIM // 2:] == 0.0)
+
+
+def test_mirror_flips_x_only():
+    batch = one_hand_batch()
+    out = random_mirror(tf.constant(batch), prob=1.0).numpy()
+    hand = out[:, :, :KEYPOINT_DIM // 2].reshape(len(batch), SEQUENCE_LENGTH, -1, 3)
+    ref = batch[:, :, :KEYPOINT_DIM // 2].reshape(len(batch), SEQUENCE_LENGTH, -1, 3)
+    np.testing.assert_allclose(hand[..., 0], 1.0 - ref[..., 0], rtol=1e-6)
+    np.testing.assert_array_equal(hand[..., 1:], ref[..., 1:])
+
+
+def test_time_warp_without_speed_change_is_identity():
+    batch = one_hand_batch()
+    out = random_time_warp(tf.constant(batch), max_speed=0.0).numpy()
+    np.testing.assert_allclose(out, batch, rtol=1e-6)
+
+
+def test_time_warp_does_not_blend_hands_with_missing_frames():
+    batch = one_hand_batch()
+    # La primera mano desaparece en frames alternos de la primera mitad
+    batch[:, 1:SEQUENCE_LENGTH // 2:2, :KEYPOINT_DIM // 2] = 0.0
+    out = random_time_warp(tf.constant(batch), max_speed=0.5).numpy()
+    hands = out.reshape(len(batch), SEQUENCE_LENGTH, 2, -1)
+    ref = batch.reshape(len(batch), SEQUENCE_LENGTH, 2, -1)
+    assert np.all(hands[:, :, 1] == 0.0)
+    # Cada mano es o bien un bloque de ceros o una mezcla de manos presentes:
+    # nunca una mano encogida hacia el origen
+    present = np.any(hands != 0.0, axis=-1)
+    lowest = ref[:, :, 0][np.any(ref[:, :, 0] != 0.0, axis=-1)].min()
+    assert np.all(np.all(hands[:, :, 0] == 0.0, axis=-1) | (hands[:, :, 0].min(axis=-1) >= lowest - 1e-6))
+    assert present[:, :, 0].any()
@@ -0,0 +1,114 @@
+"""
+Pruebas de la traducción por lotes de videos grabados
+"""
+
+import csv
+import io
+import json
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+import batch_translate
+from batch_translate import score_windows, translate_video, write_rows, resample_to_grid, OUTPUT_FIELDS
+from utils.constants import SEQUENCE_LENGTH, KEYPOINT_DIM
+
+
+class FakePredictor:
+    """Dos clases: la 1 es más probable cuanto mayor es el primer frame de la ventana."""
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def predict_batch(self, windows):
+        self.batch_sizes.append(len(windows))
+        first = windows[:, 0, 0]
+        return np.stack([1 - first, first], axis=1).astype(np.float32)
+
+
+def ramp(n_frames):
+    keypoints = np.zeros((n_frames, KEYPOINT_DIM), dtype=np.float32)
+    keypoints[:, 0] = np.linspace(0, 1, n_frames)
+    return keypoints
+
+
+def test_score_windows_slides_and_batches():
+    keypoints = ramp(SEQUENCE_LENGTH + 9)
+    predictor = FakePredictor()
+    starts, probs = score_windows(predictor, keypoints, batch_size=4)
+    assert starts.tolist() == list(range(10)) and probs.shape == (10, 2)
+    assert predictor.batch_sizes == [4, 4, 2]
+    np.testing.assert_allclose(probs[:, 1], keypoints[:10, 0])
+
+    starts, probs = score_windows(FakePredictor(), keypoints, batch_size=4, window_step=3)
+    assert starts.tolist() == [0, 3, 6, 9]
+    np.testing.assert_allclose(probs[:, 1], keypoints[starts, 0])
+
+    starts, probs = score_windows(FakePredictor(), keypoints[:SEQUENCE_LENGTH - 1], batch_size=4)
+    assert len(starts) == 0 and len(probs) == 0
+
+
+def test_translate_video_rows_and_formats(monkeypatch):
+    n_frames = SEQUENCE_LENGTH + 4
+    timestamps = np.arange(n_frames) / 10
+    keypoints = np.zeros((n_frames, KEYPOINT_DIM), dtype=np.float32)
+    keypoints[:5, 0] = [0.0, 0.1, 0.5, 0.9, 1.0]
+    monkeypatch.setattr(batch_translate, 'extract_video_keypoints',
+                        lambda path, hands: (keypoints, timestamps, 10.0))
+    monkeypatch.setattr(batch_translate, '_worker', {'hands': None, 'predictor': FakePredictor(),
+                                                     'label_map': {'0': 'hola', '1': 'adios'}})
+
+    # Sin remuestreo: una muestra por frame
+    video, rows, frames, _ = translate_video('cabina.mp4', batch_size=8, window_step=1, min_confidence=0.6,
+                                             sample_fps=None)
+    assert video == 'cabina.mp4' and frames == n_frames
+    # La ventana con confianza 0.5 se omite
+    assert [row['label'] for row in rows] == ['hola', 'hola', 'adios', 'adios']
+    last = rows[-1]
+    assert last['start_frame'] == 4 and last['end_frame'] == n_frames - 1
+    assert last['start_s'] == 0.4 and last['end_s'] == round(timestamps[-1], 3)
+    assert list(last) == OUTPUT_FIELDS
+
+    out = io.StringIO()
+    write_rows(out, 'jsonl', rows)
+    assert [json.loads(line) for line in out.getvalue().splitlines()] == rows
+
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=OUTPUT_FIELDS)
+    writer.writeheader()
+    write_rows(writer, 'csv', rows)
+    parsed = list(csv.DictReader(io.StringIO(out.getvalue())))
+    assert len(parsed) == 4 and parsed[0]['label'] == 'hola' and parsed[0]['file'] == 'cabina.mp4'
+
+
+def test_video_windows_follow_capture_grid(monkeypatch):
+    # Video a 30 FPS y rejilla a 15: cada ventana cubre (SEQUENCE_LENGTH - 1) / 15 s, como al entrenar
+    n_frames = 4 * SEQUENCE_LENGTH
+    timestamps = np.arange(n_frames) / 30
+    keypoints = ramp(n_frames)
+    samples, times, sources = resample_to_grid(keypoints, timestamps, fps=15)
+    assert len(samples) == n_frames // 2 and sources.tolist() == list(range(0, n_frames, 2))
+    np.testing.assert_array_equal(samples, keypoints[::2])
+
+    monkeypatch.setattr(batch_translate, 'extract_video_keypoints',
+                        lambda path, hands: (keypoints, timestamps, 30.0))
+    monkeypatch.setattr(batch_translate, '_worker', {'hands': None, 'predictor': FakePredictor(),
+                                                     'label_map': {'0': 'hola', '1': 'adios'}})
+    _, rows, frames, _ = translate_video('cabina.mp4', batch_size=8, window_step=1, min_confidence=0.0,
+                                         sample_fps=15)
+    assert frames == n_frames and len(rows) == n_frames // 2 - SEQUENCE_LENGTH + 1
+    for row in rows:
+        assert row['end_s'] - row['start_s'] == pytest.approx((SEQUENCE_LENGTH - 1) / 15, abs=1e-3)
+        assert row['end_frame'] - row['start_frame'] == 2 * (SEQUENCE_LENGTH - 1)
+    assert rows[1]['start_s'] == pytest.approx(1 / 15, abs=1e-3)
+
+
+def test_late_frames_fill_missed_grid_slots():
+    timestamps = np.array([0.0, 0.05, 0.3])
+    samples, times, sources = resample_to_grid(np.arange(3.0)[:, None], timestamps, fps=10)
+    assert sources.tolist() == [0, 2, 2, 2]
+    np.testing.assert_allclose(times, [0.0, 0.1, 0.2, 0.3])
@@ -0,0 +1,93 @@
+"""
+Pruebas de la captura de muestras a ritmo de cámara
+"""
+
+import json
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from utils.capture import SequenceSampler, SampleCapture, CAPTURE_LOG
+from utils.constants import KEYPOINT_DIM
+from utils.keypoints import LANDMARKS_PER_HAND
+
+
+class FakeCamera:
+    """Cámara a ~200 FPS cuyos frames llevan su número como valor de los píxeles."""
+
+    def __init__(self):
+        self.frames = 0
+
+    def read(self):
+        time.sleep(0.005)
+        self.frames += 1
+        return True, np.full((8, 8, 3), self.frames % 256, dtype=np.uint8)
+
+
+def fake_hands(frame):
+    landmarks = [SimpleNamespace(x=float(frame[0, 0, 0]), y=0.5, z=0.0) for _ in range(LANDMARKS_PER_HAND)]
+    return SimpleNamespace(multi_hand_landmarks=[SimpleNamespace(landmark=landmarks)])
+
+
+def test_sampler_follows_time_grid_and_fills_missed_slots():
+    sampler = SequenceSampler(length=4, fps=10)
+    assert sampler.offer(1.0) is None
+    sampler.start('a', t0=1.0)
+    assert sampler.offer(0.99) is None
+    key, slots = sampler.offer(1.01)
+    assert key == 'a' and list(slots) == [0]
+    assert sampler.offer(1.05) is None
+    # Un frame retrasado ocupa los instantes que se perdieron
+    assert list(sampler.offer(1.25)[1]) == [1, 2]
+    assert sampler.recording
+    assert list(sampler.offer(1.31)[1]) == [3]
+    assert not sampler.recording and sampler.offer(1.4) is None
+
+
+def test_open_ended_grid_for_live_window():
+    sampler = SequenceSampler(length=None, fps=10)
+    sampler.start('ventana', t0=0.0)
+    assert list(sampler.offer(0.0)[1]) == [0]
+    assert sampler.offer(0.05) is None
+    assert list(sampler.offer(0.35)[1]) == [1, 2, 3]
+    assert sampler.recording and sampler.duration is None
+
+
+def test_sample_capture_writes_sequence_and_timing(tmp_path):
+    seen = []
+    capture = SampleCapture(FakeCamera(), fake_hands, length=5, fps=50,
+                            on_keypoints=lambda frame_id, keypoints: seen.append(frame_id))
+    capture.start()
+    try:
+        path = str(tmp_path / '0.npy')
+        capture.record(path, action='hola', sequence=0)
+        deadline = time.perf_counter() + 5
+        while (capture.sampler.recording or capture.busy) and time.perf_counter() < deadline:
+            time.sleep(0.01)
+        assert capture.preview.get(timeout=1) is not None
+    finally:
+        capture.stop()
+
+    assert capture.completed == 1 and capture.writer.written == 1
+    sequence = np.load(path)
+    assert sequence.shape == (5, KEYPOINT_DIM)
+    assert np.all(np.diff(sequence[:, 0]) >= 0) and sequence[-1, 0] > sequence[0, 0]
+    record = json.loads((tmp_path / CAPTURE_LOG).read_text())
+    assert record['file'] == '0.npy' and record['action'] == 'hola'
+    offsets = record['offsets_s']
+    assert offsets[0] == 0 and np.all(np.diff(offsets) >= 0) and offsets[-1] > 3 / 50
+    assert len(seen) >= 1
+
+
+def test_cancel_discards_partial_sequence(tmp_path):
+    capture = SampleCapture(FakeCamera(), fake_hands, length=5, fps=2)
+    capture.start()
+    try:
+        capture.record(str(tmp_path / '0.npy'))
+        time.sleep(0.1)
+        capture.cancel()
+        assert not capture.busy
+    finally:
+        capture.stop()
+    assert capture.writer.written == 0 and not (tmp_path / '0.npy').exists()
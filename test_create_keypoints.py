@@ -0,0 +1,81 @@
+"""
+Pruebas de la extracción de keypoints en paralelo con un MediaPipe falso
+"""
+
+import os
+import sys
+import types
+
+import cv2
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+import create_keypoints
+from utils.constants import KEYPOINT_DIM
+
+
+class FakeHands:
+    """Simula el seguimiento de MediaPipe: el resultado depende de los frames ya vistos."""
+
+    def __init__(self, **kwargs):
+        self.seen = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def process(self, frame_rgb):
+        self.seen += 1
+        landmarks = [types.SimpleNamespace(x=float(self.seen), y=float(frame_rgb[0, 0, 0]), z=0.0)
+                     for _ in range(21)]
+        hand = types.SimpleNamespace(landmark=landmarks)
+        return types.SimpleNamespace(multi_hand_landmarks=[hand])
+
+
+def make_dataset(root, actions, n_sequences=3, n_frames=4):
+    for a, action in enumerate(actions):
+        for seq in range(n_sequences):
+            seq_path = os.path.join(root, action, str(seq))
+            os.makedirs(seq_path)
+            for i in range(n_frames):
+                frame = np.full((8, 8, 3), a * 50 + seq * 10 + i, dtype=np.uint8)
+                cv2.imwrite(os.path.join(seq_path, f"{i}.jpg"), frame)
+
+
+def run_extraction(tmp_path, monkeypatch, name, workers):
+    actions = ['hola', 'gracias']
+    data_path = str(tmp_path / 'frames')
+    if not os.path.isdir(data_path):
+        make_dataset(data_path, actions)
+    keypoints_path = str(tmp_path / name)
+    monkeypatch.setattr(create_keypoints, 'ACTIONS', actions)
+    monkeypatch.setattr(create_keypoints, 'DATA_PATH', data_path)
+    monkeypatch.setattr(create_keypoints, 'KEYPOINTS_PATH', keypoints_path)
+    create_keypoints.process_all_sequences(workers=workers, force=True)
+
+    outputs = {}
+    for dirpath, _, files in os.walk(keypoints_path):
+        for f in files:
+            path = os.path.join(dirpath, f)
+            outputs[os.path.relpath(path, keypoints_path)] = np.load(path)
+    return outputs
+
+
+def test_output_does_not_depend_on_worker_count(tmp_path, monkeypatch):
+    fake_mp = types.SimpleNamespace(solutions=types.SimpleNamespace(hands=types.SimpleNamespace(Hands=FakeHands)))
+    monkeypatch.setitem(sys.modules, 'mediapipe', fake_mp)
+
+    single = run_extraction(tmp_path, monkeypatch, 'uno', workers=1)
+    several = run_extraction(tmp_path, monkeypatch, 'varios', workers=3)
+
+    # Solo los .npy finales, sin temporales que los cargadores puedan recoger
+    assert sorted(single) == sorted(several)
+    assert len(single) == 6 and all(k.endswith('.npy') for k in single)
+    for key, keypoints in single.items():
+        assert keypoints.shape == (4, KEYPOINT_DIM)
+        np.testing.assert_array_equal(keypoints, several[key])
+        # El seguimiento empieza de cero en cada secuencia
+        np.testing.assert_array_equal(keypoints[:, 0], [1, 2, 3, 4])
@@ -0,0 +1,76 @@
+"""
+Pruebas del dataset de keypoints empaquetado
+"""
+
+import os
+
+import numpy as np
+
+from utils.constants import SEQUENCE_LENGTH, KEYPOINT_DIM
+from utils.dataset import pack_keypoints, load_packed, read_index
+
+
+def write_sequences(keypoints_path, action, start, count):
+    os.makedirs(os.path.join(keypoints_path, action), exist_ok=True)
+    sequences = {}
+    for i in range(start, start + count):
+        seq = np.random.random((SEQUENCE_LENGTH, KEYPOINT_DIM)).astype(np.float32)
+        np.save(os.path.join(keypoints_path, action, f"{i}.npy"), seq)
+        sequences[f"{action}/{i}.npy"] = seq
+    return sequences
+
+
+def test_pack_and_append(tmp_path):
+    keypoints_path, packed_path = str(tmp_path / 'keypoints'), str(tmp_path / 'packed')
+    actions = ['hola', 'adios']
+    expected = write_sequences(keypoints_path, 'hola', 0, 3)
+    expected.update(write_sequences(keypoints_path, 'adios', 0, 2))
+
+    assert pack_keypoints(keypoints_path, packed_path, actions) == (5, 0)
+    assert pack_keypoints(keypoints_path, packed_path, actions) == (0, 0)
+
+    # Las secuencias nuevas se añaden al final sin tocar las existentes
+    expected.update(write_sequences(keypoints_path, 'hola', 3, 2))
+    np.save(os.path.join(keypoints_path, 'adios', 'mala.npy'), np.zeros((3, KEYPOINT_DIM)))
+    assert pack_keypoints(keypoints_path, packed_path, actions) == (2, 1)
+
+    X, y, index = load_packed(packed_path, actions)
+    assert isinstance(X, np.memmap)
+    assert X.shape == (7, SEQUENCE_LENGTH, KEYPOINT_DIM)
+    for row, label, source in zip(X, y, index['sources']):
+        np.testing.assert_array_equal(row, expected[source])
+        assert actions[label] == source.split('/')[0]
+
+
+def test_repack_rewrites_overwritten_sequences(tmp_path):
+    keypoints_path, packed_path = str(tmp_path / 'keypoints'), str(tmp_path / 'packed')
+    expected = write_sequences(keypoints_path, 'hola', 0, 3)
+    pack_keypoints(keypoints_path, packed_path, ['hola'])
+
+    # Regrabar 1.npy (misma forma, mismo tamaño) debe reemplazar su fila, no añadir otra
+    path = os.path.join(keypoints_path, 'hola', '1.npy')
+    expected['hola/1.npy'] = np.random.random((SEQUENCE_LENGTH, KEYPOINT_DIM)).astype(np.float32)
+    np.save(path, expected['hola/1.npy'])
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert pack_keypoints(keypoints_path, packed_path, ['hola']) == (1, 0)
+    assert pack_keypoints(keypoints_path, packed_path, ['hola']) == (0, 0)
+
+    X, _, index = load_packed(packed_path, ['hola'])
+    assert X.shape[0] == 3
+    for row, source in zip(X, index['sources']):
+        np.testing.assert_array_equal(row, expected[source])
+
+
+def test_load_packed_remaps_and_filters_actions(tmp_path):
+    keypoints_path, packed_path = str(tmp_path / 'keypoints'), str(tmp_path / 'packed')
+    write_sequences(keypoints_path, 'hola', 0, 2)
+    write_sequences(keypoints_path, 'adios', 0, 1)
+    pack_keypoints(keypoints_path, packed_path, ['hola', 'adios'])
+
+    X, y, _ = load_packed(packed_path, ['adios', 'gracias', 'hola'])
+    assert sorted(y.tolist()) == [0, 2, 2]
+
+    X, y, _ = load_packed(packed_path, ['adios'])
+    assert X.shape[0] == 1 and y.tolist() == [0]
+    assert read_index(packed_path)['count'] == 3
@@ -0,0 +1,66 @@
+"""
+Pruebas del índice de embeddings para registrar señas
+"""
+
+import numpy as np
+import pytest
+
+from utils.embedding_index import EmbeddingIndex, extractor_fingerprint
+
+
+def clustered(rng, center, n=5, noise=0.05):
+    return center + noise * rng.standard_normal((n, len(center)))
+
+
+def test_nearest_sign_and_incremental_add():
+    rng = np.random.default_rng(0)
+    centers = rng.standard_normal((200, 32))
+    index = EmbeddingIndex(32)
+    for i, center in enumerate(centers):
+        index.add(f"seña_{i}", clustered(rng, center))
+    assert len(index) == 200
+
+    for i in (0, 57, 199):
+        (label, score), = index.search(clustered(rng, centers[i], n=1)[0])
+        assert label == f"seña_{i}" and score > 0.9
+    probs = index.probabilities(centers[57])
+    assert probs.shape == (200,) and np.isclose(probs.sum(), 1) and probs.argmax() == 57
+
+    # Añadir más muestras a una seña existente no crea otra fila
+    index.add("seña_3", clustered(rng, centers[3], n=2))
+    assert len(index) == 200 and index.count("seña_3") == 7
+    index.remove("seña_3")
+    assert "seña_3" not in index and index.search(centers[3])[0][0] != "seña_3"
+
+
+@pytest.mark.parametrize('quantize', [False, True])
+def test_save_and_load(tmp_path, quantize):
+    rng = np.random.default_rng(1)
+    centers = rng.standard_normal((20, 16))
+    index = EmbeddingIndex(16, quantize=quantize)
+    for i, center in enumerate(centers):
+        index.add(f"s{i}", clustered(rng, center))
+    path = str(tmp_path / 'embedding_index.npz')
+    index.save(path)
+
+    loaded = EmbeddingIndex.load(path)
+    assert loaded.labels == index.labels and loaded.quantize == quantize
+    np.testing.assert_allclose(loaded.similarities(centers[4]), index.similarities(centers[4]), atol=1e-2)
+    assert loaded.search(centers[4])[0][0] == "s4"
+    assert loaded.extractor is None
+    # Un índice cargado admite más muestras
+    loaded.add("s4", clustered(rng, centers[4]))
+    assert loaded.count("s4") == 10
+
+
+def test_extractor_fingerprint_is_saved(tmp_path):
+    extractor = tmp_path / 'actions_embedding.tflite'
+    extractor.write_bytes(b'modelo')
+    fingerprint = extractor_fingerprint(str(extractor))
+    index = EmbeddingIndex(4, extractor=fingerprint)
+    index.add('hola', np.ones((1, 4)))
+    index.save(str(tmp_path / 'embedding_index.npz'))
+    assert EmbeddingIndex.load(str(tmp_path / 'embedding_index.npz')).extractor == fingerprint
+
+    extractor.write_bytes(b'modelo reentrenado')
+    assert extractor_fingerprint(str(extractor)) != fingerprint
@@ -0,0 +1,101 @@
+"""
+Pruebas de la grabación y reproducción de sesiones
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+from utils.constants import KEYPOINT_DIM
+from utils.frame_source import SessionRecorder, open_frame_source, ReplaySource, DATA_FILE, VIDEO_FILE
+
+
+class FakeCamera:
+    def __init__(self, n_frames):
+        self.frames = [np.full((48, 64, 3), i * 20, dtype=np.uint8) for i in range(n_frames)]
+
+    def read(self):
+        if not self.frames:
+            return False, None
+        return True, self.frames.pop(0)
+
+    def get(self, prop):
+        return 30.0
+
+    def isOpened(self):
+        return True
+
+    def release(self):
+        pass
+
+
+def test_record_and_replay_session(tmp_path):
+    session = str(tmp_path / 'sesion')
+    recorder = SessionRecorder(FakeCamera(6), session)
+    keypoints = np.random.random((6, KEYPOINT_DIM)).astype(np.float32)
+    for i in range(6):
+        ret, _ = recorder.read()
+        assert ret
+        if i != 3:  # La etapa de landmarks se saltó este frame
+            recorder.add_keypoints(i, keypoints[i])
+    recorder.release()
+
+    replay = open_frame_source(session, realtime=False)
+    assert isinstance(replay, ReplaySource)
+    frames = []
+    while True:
+        ret, frame = replay.read()
+        if not ret:
+            break
+        frames.append(frame)
+    assert len(frames) == 6 and replay.finished
+    # El video está comprimido con pérdidas: solo se comprueba el brillo aproximado
+    np.testing.assert_allclose([f.mean() for f in frames], [i * 20 for i in range(6)], atol=8)
+    assert np.all(np.diff(replay.timestamps) >= 0)
+    np.testing.assert_array_equal(replay.has_landmarks, [True, True, True, False, True, True])
+    np.testing.assert_array_equal(replay.landmarks[replay.has_landmarks], keypoints[[0, 1, 2, 4, 5]])
+
+
+def record_session(path, n_frames):
+    recorder = SessionRecorder(FakeCamera(n_frames), path)
+    for _ in range(n_frames):
+        recorder.read()
+    recorder.release()
+
+
+def test_replay_ends_when_video_is_shorter_than_session(tmp_path):
+    session = str(tmp_path / 'sesion')
+    record_session(session, 4)
+    # Más instantes que frames en el video (grabación truncada)
+    data_path = os.path.join(session, DATA_FILE)
+    with np.load(data_path) as data:
+        fields = dict(data)
+    fields['timestamps'] = np.arange(7) / 30
+    fields['landmarks'] = np.zeros((7, KEYPOINT_DIM), dtype=np.float32)
+    fields['has_landmarks'] = np.zeros(7, dtype=bool)
+    np.savez_compressed(data_path, **fields)
+
+    replay = ReplaySource(session, realtime=False)
+    frames = 0
+    while replay.read()[0]:
+        frames += 1
+    assert frames == 4 and replay.finished
+    assert not replay.read()[0]
+
+
+def test_unreadable_session_video_raises(tmp_path):
+    session = str(tmp_path / 'sesion')
+    record_session(session, 2)
+    os.remove(os.path.join(session, VIDEO_FILE))
+    with pytest.raises(IOError):
+        ReplaySource(session)
+
+
+def test_recorder_raises_when_video_cannot_be_written(tmp_path):
+    session = tmp_path / 'sesion'
+    # Una carpeta en lugar del archivo de video impide abrir el escritor
+    (session / VIDEO_FILE).mkdir(parents=True)
+    recorder = SessionRecorder(FakeCamera(1), str(session))
+    with pytest.raises(IOError):
+        recorder.read()
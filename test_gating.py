@@ -0,0 +1,32 @@
+"""
+Pruebas de la puerta de inferencia por reposo y movimiento
+"""
+
+import numpy as np
+
+from utils.constants import SEQUENCE_LENGTH, KEYPOINT_DIM
+from utils.gating import InferenceGate
+
+
+def test_gate_skips_idle_and_still_windows():
+    gate = InferenceGate(motion_threshold=0.01)
+    idle = np.zeros((SEQUENCE_LENGTH, KEYPOINT_DIM), dtype=np.float32)
+    hands = np.random.default_rng(0).random((SEQUENCE_LENGTH, KEYPOINT_DIM)).astype(np.float32)
+
+    assert not gate.should_run(idle)
+    assert gate.should_run(hands)
+    assert not gate.should_run(hands + 0.001)      # Casi sin movimiento
+    assert gate.should_run(hands + 0.05)
+    assert not gate.should_run(idle)
+    # Al volver las manos se puntúa aunque la ventana sea igual a la última
+    assert gate.should_run(hands + 0.05)
+    assert (gate.executed, gate.skipped_idle, gate.skipped_still) == (3, 2, 1)
+
+
+def test_gate_compares_against_last_scored_window():
+    gate = InferenceGate(motion_threshold=0.01)
+    window = np.full((SEQUENCE_LENGTH, KEYPOINT_DIM), 0.5, dtype=np.float32)
+    assert gate.should_run(window)
+    # Una deriva lenta acaba superando el umbral respecto a la última ventana puntuada
+    results = [gate.should_run(window + 0.004 * i) for i in range(1, 4)]
+    assert results == [False, False, True]
@@ -0,0 +1,52 @@
+"""
+Pruebas del entrenamiento incremental (ampliar la salida y elegir muestras nuevas)
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+from utils.constants import SEQUENCE_LENGTH, KEYPOINT_DIM
+
+tf = pytest.importorskip('tensorflow')
+
+
+def test_extend_head_keeps_existing_outputs():
+    from train_model import create_model, extend_head
+
+    model = create_model((SEQUENCE_LENGTH, KEYPOINT_DIM), 3, 'mlp', width=0.25)
+    extended = extend_head(model, 5)
+    assert extended.output_shape == (None, 5)
+
+    old_kernel, old_bias = model.layers[-1].get_weights()
+    kernel, bias = extended.layers[-1].get_weights()
+    np.testing.assert_array_equal(kernel[:, :3], old_kernel)
+    np.testing.assert_array_equal(bias[:3], old_bias)
+    # Mismo cuerpo: las salidas anteriores conservan su orden relativo
+    windows = np.random.random((4, SEQUENCE_LENGTH, KEYPOINT_DIM)).astype(np.float32)
+    old_logits = np.log(model(windows, training=False).numpy())
+    new_logits = np.log(extended(windows, training=False).numpy()[:, :3])
+    np.testing.assert_allclose(new_logits - new_logits[:, :1], old_logits - old_logits[:, :1], atol=1e-4)
+    with pytest.raises(ValueError):
+        extend_head(model, 2)
+
+
+def test_incremental_indices_select_new_and_replay():
+    from train_model import incremental_indices
+
+    labels = np.array([0, 0, 0, 1, 1, 1, 2, 2])
+    sources = [f"s{i}" for i in range(len(labels))]
+    # s5 es una muestra nueva de una etiqueta existente; la etiqueta 2 es nueva
+    seen = ["s0", "s1", "s2", "s3", "s4"]
+    new, replay = incremental_indices(labels, sources, seen, old_classes=2, replay_per_class=2)
+    assert list(new) == [5, 6, 7]
+    assert len(replay) == 4 and set(replay) <= {0, 1, 2, 3, 4}
+    assert sorted(labels[replay]) == [0, 0, 1, 1]
+
+    # Sin registro de muestras vistas, solo cuentan como nuevas las etiquetas nuevas
+    new, _ = incremental_indices(labels, sources, None, old_classes=2, replay_per_class=2)
+    assert list(new) == [6, 7]
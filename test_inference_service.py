@@ -0,0 +1,104 @@
+"""
+Pruebas de los micro-lotes y del formato de entrada del servicio de inferencia
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+from inference_service import MicroBatcher, parse_window, WINDOW_SHAPE
+from utils.constants import SEQUENCE_LENGTH
+
+
+class FakePredictor:
+    """Devuelve como "probabilidades" el primer valor de cada ventana, para saber a quién va cada fila."""
+
+    backend = 'fake'
+    batched = True
+
+    def __init__(self, fail=False):
+        self.batch_sizes = []
+        self.fail = fail
+
+    def predict_batch(self, windows):
+        if self.fail:
+            raise RuntimeError("modelo roto")
+        self.batch_sizes.append(len(windows))
+        return np.stack([[w[0, 0], -w[0, 0]] for w in windows])
+
+
+def window(value):
+    return np.full(WINDOW_SHAPE, value, dtype=np.float32)
+
+
+def run_batcher(predictor, max_batch, max_wait, scenario):
+    async def main():
+        batcher = MicroBatcher(predictor, max_batch=max_batch, max_wait=max_wait)
+        batcher.start()
+        try:
+            return await scenario(batcher), batcher
+        finally:
+            await batcher.stop()
+    return asyncio.run(main())
+
+
+def test_flushes_full_batch_without_waiting_and_routes_results():
+    predictor = FakePredictor()
+
+    async def scenario(batcher):
+        start = time.perf_counter()
+        results = await asyncio.gather(*(batcher.predict(window(i)) for i in range(8)))
+        return results, time.perf_counter() - start
+
+    (results, elapsed), batcher = run_batcher(predictor, max_batch=4, max_wait=5.0, scenario=scenario)
+    # Dos lotes llenos: no se espera a que venza `max_wait`
+    assert elapsed < 1.0 and predictor.batch_sizes == [4, 4]
+    assert [float(res[0]) for res in results] == list(range(8))
+    assert batcher.batches == 2 and batcher.requests == 8
+
+
+def test_flushes_partial_batch_after_timeout():
+    predictor = FakePredictor()
+
+    async def scenario(batcher):
+        first = await asyncio.gather(*(batcher.predict(window(i)) for i in range(3)))
+        later = await batcher.predict(window(7))
+        return first, later
+
+    (first, later), _ = run_batcher(predictor, max_batch=32, max_wait=0.02, scenario=scenario)
+    assert predictor.batch_sizes == [3, 1]
+    assert [float(res[0]) for res in first] == [0, 1, 2] and float(later[0]) == 7
+
+
+def test_predictor_error_reaches_every_request():
+    async def scenario(batcher):
+        return await asyncio.gather(*(batcher.predict(window(i)) for i in range(2)), return_exceptions=True)
+
+    results, batcher = run_batcher(FakePredictor(fail=True), max_batch=4, max_wait=0.01, scenario=scenario)
+    assert all(isinstance(res, RuntimeError) for res in results) and batcher.batches == 0
+
+
+def test_parse_window_accepts_json_and_binary():
+    data = np.random.random(WINDOW_SHAPE).astype(np.float32)
+    np.testing.assert_array_equal(parse_window(json.dumps({'keypoints': data.tolist()}), binary=False), data)
+    np.testing.assert_array_equal(parse_window(data.astype('<f4').tobytes(), binary=True), data)
+
+
+@pytest.mark.parametrize('data, binary', [
+    (b'\x00' * 12, True),
+    ('no es json', False),
+    (json.dumps({'ventana': []}), False),
+    (json.dumps({'keypoints': [[0.0] * 3] * SEQUENCE_LENGTH}), False),
+    (json.dumps({'keypoints': [[0.0, 'a']]}), False),
+    (json.dumps([1, 2, 3]), False),
+])
+def test_parse_window_rejects_malformed_input(data, binary):
+    with pytest.raises(ValueError):
+        parse_window(data, binary)
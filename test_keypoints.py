@@ -0,0 +1,74 @@
+"""
+Pruebas de la extracción de keypoints y de la ventana circular de secuencias
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+
+from utils.constants import SEQUENCE_LENGTH, KEYPOINT_DIM
+from utils.keypoints import extract_keypoints, SequenceBuffer, LANDMARKS_PER_HAND
+
+
+def fake_results(n_hands, offset=0.0):
+    """Simula la salida de `hands.process()` con `n_hands` manos."""
+    if n_hands == 0:
+        return SimpleNamespace(multi_hand_landmarks=None)
+    hands = []
+    for h in range(n_hands):
+        landmarks = [SimpleNamespace(x=offset + h + i * 0.01, y=0.5, z=-0.1 * i)
+                     for i in range(LANDMARKS_PER_HAND)]
+        hands.append(SimpleNamespace(landmark=landmarks))
+    return SimpleNamespace(multi_hand_landmarks=hands)
+
+
+def reference_keypoints(results):
+    """Implementación original basada en listas."""
+    keypoints = []
+    if results.multi_hand_landmarks:
+        for hand_landmarks in results.multi_hand_landmarks:
+            for landmark in hand_landmarks.landmark:
+                keypoints.extend([landmark.x, landmark.y, landmark.z])
+    keypoints = keypoints[:126]
+    while len(keypoints) < 126:
+        keypoints.append(0.0)
+    return np.array(keypoints, dtype=np.float32)
+
+
+def test_extract_keypoints_matches_reference():
+    for n_hands in range(4):
+        results = fake_results(n_hands)
+        kp = extract_keypoints(results)
+        assert kp.shape == (KEYPOINT_DIM,)
+        assert kp.dtype == np.float32
+        np.testing.assert_array_equal(kp, reference_keypoints(results))
+
+
+def test_extract_keypoints_clears_stale_hands():
+    out = extract_keypoints(fake_results(2))
+    extract_keypoints(fake_results(1), out=out)
+    np.testing.assert_array_equal(out, reference_keypoints(fake_results(1)))
+
+
+def test_sequence_buffer_window_is_chronological_view():
+    buffer = SequenceBuffer()
+    frames = np.random.random((SEQUENCE_LENGTH * 3 + 4, KEYPOINT_DIM)).astype(np.float32)
+    for i, frame in enumerate(frames):
+        buffer.append(frame)
+        assert buffer.full == (i + 1 >= SEQUENCE_LENGTH)
+        np.testing.assert_array_equal(buffer.latest, frame)
+        if buffer.full:
+            window = buffer.window()
+            assert window.flags['C_CONTIGUOUS']
+            np.testing.assert_array_equal(window, frames[i + 1 - SEQUENCE_LENGTH:i + 1])
+
+
+def test_sequence_buffer_push_results():
+    buffer = SequenceBuffer()
+    for i in range(SEQUENCE_LENGTH):
+        buffer.push_results(fake_results(i % 3, offset=i))
+    expected = np.stack([reference_keypoints(fake_results(i % 3, offset=i))
+                         for i in range(SEQUENCE_LENGTH)])
+    np.testing.assert_array_equal(buffer.window(), expected)
+    buffer.reset()
+    assert not buffer.full
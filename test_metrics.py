@@ -0,0 +1,40 @@
+"""
+Pruebas de las métricas de latencia por etapa y de su exportación
+"""
+
+import json
+
+import numpy as np
+
+from utils.metrics import LatencyTracker, MetricsExporter, format_prometheus
+
+
+def test_latency_tracker_rolling_percentiles():
+    tracker = LatencyTracker(window=100)
+    assert tracker.summary()['p50_ms'] == 0.0
+    for i in range(200):
+        tracker.record((i % 100 + 1) / 1000, now=i * 0.01)
+    summary = tracker.summary()
+    assert summary['count'] == 200
+    np.testing.assert_allclose(summary['p50_ms'], 50.5)
+    np.testing.assert_allclose(summary['p95_ms'], 95.05)
+    np.testing.assert_allclose(summary['fps'], 100.0)
+
+
+def test_exporter_formats(tmp_path):
+    stages = {'capture': {'count': 3, 'fps': 30.0, 'p50_ms': 1.5, 'p95_ms': 2.0}}
+    text = format_prometheus(stages)
+    assert 'lesai_stage_latency_ms{stage="capture",quantile="0.95"} 2' in text
+    assert 'lesai_stage_events_total{stage="capture"} 3' in text
+
+    prom = MetricsExporter(str(tmp_path / 'lesai.prom'), interval=10)
+    assert prom.maybe_export(stages, now=0.0)
+    assert not prom.maybe_export(stages, now=5.0)
+    assert (tmp_path / 'lesai.prom').read_text() == text
+
+    log = MetricsExporter(str(tmp_path / 'metrics.jsonl'), interval=10)
+    log.maybe_export(stages, now=0.0)
+    log.maybe_export(stages, now=11.0)
+    lines = (tmp_path / 'metrics.jsonl').read_text().splitlines()
+    assert len(lines) == 2
+    assert json.loads(lines[0])['stages'] == stages
@@ -0,0 +1,87 @@
+"""
+Pruebas del pipeline: muestreo de la ventana en tiempo real y vaciado al terminar una fuente finita
+"""
+
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from utils.constants import SEQUENCE_LENGTH
+from utils.pipeline import TranslationPipeline
+
+
+class FiniteCamera:
+    """Fuente finita; con `fps` expone el instante de cada frame como una sesión grabada."""
+
+    def __init__(self, n_frames, fps=None):
+        self.remaining = n_frames
+        self.read_count = 0
+        if fps:
+            self.fps = fps
+
+    @property
+    def position(self):
+        fps = getattr(self, 'fps', None)
+        return None if fps is None else (self.read_count - 1) / fps
+
+    def read(self):
+        if not self.remaining:
+            return False, None
+        self.remaining -= 1
+        self.read_count += 1
+        return True, np.zeros((8, 8, 3), dtype=np.uint8)
+
+
+class SlowPredictor:
+    def __init__(self):
+        self.frame_ids = []
+
+    def update(self, window, frame_id=None):
+        time.sleep(0.005)
+        self.frame_ids.append(frame_id)
+        return np.array([1.0])
+
+
+def slow_hands(frame):
+    time.sleep(0.002)
+    return SimpleNamespace(multi_hand_landmarks=None)
+
+
+def run_to_end(camera, predictor, sample_fps):
+    pipeline = TranslationPipeline(camera, slow_hands, predictor, lossless=True, sample_fps=sample_fps)
+    pipeline.start()
+    try:
+        while camera.remaining:
+            time.sleep(0.001)
+        assert pipeline.drain(frames=camera.read_count, timeout=10)
+    finally:
+        pipeline.stop()
+    return pipeline
+
+
+def test_drain_waits_for_every_frame_and_window():
+    n_frames = SEQUENCE_LENGTH + 10
+    predictor = SlowPredictor()
+    pipeline = run_to_end(FiniteCamera(n_frames), predictor, sample_fps=None)
+
+    assert pipeline.landmarks.processed == n_frames
+    # Cada ventana se publica con su número de muestra
+    assert predictor.frame_ids == list(range(SEQUENCE_LENGTH, n_frames + 1))
+
+
+def test_live_window_follows_capture_time_grid():
+    # Cámara a 30 FPS y rejilla a 15: entra un frame de cada dos
+    n_frames = 2 * SEQUENCE_LENGTH + 10
+    predictor = SlowPredictor()
+    pipeline = run_to_end(FiniteCamera(n_frames, fps=30), predictor, sample_fps=15)
+
+    assert pipeline.landmarks.processed == n_frames
+    assert pipeline.landmarks.samples == SEQUENCE_LENGTH + 5
+    assert predictor.frame_ids == list(range(SEQUENCE_LENGTH, SEQUENCE_LENGTH + 6))
+
+
+def test_drain_times_out_when_frames_never_arrive():
+    pipeline = TranslationPipeline(FiniteCamera(0), slow_hands, SlowPredictor(), lossless=True)
+    assert pipeline.drained()
+    assert not pipeline.drain(frames=1, timeout=0.05)
@@ -3,55 +3,51 @@ Script de prueba para verificar la compatibilidad del modelo
 """
 
 import numpy as np
-import tensorflow as tf
 import json
 import os
 
+import pytest
+
+from utils.constants import SEQUENCE_LENGTH, KEYPOINT_DIM, MODELS_PATH
+
+MODEL_FILE = os.path.join(MODELS_PATH, 'actions.keras')
+LABEL_MAP_FILE = os.path.join(MODELS_PATH, 'label_map.json')
+
+
+@pytest.mark.skipif(not os.path.exists(MODEL_FILE), reason="No hay un modelo entrenado en src/models")
 def test_model_prediction():
     print("🔄 Probando la predicción del modelo...")
-    
-    try:
-        # Cargar modelo y label_map
-        print("📂 Cargando modelo...")
-        model = tf.keras.models.load_model('src/models/actions_smart.keras')
-        
-        with open('src/models/label_map_smart.json', 'r') as f:
-            label_map = json.load(f)
-        
-        print(f"✅ Modelo cargado. Clases: {list(label_map.keys())}")
-        print(f"📊 Forma de entrada esperada: {model.input_shape}")
-        
-        # Crear datos de prueba con la forma correcta
-        # El modelo espera: (batch_size, 15, 63)
-        test_sequence = np.random.random((1, 15, 63)).astype(np.float32)
-        
-        print(f"🧪 Datos de prueba: {test_sequence.shape}")
-        
-        # Hacer predicción
-        prediction = model.predict(test_sequence, verbose=0)[0]
-        print(f"🎯 Predicción exitosa: {prediction.shape}")
-        print(f"📈 Valores: {prediction}")
-        
-        # Encontrar clase predicha
-        max_idx = np.argmax(prediction)
-        max_confidence = prediction[max_idx]
-        
-        predicted_action = None
-        for action, idx in label_map.items():
-            if idx == max_idx:
-                predicted_action = action
-                break
-        
-        print(f"🎉 Clase predicha: {predicted_action} (índice {max_idx})")
-        print(f"📊 Confianza: {max_confidence:.2%}")
-        
-        return True
-        
-    except Exception as e:
-        print(f"❌ Error en prueba: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+    tf = pytest.importorskip('tensorflow')
+
+    # Cargar modelo y label_map
+    print("📂 Cargando modelo...")
+    model = tf.keras.models.load_model(MODEL_FILE)
+
+    with open(LABEL_MAP_FILE, 'r') as f:
+        label_map = json.load(f)
+
+    print(f"✅ Modelo cargado. Clases: {list(label_map.values())}")
+    print(f"📊 Forma de entrada esperada: {model.input_shape}")
+    assert model.input_shape[1:] == (SEQUENCE_LENGTH, KEYPOINT_DIM)
+
+    # Crear datos de prueba con la forma correcta
+    test_sequence = np.random.random((1, SEQUENCE_LENGTH, KEYPOINT_DIM)).astype(np.float32)
+
+    print(f"🧪 Datos de prueba: {test_sequence.shape}")
+
+    # Hacer predicción
+    prediction = model.predict(test_sequence, verbose=0)[0]
+    print(f"🎯 Predicción exitosa: {prediction.shape}")
+    assert prediction.shape == (len(label_map),)
+    np.testing.assert_allclose(prediction.sum(), 1.0, rtol=1e-4)
+
+    # Encontrar clase predicha (label_map: índice -> acción)
+    max_idx = int(np.argmax(prediction))
+    predicted_action = label_map[str(max_idx)]
+
+    print(f"🎉 Clase predicha: {predicted_action} (índice {max_idx})")
+    print(f"📊 Confianza: {prediction[max_idx]:.2%}")
+
 
 if __name__ == "__main__":
-    test_model_prediction()
\ No newline at end of file
+    test_model_prediction()
@@ -0,0 +1,39 @@
+"""
+Pruebas del renderizado del video a resolución de pantalla
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+pytest.importorskip('PyQt5')
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtGui import QColor  # noqa: E402
+
+from utils.constants import KEYPOINT_DIM  # noqa: E402
+from utils.rendering import FrameRenderer  # noqa: E402
+
+
+def test_renderer_keeps_aspect_and_converts_bgr():
+    frame = np.zeros((1080, 1920, 3), dtype=np.uint8)
+    frame[..., 0] = 255  # Azul en BGR
+    renderer = FrameRenderer()
+    image = renderer.render(frame, np.zeros(KEYPOINT_DIM, dtype=np.float32), 800, 600)
+    assert (image.width(), image.height()) == (800, 450)
+    assert QColor(image.pixel(400, 200)).getRgb()[:3] == (0, 0, 255)
+
+    # El buffer se reutiliza mientras no cambie el tamaño del widget
+    buffer = renderer._buffer
+    renderer.render(frame, None, 800, 600)
+    assert renderer._buffer is buffer
+
+
+def test_renderer_draws_overlay_from_keypoints():
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    keypoints = np.zeros(KEYPOINT_DIM, dtype=np.float32)
+    keypoints[0:2] = (0.5, 0.5)  # Muñeca de la primera mano en el centro
+    image = FrameRenderer().render(frame, keypoints, 320, 240)
+    assert QColor(image.pixel(160, 120)).getRgb()[:3] != (0, 0, 0)
+    assert QColor(image.pixel(300, 20)).getRgb()[:3] == (0, 0, 0)
@@ -0,0 +1,59 @@
+"""
+Pruebas del seguimiento por región de interés
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+
+from utils.keypoints import extract_keypoints, LANDMARKS_PER_HAND
+from utils.roi import RoiHandTracker
+
+
+class FakeHands:
+    """Devuelve siempre una mano con landmarks en el centro de la imagen recibida."""
+
+    def __init__(self):
+        self.shapes = []
+        self.found = True
+
+    def process(self, image):
+        self.shapes.append(image.shape)
+        if not self.found:
+            return SimpleNamespace(multi_hand_landmarks=None)
+        landmarks = [SimpleNamespace(x=0.4 + 0.01 * i, y=0.5, z=-0.1) for i in range(LANDMARKS_PER_HAND)]
+        return SimpleNamespace(multi_hand_landmarks=[SimpleNamespace(landmark=landmarks)])
+
+
+def test_roi_tracker_maps_crop_back_to_frame():
+    hands = FakeHands()
+    tracker = RoiHandTracker(hands, detect_width=480, roi_size=64)
+    frame = np.zeros((1080, 1920, 3), dtype=np.uint8)
+
+    # Detección sobre el frame reducido: las coordenadas ya son del frame completo
+    detected = extract_keypoints(tracker.process(frame)).copy()
+    assert tracker.mode == 'detect'
+    assert hands.shapes[-1] == (270, 480, 3)
+    np.testing.assert_allclose(detected[:3], [0.4, 0.5, -0.1], rtol=1e-6)
+
+    # Seguimiento: solo se procesa la región, reducida a roi_size
+    x0, y0, x1, y1 = tracker.roi
+    kp = extract_keypoints(tracker.process(frame))
+    assert tracker.mode == 'track'
+    assert max(hands.shapes[-1][:2]) <= 64
+    cw, ch = x1 - x0, y1 - y0
+    np.testing.assert_allclose(kp[:3], [(x0 + 0.4 * cw) / 1920, (y0 + 0.5 * ch) / 1080, -0.1 * cw / 1920],
+                               rtol=1e-5)
+
+
+def test_roi_tracker_redetects_when_hands_are_lost():
+    hands = FakeHands()
+    tracker = RoiHandTracker(hands, detect_width=480)
+    frame = np.zeros((720, 1280, 3), dtype=np.uint8)
+    tracker.process(frame)
+    hands.found = False
+    results = tracker.process(frame)
+    # Falla el recorte y se vuelve a detectar en el mismo frame
+    assert results.multi_hand_landmarks is None
+    assert tracker.mode == 'detect' and tracker.roi is None
+    assert tracker.detections == 2
@@ -0,0 +1,59 @@
+"""
+Pruebas del modelo de streaming (un paso por frame con estado explícito)
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+from utils.constants import SEQUENCE_LENGTH, KEYPOINT_DIM
+
+tf = pytest.importorskip('tensorflow')
+
+
+@pytest.fixture(scope='module')
+def exported(tmp_path_factory):
+    from train_model import create_model, export_streaming_tflite
+
+    model = create_model((SEQUENCE_LENGTH, KEYPOINT_DIM), 3, 'lstm', width=0.25)
+    path = str(tmp_path_factory.mktemp('models') / 'actions_streaming.tflite')
+    export_streaming_tflite(model, path)
+    return model, path
+
+
+def test_window_prediction_matches_full_model(exported):
+    from utils.predictor import StreamingPredictor
+
+    model, path = exported
+    predictor = StreamingPredictor(path)
+    window = np.random.random((SEQUENCE_LENGTH, KEYPOINT_DIM)).astype(np.float32)
+    expected = model(window[np.newaxis], training=False).numpy()[0]
+    np.testing.assert_allclose(predictor.predict(window), expected, atol=1e-4)
+
+
+def test_update_feeds_only_new_frames(exported):
+    from utils.predictor import StreamingPredictor
+
+    model, path = exported
+    predictor = StreamingPredictor(path)
+    frames = np.random.random((SEQUENCE_LENGTH + 5, KEYPOINT_DIM)).astype(np.float32)
+
+    # Primera ventana completa, luego un frame nuevo por llamada
+    predictor.update(frames[:SEQUENCE_LENGTH], frame_id=SEQUENCE_LENGTH - 1)
+    for i in range(SEQUENCE_LENGTH, len(frames)):
+        result = predictor.update(frames[i - SEQUENCE_LENGTH + 1:i + 1], frame_id=i)
+    # Tras el último frame, el estado ha visto toda la historia desde el inicio
+    expected = model(frames[np.newaxis], training=False).numpy()[0]
+    np.testing.assert_allclose(result, expected, atol=1e-4)
+    # Sin frames nuevos no hay predicción
+    assert predictor.update(frames[-SEQUENCE_LENGTH:], frame_id=len(frames) - 1) is None
+
+    # Al aceptar una palabra la historia se descarta: la siguiente ventana empieza de cero
+    predictor.end_segment()
+    window = frames[-SEQUENCE_LENGTH:]
+    expected = model(window[np.newaxis], training=False).numpy()[0]
+    np.testing.assert_allclose(predictor.update(window, frame_id=len(frames)), expected, atol=1e-4)
@@ -0,0 +1,54 @@
+"""
+Pruebas de la rejilla y la reanudación de la búsqueda de hiperparámetros
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+from sweep import build_grid, expand, load_results, summarize, trial_id
+
+
+def test_grid_and_random_sample():
+    grid = build_grid(['architecture=mlp,gru', 'width=0.5', 'learning_rate=0.001,0.0003', 'batch_size=16'])
+    configs = expand(grid)
+    assert len(configs) == 4
+    assert {c['architecture'] for c in configs} == {'mlp', 'gru'} and configs[0]['batch_size'] == 16
+    sample = expand(grid, samples=2, seed=1)
+    assert len(sample) == 2 and sample == expand(grid, samples=2, seed=1)
+    with pytest.raises(ValueError):
+        build_grid(['dropout=0.1'])
+
+
+def test_resume_skips_finished_folds(tmp_path):
+    configs = expand(build_grid(['architecture=mlp', 'width=0.5,1', 'learning_rate=0.001', 'batch_size=8']))
+    path = tmp_path / 'results.jsonl'
+    with open(path, 'w') as f:
+        for fold, accuracy in enumerate((0.8, 0.9)):
+            f.write(json.dumps({'trial': trial_id(configs[0]), 'fold': fold, 'folds': 3, 'seed': 42,
+                                'config': configs[0], 'accuracy': accuracy, 'epochs_run': 5}) + '\n')
+        # Otra partición y una línea cortada por una interrupción no cuentan
+        f.write(json.dumps({'trial': trial_id(configs[1]), 'fold': 0, 'folds': 5, 'seed': 42}) + '\n')
+        f.write('{"trial": "a')
+
+    done = load_results(str(path), folds=3, seed=42)
+    assert set(done) == {(trial_id(configs[0]), 0), (trial_id(configs[0]), 1)}
+    rows = summarize(configs, done, folds=3)
+    assert len(rows) == 1 and rows[0]['folds_done'] == 2
+    assert rows[0]['mean_accuracy'] == pytest.approx(0.85)
+
+
+def test_resume_ignores_other_data_and_settings(tmp_path):
+    config = expand(build_grid(['architecture=mlp', 'width=1', 'learning_rate=0.001', 'batch_size=8']))[0]
+    settings = {'folds': 3, 'seed': 42, 'dataset': 'abc', 'epochs': 100, 'patience': 10, 'augment': True}
+    path = tmp_path / 'results.jsonl'
+    with open(path, 'w') as f:
+        for fold, changed in enumerate(({}, {'dataset': 'def'}, {'patience': 5})):
+            f.write(json.dumps({'trial': trial_id(config), 'fold': fold, **settings, **changed,
+                                'config': config, 'accuracy': 0.9, 'epochs_run': 5}) + '\n')
+
+    assert set(load_results(str(path), **settings)) == {(trial_id(config), 0)}
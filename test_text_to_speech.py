@@ -0,0 +1,80 @@
+"""
+Pruebas de la cancelación de frases en el hilo de síntesis de voz
+"""
+
+import threading
+import time
+
+from utils.text_to_speech import SpeechWorker
+
+
+class BlockingEngine:
+    """Motor falso: `runAndWait` avisa de cada palabra hasta que se llama a `stop`, como una frase larga."""
+
+    def __init__(self):
+        self.said = []
+        self.speaking = threading.Event()
+        self.stop_threads = []
+        self._callbacks = {}
+        self._stopped = threading.Event()
+
+    def connect(self, topic, callback):
+        self._callbacks[topic] = callback
+
+    def say(self, text):
+        self.said.append(text)
+
+    def runAndWait(self):
+        self.speaking.set()
+        deadline = time.monotonic() + 5
+        while not self._stopped.is_set() and time.monotonic() < deadline:
+            self._callbacks['started-word']('frase', 0, 1)
+            time.sleep(0.01)
+        self._stopped.clear()
+        self.speaking.clear()
+
+    def stop(self):
+        self.stop_threads.append(threading.current_thread())
+        self._stopped.set()
+
+
+def start_worker(engine, monkeypatch):
+    monkeypatch.setattr('utils.text_to_speech.pyttsx3.init', lambda: engine)
+    worker = SpeechWorker(max_pending=2, cache_path=None)
+    worker.start()
+    return worker
+
+
+def test_cancel_interrupts_engine_utterance(monkeypatch):
+    engine = BlockingEngine()
+    worker = start_worker(engine, monkeypatch)
+    try:
+        worker.say("hola")
+        assert engine.speaking.wait(2)
+        worker.say("adios")
+        start = time.monotonic()
+        worker.cancel()
+        # La frase en curso se corta y la pendiente se descarta
+        deadline = time.monotonic() + 2
+        while engine.speaking.is_set() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert not engine.speaking.is_set() and time.monotonic() - start < 1
+        assert worker.dropped == 1
+        # El motor solo se toca desde el hilo de voz
+        assert engine.stop_threads == [worker]
+        time.sleep(0.05)
+        assert engine.said == ["hola"]
+    finally:
+        worker.stop()
+
+
+def test_cancel_without_utterance_leaves_engine_alone(monkeypatch):
+    engine = BlockingEngine()
+    engine.stop = lambda: (_ for _ in ()).throw(AssertionError("stop sin frase en curso"))
+    worker = start_worker(engine, monkeypatch)
+    try:
+        time.sleep(0.05)
+        worker.cancel()
+    finally:
+        worker.stop()
+    assert not worker.is_alive()
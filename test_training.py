@@ -0,0 +1,40 @@
+"""
+Pruebas de la poda por magnitud
+"""
+
+import numpy as np
+import tensorflow as tf
+
+from utils.training import MagnitudePruning, compute_pruning_masks, model_sparsity
+
+
+def small_model():
+    model = tf.keras.Sequential([
+        tf.keras.layers.Input(shape=(8,)),
+        tf.keras.layers.Dense(16, activation='relu'),
+        tf.keras.layers.Dense(3, activation='softmax'),
+    ])
+    model.compile(optimizer='adam', loss='categorical_crossentropy')
+    return model
+
+
+def test_masks_prune_smallest_kernel_weights():
+    model = small_model()
+    masks = compute_pruning_masks(model, 0.5)
+    # Solo los kernels, no los sesgos
+    assert len(masks) == 2
+    for variable, mask in masks:
+        variable.assign(variable * mask)
+    assert abs(model_sparsity(model) - 0.5) < 0.05
+    assert compute_pruning_masks(model, 0.0)[0][1].all()
+
+
+def test_callback_keeps_pruned_weights_at_zero():
+    model = small_model()
+    X = np.random.random((64, 8)).astype(np.float32)
+    y = tf.keras.utils.to_categorical(np.random.randint(0, 3, 64), 3)
+    pruning = MagnitudePruning(target_sparsity=0.6, ramp_epochs=2)
+    assert pruning.sparsity_at(0) < pruning.sparsity_at(1) == 0.6
+
+    model.fit(X, y, epochs=3, batch_size=16, verbose=0, callbacks=[pruning])
+    assert model_sparsity(model) >= 0.55
@@ -0,0 +1,85 @@
+"""
+Aumentos de datos vectorizados sobre lotes de keypoints (B, SEQUENCE_LENGTH, KEYPOINT_DIM).
+
+Todas las operaciones son de TensorFlow y trabajan sobre el lote completo,
+así que se pueden usar dentro de `tf.data` con `num_parallel_calls`. Las
+manos no detectadas (bloques de ceros) se mantienen en cero.
+"""
+import tensorflow as tf
+
+from utils.constants import SEQUENCE_LENGTH, KEYPOINT_DIM
+from utils.keypoints import LANDMARKS_PER_HAND, MAX_HANDS
+
+
+def _split_hands(batch):
+    """(B, L, D) → (B, L, manos, landmarks, 3) y la máscara de manos presentes."""
+    hands = tf.reshape(batch, [-1, SEQUENCE_LENGTH, MAX_HANDS, LANDMARKS_PER_HAND, 3])
+    present = tf.reduce_any(tf.not_equal(hands, 0.0), axis=[3, 4], keepdims=True)
+    return hands, present
+
+
+def _merge_hands(hands):
+    return tf.reshape(hands, [-1, SEQUENCE_LENGTH, KEYPOINT_DIM])
+
+
+def _per_sample(batch, shape, minval, maxval):
+    return tf.random.uniform(tf.concat([tf.shape(batch)[:1], shape], axis=0), minval, maxval)
+
+
+def random_mirror(batch, prob=0.5):
+    """Refleja horizontalmente (x → 1 - x) una fracción `prob` de las secuencias."""
+    hands, present = _split_hands(batch)
+    flip = _per_sample(batch, [1, 1, 1, 1], 0.0, 1.0) < prob
+    x, yz = hands[..., :1], hands[..., 1:]
+    mirrored = tf.concat([1.0 - x, yz], axis=-1)
+    return _merge_hands(tf.where(tf.logical_and(flip, present), mirrored, hands))
+
+
+def random_scale_translate(batch, scale=0.1, shift=0.05):
+    """Escala cada secuencia respecto al centro de la imagen y la desplaza en x/y."""
+    hands, present = _split_hands(batch)
+    s = _per_sample(batch, [1, 1, 1, 1], 1.0 - scale, 1.0 + scale)
+    t = tf.concat([_per_sample(batch, [1, 1, 1, 2], -shift, shift),
+                   tf.zeros_like(s)], axis=-1)
+    center = tf.constant([0.5, 0.5, 0.0])
+    jittered = (hands - center) * s + center + t
+    return _merge_hands(tf.where(present, jittered, hands))
+
+
+def random_time_warp(batch, max_speed=0.2):
+    """Remuestrea el eje temporal con una velocidad aleatoria por secuencia.
+
+    Cada mano se interpola linealmente solo si está presente en los dos frames
+    vecinos; si falta en alguno se toma el frame más cercano, para no mezclar
+    una mano con un bloque de ceros (manos fantasma a medio camino del origen).
+    """
+    last = float(SEQUENCE_LENGTH - 1)
+    speed = _per_sample(batch, [1], 1.0 - max_speed, 1.0 + max_speed)
+    steps = tf.range(SEQUENCE_LENGTH, dtype=tf.float32)[tf.newaxis, :]
+    positions = tf.clip_by_value(last / 2 + (steps - last / 2) * speed, 0.0, last)
+
+    lo = tf.cast(tf.floor(positions), tf.int32)
+    hi = tf.minimum(lo + 1, SEQUENCE_LENGTH - 1)
+    weight = (positions - tf.cast(lo, tf.float32))[:, :, tf.newaxis, tf.newaxis, tf.newaxis]
+    before, before_present = _split_hands(tf.gather(batch, lo, axis=1, batch_dims=1))
+    after, after_present = _split_hands(tf.gather(batch, hi, axis=1, batch_dims=1))
+
+    interpolated = before * (1.0 - weight) + after * weight
+    nearest = tf.where(weight < 0.5, before, after)
+    both = tf.logical_and(before_present, after_present)
+    return _merge_hands(tf.where(both, interpolated, nearest))
+
+
+def random_landmark_dropout(batch, rate=0.05):
+    """Pone a cero landmarks individuales al azar, como si MediaPipe los hubiera perdido."""
+    hands, _ = _split_hands(batch)
+    keep = tf.random.uniform(tf.shape(hands)[:-1])[..., tf.newaxis] >= rate
+    return _merge_hands(tf.where(keep, hands, 0.0))
+
+
+def augment_batch(batch):
+    """Aplica todos los aumentos a un lote."""
+    batch = random_mirror(batch)
+    batch = random_scale_translate(batch)
+    batch = random_time_warp(batch)
+    return random_landmark_dropout(batch)
@@ -0,0 +1,214 @@
+"""
+Captura de muestras a ritmo de cámara con MediaPipe y escritura en segundo plano.
+
+Las secuencias se muestrean sobre una rejilla de tiempo fija (`SequenceSampler`,
+en utils/keypoints.py): la muestra k de una secuencia iniciada en t0 es el primer
+frame con instante >= t0 + k / CAPTURE_FPS. Así todas cubren el mismo intervalo,
+(SEQUENCE_LENGTH - 1) / CAPTURE_FPS segundos, en cualquier máquina y con cualquier
+cámara de al menos CAPTURE_FPS. La ventana en tiempo real usa la misma rejilla
+(ver `LandmarkStage` en utils/pipeline.py).
+
+Hay tres hilos:
+- captura: lee la cámara a su ritmo nativo, publica el último frame para la
+  vista previa y pasa a MediaPipe solo los frames de la rejilla;
+- landmarks: ejecuta MediaPipe y completa las secuencias;
+- escritura: guarda cada secuencia terminada sin bloquear a los demás.
+"""
+import json
+import os
+import queue
+import threading
+import time
+
+import numpy as np
+
+from utils.constants import SEQUENCE_LENGTH, KEYPOINT_DIM, CAPTURE_FPS
+from utils.keypoints import extract_keypoints, SequenceSampler
+from utils.pipeline import Stage, LatestQueue
+
+CAPTURE_LOG = 'capture.jsonl'
+
+
+class SampledCaptureStage(Stage):
+    """Lee la cámara, publica cada frame para la vista previa y envía los de la rejilla a MediaPipe."""
+
+    def __init__(self, cap, sampler, preview_queue, sample_queue):
+        super().__init__("captura")
+        self.cap = cap
+        self.sampler = sampler
+        self.preview_queue = preview_queue
+        self.sample_queue = sample_queue
+        self.frame_id = 0
+
+    def step(self):
+        ret, frame = self.cap.read()
+        if not ret:
+            time.sleep(0.01)
+            return False
+        now = time.perf_counter()
+        self.preview_queue.put((self.frame_id, now, frame))
+        sample = self.sampler.offer(now)
+        if sample is not None:
+            key, slots = sample
+            self.sample_queue.put((key, slots, self.frame_id, now, frame))
+        self.frame_id += 1
+        return True
+
+
+class SampleLandmarkStage(Stage):
+    """Ejecuta MediaPipe sobre los frames muestreados y entrega las secuencias completas.
+
+    `on_sequence(key, keypoints, timestamps)` recibe cada secuencia cuando
+    tiene todas sus filas; `on_keypoints(frame_id, keypoints)` cada frame
+    procesado (para grabar la sesión). `latest` guarda los últimos keypoints
+    para dibujarlos en la vista previa.
+    """
+
+    def __init__(self, process_fn, sample_queue, on_sequence, length=SEQUENCE_LENGTH, on_keypoints=None):
+        super().__init__("landmarks")
+        self.process_fn = process_fn
+        self.sample_queue = sample_queue
+        self.on_sequence = on_sequence
+        self.on_keypoints = on_keypoints
+        self.length = length
+        self.latest = None
+        self._sequences = {}
+
+    def step(self):
+        try:
+            key, slots, frame_id, timestamp, frame = self.sample_queue.get(timeout=self.poll_timeout)
+        except queue.Empty:
+            return False
+        with self.timings.time():
+            results = self.process_fn(frame)
+        keypoints, timestamps, filled = self._sequences.setdefault(
+            key, (np.zeros((self.length, KEYPOINT_DIM), dtype=np.float32), np.zeros(self.length), set()))
+        extract_keypoints(results, out=keypoints[slots[0]])
+        for slot in slots:
+            keypoints[slot] = keypoints[slots[0]]
+            timestamps[slot] = timestamp
+            filled.add(slot)
+        self.latest = keypoints[slots[0]].copy()
+        if self.on_keypoints is not None:
+            self.on_keypoints(frame_id, keypoints[slots[0]])
+        if len(filled) == self.length:
+            del self._sequences[key]
+            self.on_sequence(key, keypoints, timestamps)
+        return True
+
+    def discard(self, key):
+        """Olvida una secuencia incompleta (por ejemplo, al cancelar la grabación)."""
+        self._sequences.pop(key, None)
+
+    @property
+    def pending(self):
+        return self.sample_queue.qsize()
+
+
+class SequenceWriter(Stage):
+    """Guarda las secuencias en disco en su propio hilo.
+
+    Junto a los .npy de cada acción se añade una línea a `capture.jsonl` con los
+    instantes reales de cada muestra respecto al inicio de la secuencia.
+    """
+
+    def __init__(self):
+        super().__init__("escritura")
+        self._queue = queue.Queue()
+        self.written = 0
+        self.errors = 0
+
+    def save(self, path, keypoints, timestamps, **meta):
+        self._queue.put((path, keypoints.copy(), np.asarray(timestamps) - timestamps[0], meta))
+
+    def step(self):
+        try:
+            path, keypoints, offsets, meta = self._queue.get(timeout=self.poll_timeout)
+        except queue.Empty:
+            return False
+        try:
+            with self.timings.time():
+                np.save(path, keypoints)
+                with open(os.path.join(os.path.dirname(path), CAPTURE_LOG), 'a') as f:
+                    f.write(json.dumps({'file': os.path.basename(path), 'offsets_s': offsets.round(4).tolist(),
+                                        **meta}) + '\n')
+            self.written += 1
+        except OSError as e:
+            self.errors += 1
+            print(f"Error guardando {path}: {e}")
+        finally:
+            self._queue.task_done()
+        return True
+
+    def flush(self):
+        """Espera a que se hayan escrito todas las secuencias pendientes."""
+        self._queue.join()
+
+    @property
+    def pending(self):
+        return self._queue.qsize()
+
+
+class SampleCapture:
+    """Conecta captura, landmarks y escritura para grabar secuencias de muestras."""
+
+    def __init__(self, cap, process_fn, length=SEQUENCE_LENGTH, fps=CAPTURE_FPS, on_keypoints=None):
+        self.sampler = SequenceSampler(length, fps)
+        self.preview = LatestQueue(1)
+        self.samples = queue.Queue()
+        self.writer = SequenceWriter()
+        self.capture = SampledCaptureStage(cap, self.sampler, self.preview, self.samples)
+        self.landmarks = SampleLandmarkStage(process_fn, self.samples, self._on_sequence, length,
+                                             on_keypoints=on_keypoints)
+        self.stages = [self.capture, self.landmarks, self.writer]
+        self.completed = 0
+        self._paths = {}
+        self._lock = threading.Lock()
+
+    def start(self):
+        for stage in self.stages:
+            stage.start()
+
+    def record(self, path, **meta):
+        """Empieza a grabar una secuencia que se guardará en `path`."""
+        with self._lock:
+            self._paths[path] = meta
+        self.sampler.start(path, time.perf_counter())
+
+    def cancel(self):
+        """Descarta la secuencia que se está muestreando, si la hay."""
+        key = self.sampler.key
+        if key is None:
+            return
+        self.sampler.cancel()
+        with self._lock:
+            self._paths.pop(key, None)
+        self.landmarks.discard(key)
+
+    def _on_sequence(self, path, keypoints, timestamps):
+        with self._lock:
+            meta = self._paths.pop(path, None)
+            if meta is None:
+                return
+            self.completed += 1
+        self.writer.save(path, keypoints, timestamps, **meta)
+
+    @property
+    def busy(self):
+        """True mientras quede una secuencia por muestrear o procesar."""
+        with self._lock:
+            return bool(self._paths)
+
+    def stop(self, timeout=5.0):
+        """Termina de procesar y escribir lo pendiente y detiene los hilos."""
+        self.cancel()
+        # Las secuencias ya muestreadas se terminan de procesar antes de salir
+        deadline = time.perf_counter() + timeout
+        while self.busy and time.perf_counter() < deadline:
+            time.sleep(0.01)
+        self.writer.flush()
+        for stage in self.stages:
+            stage.stop()
+        for stage in self.stages:
+            if stage.is_alive():
+                stage.join(timeout)
@@ -8,8 +8,27 @@ ACTIONS = ['gracias', 'hola', 'adios']
 
 # Número de secuencias (muestras) a capturar por acción
 NO_SEQUENCES = 30
+CAPTURE_FPS = 15              # Muestras por segundo dentro de una secuencia (igual en cualquier máquina)
 
 # Rutas
 DATA_PATH = 'data/frame_actions'    # Ya no se usará
 KEYPOINTS_PATH = 'data/keypoints'
-MODELS_PATH = 'src/models'
\ No newline at end of file
+PACKED_PATH = 'data/packed'         # Dataset empaquetado (ver utils/dataset.py)
+TTS_CACHE_PATH = 'data/tts_cache'   # Audio pre-renderizado de cada etiqueta
+MODELS_PATH = 'src/models'
+
+# Inferencia
+INFERENCE_STRIDE = 1          # Predecir cada N frames (1 = en todos)
+PREDICTION_THRESHOLD = 0.7    # Confianza mínima para aceptar una palabra
+MODEL_BACKEND = 'auto'        # 'auto', 'keras', 'tflite' (sin TensorFlow), 'streaming' (un frame por paso) o 'embedding'
+BATCH_BACKEND = 'keras'       # Herramientas por lotes: solo Keras puntúa un lote en una sola pasada
+LIVE_SAMPLE_FPS = CAPTURE_FPS # Rejilla de la ventana en tiempo real (None = todos los frames de la cámara)
+GATE_MOTION_THRESHOLD = 0.002 # Cambio medio mínimo de los keypoints para volver a predecir
+EMBEDDING_TEMPERATURE = 0.05  # Temperatura del softmax sobre similitudes del índice de embeddings
+
+# Región de interés (ver utils/roi.py)
+ROI_DETECT_WIDTH = 640        # Ancho del frame reducido para detectar manos
+ROI_TARGET_FPS = 30           # FPS objetivo de MediaPipe para la resolución adaptativa
+
+# Interfaz
+DISPLAY_MAX_FPS = 30          # Refresco máximo del video en pantalla (independiente del procesamiento)
@@ -0,0 +1,145 @@
+"""
+Dataset de keypoints empaquetado en un único archivo contiguo.
+
+En lugar de miles de .npy pequeños en KEYPOINTS_PATH/<acción>/, todas las
+secuencias se guardan una tras otra como float32 en `keypoints.f32`, y un
+índice JSON (`index.json`) guarda la etiqueta y el origen de cada una.
+El entrenamiento lo lee con `np.memmap`, sin copiarlo a memoria, y las
+secuencias nuevas se añaden al final sin reescribir el archivo. El índice
+guarda también la fecha de modificación y el tamaño de cada .npy: si un
+archivo se vuelve a grabar, su fila se reescribe en el mismo sitio.
+"""
+import json
+import os
+
+import numpy as np
+
+from utils.constants import ACTIONS, KEYPOINTS_PATH, PACKED_PATH, SEQUENCE_LENGTH, KEYPOINT_DIM
+
+DATA_FILE = 'keypoints.f32'
+INDEX_FILE = 'index.json'
+
+
+def _empty_index():
+    return {
+        'sequence_length': SEQUENCE_LENGTH,
+        'keypoint_dim': KEYPOINT_DIM,
+        'count': 0,
+        'actions': [],
+        'labels': [],
+        'sources': [],
+        'stamps': [],
+    }
+
+
+def _stamp(path):
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def read_index(packed_path=PACKED_PATH):
+    index_path = os.path.join(packed_path, INDEX_FILE)
+    if not os.path.exists(index_path):
+        return None
+    with open(index_path, 'r') as f:
+        return json.load(f)
+
+
+def _write_index(index, packed_path):
+    # Escritura atómica: el índice define qué filas del archivo de datos son válidas
+    tmp_path = os.path.join(packed_path, INDEX_FILE + '.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(index, f)
+    os.replace(tmp_path, os.path.join(packed_path, INDEX_FILE))
+
+
+def pack_keypoints(keypoints_path=KEYPOINTS_PATH, packed_path=PACKED_PATH, actions=ACTIONS, rebuild=False):
+    """Añade al dataset empaquetado las secuencias .npy que aún no contiene.
+
+    Las que ya contiene pero han cambiado en disco se reescriben en su fila.
+    Devuelve (añadidas o actualizadas, omitidas por forma incorrecta).
+    """
+    os.makedirs(packed_path, exist_ok=True)
+    data_path = os.path.join(packed_path, DATA_FILE)
+    index = None if rebuild else read_index(packed_path)
+    if index is None or (index['count'] and not os.path.exists(data_path)):
+        index = _empty_index()
+    if (index['sequence_length'], index['keypoint_dim']) != (SEQUENCE_LENGTH, KEYPOINT_DIM):
+        raise ValueError(f"El dataset empaquetado tiene forma ({index['sequence_length']}, "
+                         f"{index['keypoint_dim']}); usa rebuild=True para regenerarlo.")
+
+    # Índices de versiones anteriores sin fechas: se releen todas las secuencias una vez
+    index.setdefault('stamps', [None] * index['count'])
+    known = {source: row for row, source in enumerate(index['sources'])}
+    row_bytes = SEQUENCE_LENGTH * KEYPOINT_DIM * 4
+    added, bad_shape = 0, 0
+
+    mode = 'r+b' if os.path.exists(data_path) and index['count'] else 'wb'
+    with open(data_path, mode) as f:
+        # Descarta filas escritas por una ejecución interrumpida antes de actualizar el índice
+        f.truncate(index['count'] * row_bytes)
+        f.seek(0, os.SEEK_END)
+
+        for action in actions:
+            action_path = os.path.join(keypoints_path, action)
+            if not os.path.isdir(action_path):
+                continue
+            seq_files = sorted((name for name in os.listdir(action_path) if name.endswith('.npy')),
+                               key=lambda name: (len(name), name))
+            for seq_file in seq_files:
+                source = f"{action}/{seq_file}"
+                seq_path = os.path.join(action_path, seq_file)
+                stamp = _stamp(seq_path)
+                row = known.get(source)
+                if row is not None and index['stamps'][row] == stamp:
+                    continue
+                keypoints = np.load(seq_path)
+                if keypoints.shape != (SEQUENCE_LENGTH, KEYPOINT_DIM):
+                    print(f"Advertencia: Forma incorrecta en {source}: {keypoints.shape}")
+                    bad_shape += 1
+                    continue
+                data = np.ascontiguousarray(keypoints, dtype=np.float32).tobytes()
+                if row is not None:
+                    # Secuencia regrabada: se sobrescribe su fila y se vuelve al final
+                    f.seek(row * row_bytes)
+                    f.write(data)
+                    f.seek(0, os.SEEK_END)
+                    index['stamps'][row] = stamp
+                    added += 1
+                    continue
+                if action not in index['actions']:
+                    index['actions'].append(action)
+                f.write(data)
+                index['labels'].append(index['actions'].index(action))
+                index['sources'].append(source)
+                index['stamps'].append(stamp)
+                known[source] = len(index['sources']) - 1
+                added += 1
+
+    index['count'] = len(index['labels'])
+    _write_index(index, packed_path)
+    return added, bad_shape
+
+
+def load_packed(packed_path=PACKED_PATH, actions=ACTIONS):
+    """Abre el dataset empaquetado.
+
+    Devuelve (X, y, index): X es un `np.memmap` de solo lectura con forma
+    (N, SEQUENCE_LENGTH, KEYPOINT_DIM) y y son índices de clase según `actions`.
+    Las secuencias de acciones que no están en `actions` se excluyen (en ese
+    caso X deja de ser un memmap y se copia a memoria).
+    """
+    index = read_index(packed_path)
+    if index is None or index['count'] == 0:
+        raise FileNotFoundError(f"No hay dataset empaquetado en '{packed_path}'. Ejecuta 'pack_keypoints.py'.")
+
+    shape = (index['count'], index['sequence_length'], index['keypoint_dim'])
+    X = np.memmap(os.path.join(packed_path, DATA_FILE), dtype=np.float32, mode='r', shape=shape)
+
+    # Traducir los índices del dataset a los índices de `actions`
+    remap = np.array([actions.index(a) if a in actions else -1 for a in index['actions']], dtype=np.int64)
+    y = remap[np.asarray(index['labels'], dtype=np.int64)]
+    keep = y >= 0
+    if not keep.all():
+        X, y = X[keep], y[keep]
+    return X, y, index
@@ -0,0 +1,138 @@
+"""
+Índice de embeddings para registrar señas nuevas sin reentrenar.
+
+La red entrenada se usa como extractor: la salida de su penúltima capa es un
+vector de tamaño fijo por ventana. Cada seña registrada se guarda como el
+promedio normalizado de los embeddings de sus muestras (un prototipo), en una
+matriz (num_señas, dim). Buscar es un producto matriz-vector: con cientos de
+señas sigue por debajo del milisegundo.
+
+Con `quantize=True` la matriz se guarda y se consulta en int8 con una escala
+por fila, lo que reduce su tamaño a la cuarta parte.
+
+Los embeddings solo son comparables si salen del mismo extractor, así que el
+índice guarda la huella (`extractor_fingerprint`) del .tflite con el que se
+registraron las señas.
+"""
+import hashlib
+import json
+
+import numpy as np
+
+from utils.constants import EMBEDDING_TEMPERATURE
+
+
+def extractor_fingerprint(path):
+    """Huella del archivo del extractor de embeddings."""
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()[:16]
+
+
+def normalize(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class EmbeddingIndex:
+    """Prototipos de señas con búsqueda por similitud coseno."""
+
+    def __init__(self, dim, quantize=False, extractor=None):
+        self.dim = dim
+        self.quantize = quantize
+        self.extractor = extractor
+        self.labels = []
+        self._means = np.zeros((0, dim), dtype=np.float32)   # Promedio de embeddings normalizados
+        self._counts = np.zeros(0, dtype=np.int64)
+        self._rebuild()
+
+    def __len__(self):
+        return len(self.labels)
+
+    def __contains__(self, label):
+        return label in self.labels
+
+    def add(self, label, embeddings):
+        """Añade muestras (N, dim) a `label`, creando la seña si no existe."""
+        embeddings = normalize(np.atleast_2d(embeddings))
+        if embeddings.shape[1] != self.dim:
+            raise ValueError(f"Los embeddings tienen dimensión {embeddings.shape[1]}, el índice {self.dim}")
+        if label in self.labels:
+            i = self.labels.index(label)
+            total = self._counts[i] + len(embeddings)
+            self._means[i] = (self._means[i] * self._counts[i] + embeddings.sum(axis=0)) / total
+            self._counts[i] = total
+        else:
+            self.labels.append(label)
+            self._means = np.vstack([self._means, embeddings.mean(axis=0, keepdims=True)])
+            self._counts = np.append(self._counts, len(embeddings))
+        self._rebuild()
+
+    def remove(self, label):
+        i = self.labels.index(label)
+        del self.labels[i]
+        self._means = np.delete(self._means, i, axis=0)
+        self._counts = np.delete(self._counts, i)
+        self._rebuild()
+
+    def count(self, label):
+        return int(self._counts[self.labels.index(label)])
+
+    def _rebuild(self):
+        """Prepara la matriz de búsqueda (normalizada y, si procede, cuantizada)."""
+        matrix = normalize(self._means) if len(self._means) else self._means
+        if self.quantize:
+            self._scales = np.maximum(np.abs(matrix).max(axis=1), 1e-12).astype(np.float32) / 127
+            self._matrix = np.round(matrix / self._scales[:, np.newaxis]).astype(np.int8)
+        else:
+            self._scales = None
+            self._matrix = matrix
+
+    def similarities(self, embedding):
+        """Similitud coseno de `embedding` con cada seña, en el orden de `labels`."""
+        query = normalize(embedding)
+        if self._scales is None:
+            return self._matrix @ query
+        return (self._matrix @ query) * self._scales
+
+    def search(self, embedding, k=1):
+        """Devuelve las `k` señas más parecidas como [(etiqueta, similitud)]."""
+        scores = self.similarities(embedding)
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k] if k else []
+        return [(self.labels[i], float(scores[i])) for i in sorted(top, key=lambda i: -scores[i])]
+
+    def probabilities(self, embedding, temperature=EMBEDDING_TEMPERATURE):
+        """Softmax de las similitudes: se usa igual que la salida del clasificador."""
+        logits = self.similarities(embedding) / temperature
+        exp = np.exp(logits - logits.max())
+        return exp / exp.sum()
+
+    def save(self, path):
+        """Guarda el índice en un .npz; cuantizado, los prototipos se guardan en int8."""
+        fields = {'counts': self._counts, 'labels': np.array(json.dumps(self.labels, ensure_ascii=False))}
+        if self.extractor is not None:
+            fields['extractor'] = np.array(self.extractor)
+        if self.quantize:
+            # Basta la dirección en int8 más la norma del promedio para seguir añadiendo muestras
+            fields.update(matrix=self._matrix, scales=self._scales, norms=np.linalg.norm(self._means, axis=1))
+        else:
+            fields.update(means=self._means)
+        np.savez(path, **fields)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            if 'matrix' in data:
+                directions = normalize(data['matrix'] * data['scales'][:, np.newaxis])
+                means = directions * data['norms'][:, np.newaxis]
+                index = cls(means.shape[1], quantize=True)
+            else:
+                means = data['means']
+                index = cls(means.shape[1])
+            index.labels = json.loads(str(data['labels']))
+            index.extractor = str(data['extractor']) if 'extractor' in data else None
+            index._means = means.astype(np.float32)
+            index._counts = data['counts']
+        index._rebuild()
+        return index
@@ -0,0 +1,228 @@
+"""
+Fuentes de frames: cámara, archivo de video y sesiones grabadas.
+
+Todas exponen la interfaz de `cv2.VideoCapture` que usa el pipeline
+(`read()`, `isOpened()`, `release()`), así que la GUI y los scripts de
+captura pueden trabajar igual con una cámara que con una sesión grabada.
+
+Una sesión es una carpeta con:
+- `video.mp4`: los frames codificados;
+- `session.npz`: instante de cada frame (s desde el inicio) y los keypoints
+  extraídos (`landmarks`, con `has_landmarks` indicando qué frames se procesaron);
+- `session.json`: metadatos (tamaño, FPS nominal, número de frames).
+
+Al reproducirla se respetan los instantes originales o se entregan los frames
+tan rápido como se consuman, para comparar FPS y latencia entre versiones en
+una máquina sin cámara.
+"""
+import json
+import os
+import platform
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from utils.constants import KEYPOINT_DIM
+
+VIDEO_FILE = 'video.mp4'
+DATA_FILE = 'session.npz'
+META_FILE = 'session.json'
+
+
+def is_session(path):
+    return os.path.isfile(os.path.join(path, META_FILE))
+
+
+def open_camera(device=None):
+    """Abre la cámara por defecto de la plataforma, o el índice/dispositivo indicado."""
+    if device is None:
+        if platform.system() == "Windows":
+            return cv2.VideoCapture(0, cv2.CAP_DSHOW)
+        return cv2.VideoCapture("/dev/video0")
+    if platform.system() == "Windows" and isinstance(device, int):
+        return cv2.VideoCapture(device, cv2.CAP_DSHOW)
+    return cv2.VideoCapture(device)
+
+
+def open_frame_source(source=None, realtime=True):
+    """Abre `source`: None (cámara por defecto), índice de cámara, sesión grabada o video/URL.
+
+    Los archivos de video y las sesiones se entregan a su velocidad original si
+    `realtime`, o lo más rápido posible si no.
+    """
+    if source is None:
+        return open_camera()
+    source = str(source)
+    if source.isdigit():
+        return open_camera(int(source))
+    if os.path.isdir(source) and is_session(source):
+        return ReplaySource(source, realtime=realtime)
+    cap = cv2.VideoCapture(source)
+    if os.path.isfile(source) and realtime:
+        return PacedCapture(cap)
+    return cap
+
+
+class PacedCapture:
+    """Envuelve un `cv2.VideoCapture` de archivo para entregarlo a su velocidad original."""
+
+    def __init__(self, cap):
+        self.cap = cap
+        self.interval = 1.0 / (cap.get(cv2.CAP_PROP_FPS) or 30.0)
+        self._next = None
+
+    def read(self):
+        now = time.perf_counter()
+        if self._next is not None and now < self._next:
+            time.sleep(self._next - now)
+        self._next = max(now, self._next or now) + self.interval
+        return self.cap.read()
+
+    def get(self, prop):
+        return self.cap.get(prop)
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def release(self):
+        self.cap.release()
+
+
+class SessionRecorder:
+    """Graba una sesión mientras la reenvía: se usa en lugar de la fuente original.
+
+    Los frames se codifican al leerlos; los keypoints llegan aparte desde la
+    etapa de landmarks con `add_keypoints` (puede saltarse frames si va por detrás).
+    """
+
+    def __init__(self, source, path, fourcc='mp4v'):
+        self.source = source
+        self.path = path
+        self.fourcc = fourcc
+        self.fps = (source.get(cv2.CAP_PROP_FPS) if hasattr(source, 'get') else 0) or 30.0
+        self.frame_count = 0
+        self._writer = None
+        self._start = None
+        self._timestamps = []
+        self._keypoints = {}
+        self._lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+
+    def read(self):
+        ret, frame = self.source.read()
+        if not ret:
+            return ret, frame
+        now = time.perf_counter()
+        if self._writer is None:
+            self._start = now
+            h, w = frame.shape[:2]
+            video_path = os.path.join(self.path, VIDEO_FILE)
+            writer = cv2.VideoWriter(video_path, cv2.VideoWriter_fourcc(*self.fourcc), self.fps, (w, h))
+            if not writer.isOpened():
+                # Sin esto la sesión guardaría instantes y keypoints sin video
+                raise IOError(f"No se puede grabar '{video_path}' con el códec '{self.fourcc}'")
+            self._writer = writer
+        self._writer.write(frame)
+        self._timestamps.append(now - self._start)
+        self.frame_count += 1
+        return ret, frame
+
+    def add_keypoints(self, frame_id, keypoints):
+        with self._lock:
+            self._keypoints[frame_id] = np.array(keypoints, dtype=np.float32)
+
+    def isOpened(self):
+        return self.source.isOpened()
+
+    def release(self):
+        self.source.release()
+        self.close()
+
+    def close(self):
+        """Cierra el video y escribe los instantes y keypoints de la sesión."""
+        if self._writer is None:
+            return
+        self._writer.release()
+        self._writer = None
+
+        n = len(self._timestamps)
+        landmarks = np.zeros((n, KEYPOINT_DIM), dtype=np.float32)
+        has_landmarks = np.zeros(n, dtype=bool)
+        with self._lock:
+            for frame_id, kp in self._keypoints.items():
+                if frame_id < n:
+                    landmarks[frame_id] = kp
+                    has_landmarks[frame_id] = True
+        np.savez_compressed(os.path.join(self.path, DATA_FILE),
+                            timestamps=np.array(self._timestamps), landmarks=landmarks,
+                            has_landmarks=has_landmarks)
+        with open(os.path.join(self.path, META_FILE), 'w') as f:
+            json.dump({
+                'frames': n,
+                'fps': self.fps,
+                'duration_s': self._timestamps[-1] if n else 0.0,
+                'landmark_frames': int(has_landmarks.sum()),
+                'recorded_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            }, f, indent=2)
+
+
+class ReplaySource:
+    """Reproduce una sesión grabada con los instantes originales o sin esperas."""
+
+    def __init__(self, path, realtime=True):
+        self.path = path
+        self.realtime = realtime
+        with open(os.path.join(path, META_FILE), 'r') as f:
+            self.meta = json.load(f)
+        data = np.load(os.path.join(path, DATA_FILE))
+        self.timestamps = data['timestamps']
+        self.landmarks = data['landmarks']
+        self.has_landmarks = data['has_landmarks']
+        self.cap = cv2.VideoCapture(os.path.join(path, VIDEO_FILE))
+        if not self.cap.isOpened():
+            raise IOError(f"No se puede abrir el video de la sesión '{os.path.join(path, VIDEO_FILE)}'")
+        self.frame_id = 0
+        self._start = None
+        self._eof = False
+
+    def read(self):
+        if self.finished:
+            return False, None
+        ret, frame = self.cap.read()
+        if not ret:
+            # Video truncado o más corto que la sesión: se trata como el final
+            self._eof = True
+            print(f"Advertencia: el video de '{self.path}' termina en el frame {self.frame_id} "
+                  f"de {len(self.timestamps)}")
+            return False, None
+        if self.realtime:
+            now = time.perf_counter()
+            if self._start is None:
+                self._start = now
+            delay = self._start + self.timestamps[self.frame_id] - now
+            if delay > 0:
+                time.sleep(delay)
+        self.frame_id += 1
+        return True, frame
+
+    @property
+    def finished(self):
+        return self._eof or self.frame_id >= len(self.timestamps)
+
+    @property
+    def position(self):
+        """Instante grabado del último frame leído: el pipeline muestrea con él, no con el reloj."""
+        return float(self.timestamps[self.frame_id - 1]) if self.frame_id else 0.0
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_FPS:
+            return self.meta['fps']
+        return self.cap.get(prop)
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def release(self):
+        self.cap.release()
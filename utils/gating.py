@@ -0,0 +1,51 @@
+"""
+Puerta de inferencia: decide si merece la pena pasar una ventana al modelo.
+
+Se omite la inferencia cuando:
+- no hay manos en ninguno de los frames de la ventana (cabina en reposo);
+- la ventana apenas ha cambiado desde la última que se puntuó (diferencia
+  media absoluta de los keypoints por debajo de `motion_threshold`).
+
+La comprobación cuesta unos microsegundos frente a los milisegundos del modelo,
+así que una cabina sin nadie delante deja el modelo prácticamente sin CPU.
+"""
+import numpy as np
+
+from utils.constants import SEQUENCE_LENGTH, KEYPOINT_DIM, GATE_MOTION_THRESHOLD
+
+
+class InferenceGate:
+    """Filtra las ventanas sin manos o sin movimiento desde la última puntuada."""
+
+    def __init__(self, motion_threshold=GATE_MOTION_THRESHOLD, length=SEQUENCE_LENGTH, dim=KEYPOINT_DIM):
+        self.motion_threshold = motion_threshold
+        self._last = np.zeros((length, dim), dtype=np.float32)
+        self._has_last = False
+        self.executed = 0
+        self.skipped_idle = 0
+        self.skipped_still = 0
+
+    def should_run(self, window):
+        """Devuelve True si `window` debe pasar al modelo (y la recuerda como la última puntuada)."""
+        if not window.any():
+            self.skipped_idle += 1
+            # Al volver las manos se puntúa siempre la primera ventana
+            self._has_last = False
+            return False
+        if self._has_last and np.abs(window - self._last).mean() < self.motion_threshold:
+            self.skipped_still += 1
+            return False
+        np.copyto(self._last, window)
+        self._has_last = True
+        self.executed += 1
+        return True
+
+    @property
+    def skipped(self):
+        return self.skipped_idle + self.skipped_still
+
+    def reset(self):
+        self._has_last = False
+        self.executed = 0
+        self.skipped_idle = 0
+        self.skipped_still = 0
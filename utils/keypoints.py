@@ -0,0 +1,152 @@
+"""
+Extracción de keypoints compartida por la GUI y los scripts de captura.
+
+Los landmarks se escriben directamente en arrays float32 preasignados, de modo
+que el bucle de frames no crea listas ni arrays nuevos.
+
+Las secuencias se muestrean sobre una rejilla de tiempo fija de CAPTURE_FPS
+(`SequenceSampler`), tanto al capturar muestras como en tiempo real, para que
+el modelo vea ventanas de la misma duración con que se entrenó.
+"""
+import threading
+
+import numpy as np
+
+from utils.constants import SEQUENCE_LENGTH, KEYPOINT_DIM, CAPTURE_FPS
+
+LANDMARKS_PER_HAND = 21
+HAND_DIM = LANDMARKS_PER_HAND * 3           # x, y, z por landmark
+MAX_HANDS = KEYPOINT_DIM // HAND_DIM
+
+
+def extract_keypoints(results, out=None):
+    """Escribe los 126 keypoints de los resultados de MediaPipe en `out`.
+
+    Las manos no detectadas quedan rellenas con ceros. Si no se pasa `out`
+    se crea un array nuevo.
+    """
+    if out is None:
+        out = np.zeros(KEYPOINT_DIM, dtype=np.float32)
+    hands = results.multi_hand_landmarks or ()
+    n_hands = min(len(hands), MAX_HANDS)
+    for i in range(n_hands):
+        out[i * HAND_DIM:(i + 1) * HAND_DIM] = np.fromiter(
+            (c for lm in hands[i].landmark for c in (lm.x, lm.y, lm.z)),
+            dtype=np.float32, count=HAND_DIM,
+        )
+    out[n_hands * HAND_DIM:] = 0.0
+    return out
+
+
+class SequenceBuffer:
+    """Ventana deslizante de los últimos `length` frames sobre un buffer circular.
+
+    Cada frame se escribe dos veces (en la fila i y en la fila i + length) de
+    un buffer de 2 * length filas; así la ventana actual es siempre una vista
+    contigua del buffer, sin copias ni concatenaciones.
+    """
+
+    def __init__(self, length=SEQUENCE_LENGTH, dim=KEYPOINT_DIM):
+        self.length = length
+        self._buffer = np.zeros((2 * length, dim), dtype=np.float32)
+        self._pos = 0
+        self.count = 0
+
+    def push_results(self, results):
+        """Extrae los keypoints de `results` directamente en el buffer."""
+        row = self._buffer[self._pos]
+        extract_keypoints(results, out=row)
+        self._commit(row)
+        return row
+
+    def append(self, keypoints):
+        row = self._buffer[self._pos]
+        row[:] = keypoints
+        self._commit(row)
+        return row
+
+    def _commit(self, row):
+        self._buffer[self._pos + self.length] = row
+        self._pos = (self._pos + 1) % self.length
+        self.count += 1
+
+    @property
+    def full(self):
+        return self.count >= self.length
+
+    @property
+    def latest(self):
+        return self._buffer[self._pos - 1 + self.length]
+
+    def window(self):
+        """Vista (length, dim) con los frames en orden cronológico."""
+        return self._buffer[self._pos:self._pos + self.length]
+
+    def reset(self):
+        self._buffer[:] = 0.0
+        self._pos = 0
+        self.count = 0
+
+
+class SequenceSampler:
+    """Decide qué frames forman la secuencia en curso según su instante.
+
+    La muestra k de una secuencia iniciada en t0 es el primer frame con instante
+    >= t0 + k / fps. Si la cámara se retrasa y un frame llega después de varios
+    instantes de la rejilla, ocupa todos esos huecos: la secuencia mantiene su
+    duración. Con `length=None` la rejilla no termina (ventana en tiempo real).
+    """
+
+    def __init__(self, length=SEQUENCE_LENGTH, fps=CAPTURE_FPS):
+        self.length = length
+        self.fps = fps
+        self._lock = threading.Lock()
+        self._key = None
+        self._t0 = None
+        self._next = 0
+
+    def start(self, key, t0):
+        """Empieza la secuencia `key` en el instante `t0` (segundos, en el reloj de los frames)."""
+        with self._lock:
+            self._key = key
+            self._t0 = t0
+            self._next = 0
+
+    def cancel(self):
+        with self._lock:
+            self._key = None
+
+    @property
+    def key(self):
+        """Clave de la secuencia que se está muestreando, o None."""
+        return self._key
+
+    @property
+    def recording(self):
+        return self._key is not None
+
+    @property
+    def progress(self):
+        """Muestras de la secuencia en curso ya asignadas a un frame."""
+        return self._next
+
+    @property
+    def duration(self):
+        return None if self.length is None else (self.length - 1) / self.fps
+
+    def offer(self, timestamp):
+        """Devuelve (clave, huecos) si el frame de `timestamp` pertenece a la secuencia, o None."""
+        with self._lock:
+            if self._key is None:
+                return None
+            # Instantes de la rejilla ya alcanzados (con margen para el redondeo)
+            due = int(np.floor((timestamp - self._t0) * self.fps + 1e-6)) + 1
+            if self.length is not None:
+                due = min(due, self.length)
+            if due <= self._next:
+                return None
+            first, self._next = self._next, due
+            key = self._key
+            if self._next == self.length:
+                self._key = None
+            return key, range(first, self._next)
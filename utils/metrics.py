@@ -0,0 +1,153 @@
+"""
+Métricas ligeras de rendimiento para el pipeline de traducción.
+"""
+import json
+import os
+import sys
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+
+class RateMeter:
+    """Mide la frecuencia de un evento (por ejemplo, frames/s) con media móvil exponencial."""
+
+    def __init__(self, smoothing=0.9):
+        self.smoothing = smoothing
+        self.count = 0
+        self._last = None
+        self._interval = None
+
+    def tick(self, now=None):
+        now = time.perf_counter() if now is None else now
+        if self._last is not None:
+            dt = now - self._last
+            if self._interval is None:
+                self._interval = dt
+            else:
+                self._interval = self.smoothing * self._interval + (1 - self.smoothing) * dt
+        self._last = now
+        self.count += 1
+
+    @property
+    def rate(self):
+        if not self._interval:
+            return 0.0
+        return 1.0 / self._interval
+
+    def reset(self):
+        self.count = 0
+        self._last = None
+        self._interval = None
+
+
+def peak_rss_mb():
+    """RSS máxima del proceso en MB, o None si la plataforma no lo permite."""
+    # En Linux ru_maxrss se hereda del proceso padre tras fork/exec; VmHWM no
+    if os.path.exists('/proc/self/status'):
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS lo devuelve en bytes
+    return rss / 1024 ** 2 if sys.platform == 'darwin' else rss / 1024
+
+
+class LatencyTracker:
+    """Latencias recientes de una etapa (ventana deslizante) con p50/p95 y FPS."""
+
+    def __init__(self, window=300):
+        self._samples = deque(maxlen=window)
+        self.meter = RateMeter()
+
+    def record(self, seconds, now=None):
+        self._samples.append(seconds)
+        self.meter.tick(now)
+
+    @contextmanager
+    def time(self):
+        start = time.perf_counter()
+        yield
+        end = time.perf_counter()
+        self.record(end - start, end)
+
+    @property
+    def count(self):
+        return self.meter.count
+
+    def summary(self):
+        """Devuelve {'count', 'fps', 'p50_ms', 'p95_ms'} de la ventana actual."""
+        samples = np.array(self._samples) * 1000 if self._samples else None
+        return {
+            'count': self.count,
+            'fps': self.meter.rate,
+            'p50_ms': float(np.percentile(samples, 50)) if samples is not None else 0.0,
+            'p95_ms': float(np.percentile(samples, 95)) if samples is not None else 0.0,
+        }
+
+    def reset(self):
+        self._samples.clear()
+        self.meter.reset()
+
+
+def format_prometheus(stages, prefix='lesai'):
+    """Convierte {etapa: summary()} al formato de texto de Prometheus."""
+    lines = []
+    metrics = [
+        ('stage_latency_ms', 'gauge', "Latencia por etapa en ms", ('p50_ms', '0.5'), ('p95_ms', '0.95')),
+        ('stage_fps', 'gauge', "Frecuencia de la etapa en eventos/s", ('fps', None)),
+        ('stage_events_total', 'counter', "Eventos procesados por la etapa", ('count', None)),
+    ]
+    for name, kind, help_text, *fields in metrics:
+        lines.append(f"# HELP {prefix}_{name} {help_text}")
+        lines.append(f"# TYPE {prefix}_{name} {kind}")
+        for stage, summary in stages.items():
+            for key, quantile in fields:
+                labels = f'stage="{stage}"' + (f',quantile="{quantile}"' if quantile else '')
+                lines.append(f"{prefix}_{name}{{{labels}}} {summary[key]:g}")
+    return '\n'.join(lines) + '\n'
+
+
+class MetricsExporter:
+    """Escribe periódicamente las métricas por etapa a un archivo.
+
+    Con extensión `.prom` se reescribe el archivo en formato de texto de
+    Prometheus (para el textfile collector de node_exporter); con cualquier
+    otra se añade una línea JSON por exportación.
+    """
+
+    def __init__(self, path, interval=10.0):
+        self.path = path
+        self.interval = interval
+        self.prometheus = path.endswith('.prom')
+        self._last = None
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def maybe_export(self, stages, now=None):
+        """Exporta si ha pasado `interval` desde la última vez. Devuelve True si escribió."""
+        now = time.monotonic() if now is None else now
+        if self._last is not None and now - self._last < self.interval:
+            return False
+        self._last = now
+        self.export(stages)
+        return True
+
+    def export(self, stages):
+        if self.prometheus:
+            # Escritura atómica para que el colector nunca lea un archivo a medias
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                f.write(format_prometheus(stages))
+            os.replace(tmp_path, self.path)
+        else:
+            with open(self.path, 'a') as f:
+                f.write(json.dumps({'time': time.time(), 'stages': stages}) + '\n')
@@ -0,0 +1,347 @@
+"""
+Pipeline de traducción en hilos: captura → landmarks → inferencia.
+
+Cada etapa corre en su propio hilo y se comunica con la siguiente mediante
+colas acotadas que descartan el elemento más antiguo cuando se llenan, de modo
+que la cámara nunca espera al modelo y la GUI solo consume el último resultado.
+"""
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from utils.constants import SEQUENCE_LENGTH, KEYPOINT_DIM, LIVE_SAMPLE_FPS
+from utils.keypoints import SequenceBuffer, SequenceSampler, extract_keypoints
+from utils.metrics import RateMeter, LatencyTracker
+
+
+class LatestQueue:
+    """Cola acotada que descarta el elemento más antiguo cuando está llena.
+
+    Con `block=True` el productor espera a que haya sitio en lugar de
+    descartar (para reproducir sesiones sin perder frames).
+    """
+
+    def __init__(self, maxsize=1, block=False):
+        self._items = deque(maxlen=maxsize)
+        self._cond = threading.Condition()
+        self.block = block
+        self.dropped = 0
+
+    def put(self, item):
+        with self._cond:
+            while self.block and len(self._items) == self._items.maxlen:
+                self._cond.wait()
+            if len(self._items) == self._items.maxlen:
+                self.dropped += 1
+            self._items.append(item)
+            self._cond.notify_all()
+
+    def get(self, timeout=None):
+        """Devuelve el elemento más antiguo o None si se agota el tiempo."""
+        with self._cond:
+            if not self._items:
+                self._cond.wait(timeout)
+            if not self._items:
+                return None
+            item = self._items.popleft()
+            self._cond.notify_all()
+            return item
+
+    def clear(self):
+        with self._cond:
+            self._items.clear()
+            self._cond.notify_all()
+
+
+class LatestWindow:
+    """Buzón de una sola ventana sobre un buffer preasignado.
+
+    Equivale a una `LatestQueue` de tamaño 1, pero copia la ventana en lugar
+    de encolar un array nuevo por frame.
+    """
+
+    def __init__(self, length=SEQUENCE_LENGTH, dim=KEYPOINT_DIM, block=False):
+        self._data = np.zeros((length, dim), dtype=np.float32)
+        self._cond = threading.Condition()
+        self._meta = None
+        self.block = block
+        self.dropped = 0
+
+    def put(self, window, frame_id, timestamp):
+        with self._cond:
+            while self.block and self._meta is not None:
+                self._cond.wait()
+            if self._meta is not None:
+                self.dropped += 1
+            np.copyto(self._data, window)
+            self._meta = (frame_id, timestamp)
+            self._cond.notify_all()
+
+    def get(self, out, timeout=None):
+        """Copia la ventana en `out` y devuelve (frame_id, timestamp), o None si no hay."""
+        with self._cond:
+            if self._meta is None:
+                self._cond.wait(timeout)
+            if self._meta is None:
+                return None
+            np.copyto(out, self._data)
+            meta, self._meta = self._meta, None
+            self._cond.notify_all()
+            return meta
+
+    def clear(self):
+        with self._cond:
+            self._meta = None
+            self._cond.notify_all()
+
+
+class Stage(threading.Thread):
+    """Hilo de una etapa del pipeline con su propio medidor de FPS y de latencia."""
+
+    poll_timeout = 0.1
+
+    def __init__(self, name):
+        super().__init__(name=name, daemon=True)
+        self.meter = RateMeter()
+        self.timings = LatencyTracker()  # Duración del trabajo útil, sin las esperas en colas
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        self._stop_event.set()
+
+    @property
+    def stopped(self):
+        return self._stop_event.is_set()
+
+    def run(self):
+        while not self.stopped:
+            try:
+                if self.step():
+                    self.meter.tick()
+            except Exception as e:
+                print(f"Error en la etapa '{self.name}': {e}")
+                time.sleep(self.poll_timeout)
+
+    def step(self):
+        """Procesa un elemento. Devuelve True si produjo un resultado."""
+        raise NotImplementedError
+
+
+class CaptureStage(Stage):
+    """Lee frames de la cámara al ritmo nativo del dispositivo.
+
+    Cada frame se publica como (frame_id, instante, frame, instante de muestreo).
+    El instante de muestreo es el grabado si la fuente lo expone (`position`,
+    en las sesiones reproducidas) y, si no, el de captura.
+    """
+
+    def __init__(self, cap, out_queue):
+        super().__init__("captura")
+        self.cap = cap
+        self.out_queue = out_queue
+        self.frame_id = 0
+
+    def step(self):
+        start = time.perf_counter()
+        ret, frame = self.cap.read()
+        if not ret:
+            time.sleep(0.01)
+            return False
+        now = time.perf_counter()
+        self.timings.record(now - start, now)
+        position = getattr(self.cap, 'position', None)
+        self.out_queue.put((self.frame_id, now, frame, now if position is None else position))
+        self.frame_id += 1
+        return True
+
+
+class LandmarkStage(Stage):
+    """Ejecuta MediaPipe, mantiene la ventana de secuencia y publica el frame con sus keypoints.
+
+    `on_frame(frame, keypoints)` recibe el frame sin modificar: la superposición
+    de landmarks se dibuja al mostrarlo (ver utils/rendering.py).
+
+    La ventana avanza sobre la misma rejilla de `fps` muestras por segundo con
+    que se capturaron las secuencias de entrenamiento (ver `SequenceSampler`):
+    MediaPipe procesa todos los frames, pero solo los de la rejilla entran en la
+    ventana y solo entonces se publica. Con `fps=None` entra cada frame. Las
+    ventanas se publican con el número de muestra, no con el de frame, para que
+    el paso de inferencia y el predictor de streaming cuenten filas de la ventana.
+
+    Si se pasa una `gate` (ver utils/gating.py), solo se publican las ventanas
+    que la puerta deja pasar.
+    """
+
+    def __init__(self, process_fn, in_queue, out_window, on_frame=None, on_keypoints=None, gate=None,
+                 fps=LIVE_SAMPLE_FPS):
+        super().__init__("landmarks")
+        self.process_fn = process_fn
+        self.in_queue = in_queue
+        self.out_window = out_window
+        self.on_frame = on_frame
+        self.on_keypoints = on_keypoints
+        self.gate = gate
+        self.sequence = SequenceBuffer()
+        self.sampler = SequenceSampler(length=None, fps=fps) if fps else None
+        self.samples = 0     # Filas añadidas a la ventana
+        self._keypoints = np.zeros(KEYPOINT_DIM, dtype=np.float32)
+        self.processed = 0   # Frames terminados (también los que fallaron)
+        self.published = 0   # Ventanas enviadas a la inferencia
+
+    def step(self):
+        item = self.in_queue.get(timeout=self.poll_timeout)
+        if item is None:
+            return False
+        frame_id, timestamp, frame, sample_time = item
+
+        try:
+            with self.timings.time():
+                results = self.process_fn(frame)
+
+            slots = self._slots(sample_time)
+            if slots:
+                keypoints = self.sequence.push_results(results)
+                # Si se perdieron instantes de la rejilla, el frame los ocupa todos
+                for _ in range(slots - 1):
+                    keypoints = self.sequence.append(keypoints)
+                self.samples += slots
+            else:
+                keypoints = extract_keypoints(results, out=self._keypoints)
+            if self.on_frame is not None:
+                self.on_frame(frame, keypoints)
+            if self.on_keypoints is not None:
+                self.on_keypoints(frame_id, keypoints)
+            if slots and self.sequence.full:
+                window = self.sequence.window()
+                if self.gate is None or self.gate.should_run(window):
+                    self.published += 1
+                    self.out_window.put(window, self.samples, timestamp)
+        finally:
+            self.processed += 1
+        return True
+
+    def _slots(self, sample_time):
+        """Filas que aporta a la ventana el frame de `sample_time` (0 si cae fuera de la rejilla)."""
+        if self.sampler is None:
+            return 1
+        if not self.sampler.recording:
+            self.sampler.start('ventana', sample_time)
+        sample = self.sampler.offer(sample_time)
+        return min(len(sample[1]), self.sequence.length) if sample else 0
+
+
+class InferenceStage(Stage):
+    """Ejecuta el predictor sobre la ventana más reciente."""
+
+    def __init__(self, predictor, in_window, on_result=None):
+        super().__init__("inferencia")
+        self.predictor = predictor
+        self.in_window = in_window
+        self.on_result = on_result
+        self.last_latency = 0.0
+        self.end_to_end = LatencyTracker()
+        self.handled = 0   # Ventanas terminadas (también las omitidas o fallidas)
+        self._window = np.zeros((SEQUENCE_LENGTH, KEYPOINT_DIM), dtype=np.float32)
+
+    def step(self):
+        meta = self.in_window.get(self._window, timeout=self.poll_timeout)
+        if meta is None:
+            return False
+        try:
+            return self._handle(*meta)
+        finally:
+            self.handled += 1
+
+    def _handle(self, frame_id, timestamp):
+        start = time.perf_counter()
+        res = self.predictor.update(self._window, frame_id)
+        if res is None:
+            # El predictor omitió esta ventana por el paso de inferencia
+            return False
+        now = time.perf_counter()
+        self.timings.record(now - start, now)
+        # Latencia de extremo a extremo desde la captura del frame
+        self.last_latency = now - timestamp
+        self.end_to_end.record(self.last_latency, now)
+        if self.on_result is not None:
+            self.on_result(res)
+        return True
+
+
+class TranslationPipeline:
+    """Conecta las etapas de captura, landmarks e inferencia.
+
+    Con `lossless=True` ninguna etapa descarta trabajo: cada una espera a la
+    siguiente, como conviene al reproducir una sesión lo más rápido posible.
+    """
+
+    def __init__(self, cap, process_fn, predictor,
+                 on_frame=None, on_result=None, on_keypoints=None, queue_size=1,
+                 lossless=False, gate=None, sample_fps=LIVE_SAMPLE_FPS):
+        self.frames = LatestQueue(queue_size, block=lossless)
+        self.windows = LatestWindow(block=lossless)
+        self.capture = CaptureStage(cap, self.frames)
+        self.landmarks = LandmarkStage(process_fn, self.frames, self.windows,
+                                       on_frame=on_frame, on_keypoints=on_keypoints,
+                                       gate=gate, fps=sample_fps)
+        self.inference = InferenceStage(predictor, self.windows, on_result=on_result)
+        self.stages = [self.capture, self.landmarks, self.inference]
+
+    def start(self):
+        for stage in self.stages:
+            stage.start()
+
+    def drained(self, frames=None):
+        """True si landmarks e inferencia han terminado todo lo capturado.
+
+        Con `frames` se exige además que la captura haya entregado ese número de frames.
+        """
+        if frames is not None and self.capture.frame_id < frames:
+            return False
+        return (self.landmarks.processed + self.frames.dropped == self.capture.frame_id
+                and self.inference.handled + self.windows.dropped == self.landmarks.published)
+
+    def drain(self, frames=None, timeout=None):
+        """Espera a que el pipeline vacíe sus colas (fuentes finitas). Devuelve False si se agota `timeout`."""
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while not self.drained(frames):
+            if deadline is not None and time.perf_counter() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def stop(self, timeout=2.0):
+        for stage in self.stages:
+            stage.stop()
+        # Libera a los productores que esperan sitio en modo sin pérdidas
+        self.frames.clear()
+        self.windows.clear()
+        for stage in self.stages:
+            if stage.is_alive():
+                stage.join(timeout)
+
+    def stats(self):
+        """FPS por etapa, latencia de la última predicción, frames descartados y ventanas filtradas."""
+        gate = self.landmarks.gate
+        return {
+            "capture_fps": self.capture.meter.rate,
+            "landmark_fps": self.landmarks.meter.rate,
+            "inference_fps": self.inference.meter.rate,
+            "latency_ms": self.inference.last_latency * 1000,
+            "dropped_frames": self.frames.dropped,
+            "dropped_windows": self.windows.dropped,
+            "gate_executed": gate.executed if gate else 0,
+            "gate_skipped_idle": gate.skipped_idle if gate else 0,
+            "gate_skipped_still": gate.skipped_still if gate else 0,
+        }
+
+    def timings(self):
+        """Latencia p50/p95 y FPS de cada etapa, más la latencia de extremo a extremo."""
+        return {
+            "capture": self.capture.timings.summary(),
+            "mediapipe": self.landmarks.timings.summary(),
+            "inference": self.inference.timings.summary(),
+            "end_to_end": self.inference.end_to_end.summary(),
+        }
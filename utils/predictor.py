@@ -0,0 +1,336 @@
+"""
+Predictores de baja latencia para el modelo de señas.
+
+`model.predict()` de Keras está pensado para lotes grandes: con una sola
+muestra casi todo el tiempo se va en preparar el bucle de predicción. Aquí el
+paso hacia adelante se traza una sola vez con una firma fija
+(1, SEQUENCE_LENGTH, KEYPOINT_DIM) y se reutiliza el mismo buffer de entrada.
+
+Hay cuatro backends con la misma interfaz:
+- `keras`: carga `actions.keras` con TensorFlow.
+- `tflite`: carga `actions.tflite` con el intérprete ligero (`tflite-runtime`),
+  sin importar TensorFlow.
+- `streaming`: carga `actions_streaming.tflite`, la versión de un paso del
+  modelo recurrente, y en tiempo real procesa solo los frames nuevos de cada
+  ventana manteniendo el estado entre llamadas.
+- `embedding`: carga `actions_embedding.tflite` y clasifica por vecino más
+  cercano en `embedding_index.npz`, con las señas registradas por
+  `src/enroll_sign.py`.
+"""
+import json
+import os
+
+import numpy as np
+
+from utils.constants import SEQUENCE_LENGTH, KEYPOINT_DIM, MODELS_PATH, INFERENCE_STRIDE, MODEL_BACKEND
+
+BACKENDS = ('auto', 'keras', 'tflite', 'streaming', 'embedding')
+
+
+def load_tflite_interpreter(model_path, num_threads=None):
+    """Crea un intérprete TFLite usando el runtime más ligero disponible."""
+    try:
+        from tflite_runtime.interpreter import Interpreter
+    except ImportError:
+        try:
+            from ai_edge_litert.interpreter import Interpreter
+        except ImportError:
+            # Último recurso: el intérprete incluido en TensorFlow
+            from tensorflow.lite.python.interpreter import Interpreter
+    return Interpreter(model_path=model_path, num_threads=num_threads)
+
+
+def tflite_runtime_available():
+    for module in ('tflite_runtime', 'ai_edge_litert'):
+        try:
+            __import__(module)
+            return True
+        except ImportError:
+            continue
+    return False
+
+
+class BasePredictor:
+    """Lógica común: buffer de entrada reutilizado y paso de inferencia."""
+
+    # True si `predict_batch` puntúa todo el lote en una sola pasada del modelo
+    batched = False
+
+    def __init__(self, stride=INFERENCE_STRIDE):
+        self.stride = max(1, int(stride))
+        self._input = np.zeros((1, SEQUENCE_LENGTH, KEYPOINT_DIM), dtype=np.float32)
+        self._last_frame_id = None
+        self._calls = 0
+        self.last_result = None
+
+    def _forward(self):
+        """Ejecuta el modelo sobre `self._input` y devuelve las probabilidades."""
+        raise NotImplementedError
+
+    def predict(self, window):
+        """Devuelve las probabilidades de una ventana (SEQUENCE_LENGTH, KEYPOINT_DIM)."""
+        self._input[0] = window
+        self.last_result = self._forward()
+        return self.last_result
+
+    def predict_batch(self, windows):
+        """Probabilidades de un lote (N, SEQUENCE_LENGTH, KEYPOINT_DIM) → (N, num_clases)."""
+        return np.stack([self.predict(window).copy() for window in windows])
+
+    def update(self, window, frame_id=None):
+        """Predice solo cada `stride` frames; devuelve None cuando se omite la inferencia.
+
+        Si se indica `frame_id` (el número de muestra de la ventana que publica
+        el pipeline), el paso se mide en muestras y no en llamadas, de modo que
+        las ventanas descartadas no alteran el ritmo.
+        """
+        if frame_id is None:
+            frame_id = self._calls
+            self._calls += 1
+        if self._last_frame_id is not None and 0 <= frame_id - self._last_frame_id < self.stride:
+            return None
+        self._last_frame_id = frame_id
+        return self.predict(window)
+
+    def reset(self):
+        self._last_frame_id = None
+        self._calls = 0
+        self.last_result = None
+
+    def end_segment(self):
+        """Avisa de que se aceptó una palabra; los predictores con estado empiezan de cero."""
+
+    def warmup(self):
+        """Ejecuta una pasada con una entrada vacía para que la primera predicción sea rápida."""
+        self._input[:] = 0
+        self._forward()
+
+
+class KerasPredictor(BasePredictor):
+    """Ejecuta el modelo Keras mediante un `tf.function` compilado."""
+
+    backend = 'keras'
+    batched = True
+
+    def __init__(self, model_path=f'{MODELS_PATH}/actions.keras', stride=INFERENCE_STRIDE,
+                 jit_compile=False):
+        super().__init__(stride)
+        import tensorflow as tf
+
+        self.model = tf.keras.models.load_model(model_path)
+        self._compiled = tf.function(
+            lambda x: self.model(x, training=False),
+            input_signature=[tf.TensorSpec((1, SEQUENCE_LENGTH, KEYPOINT_DIM), tf.float32)],
+            jit_compile=jit_compile,
+        )
+        # Variante con lote variable para procesar muchas ventanas en una sola pasada
+        self._compiled_batch = tf.function(
+            lambda x: self.model(x, training=False),
+            input_signature=[tf.TensorSpec((None, SEQUENCE_LENGTH, KEYPOINT_DIM), tf.float32)],
+            jit_compile=jit_compile,
+        )
+
+    def _forward(self):
+        return self._compiled(self._input).numpy()[0]
+
+    def predict_batch(self, windows):
+        windows = np.asarray(windows, dtype=np.float32)
+        return self._compiled_batch(windows).numpy()
+
+
+class TFLitePredictor(BasePredictor):
+    """Ejecuta `actions.tflite` con el intérprete TFLite, sin TensorFlow.
+
+    El modelo se exporta con lote fijo de 1 (el delegado XNNPACK no admite
+    redimensionarlo), así que `predict_batch` recorre las ventanas una a una.
+    """
+
+    backend = 'tflite'
+
+    def __init__(self, model_path=f'{MODELS_PATH}/actions.tflite', stride=INFERENCE_STRIDE,
+                 num_threads=None):
+        super().__init__(stride)
+        self.interpreter = load_tflite_interpreter(model_path, num_threads=num_threads)
+        self.interpreter.allocate_tensors()
+        self._input_index = self.interpreter.get_input_details()[0]['index']
+        self._output_index = self.interpreter.get_output_details()[0]['index']
+
+    def _forward(self):
+        self.interpreter.set_tensor(self._input_index, self._input)
+        self.interpreter.invoke()
+        return self.interpreter.get_tensor(self._output_index)[0]
+
+
+class StreamingPredictor(BasePredictor):
+    """Ejecuta `actions_streaming.tflite` frame a frame, arrastrando el estado recurrente.
+
+    `update` solo pasa al modelo los frames de la ventana que no ha visto aún
+    (según `frame_id`, el número de muestra de la ventana), así que el coste por frame no depende de la longitud de
+    la ventana. El estado se reinicia:
+    - tras `idle_frames` frames seguidos sin manos;
+    - cuando entre dos ventanas faltan más frames de los que caben en una
+      (por ejemplo, porque la puerta de inferencia omitió un periodo sin manos);
+    - al llamar a `end_segment` o `reset`, desde cualquier hilo: el reinicio
+      se aplica en la siguiente llamada a `update`.
+
+    `predict` recorre la ventana completa desde el estado cero, lo que equivale
+    al modelo de ventana; así `predict_batch` y los servicios siguen funcionando.
+    """
+
+    backend = 'streaming'
+
+    def __init__(self, model_path=f'{MODELS_PATH}/actions_streaming.tflite', stride=INFERENCE_STRIDE,
+                 num_threads=None, idle_frames=SEQUENCE_LENGTH):
+        super().__init__(stride)
+        self.idle_frames = idle_frames
+        self.interpreter = load_tflite_interpreter(model_path, num_threads=num_threads)
+        self.interpreter.allocate_tensors()
+        # Las entradas y salidas se identifican por nombre en la firma exportada
+        runner = self.interpreter.get_signature_runner()
+        inputs, outputs = runner.get_input_details(), runner.get_output_details()
+        self._frame_index = inputs['keypoints']['index']
+        self._state_index = inputs['state']['index']
+        self._probs_index = outputs['output_0']['index']
+        self._new_state_index = outputs['output_1']['index']
+        self._frame = np.zeros((1, KEYPOINT_DIM), dtype=np.float32)
+        self._state = np.zeros(inputs['state']['shape'], dtype=np.float32)
+        self._last_fed = None
+        self._idle = 0
+        self._reset_pending = False
+
+    def _step(self, keypoints):
+        self._frame[0] = keypoints
+        self.interpreter.set_tensor(self._frame_index, self._frame)
+        self.interpreter.set_tensor(self._state_index, self._state)
+        self.interpreter.invoke()
+        np.copyto(self._state, self.interpreter.get_tensor(self._new_state_index))
+        return self.interpreter.get_tensor(self._probs_index)[0]
+
+    def _clear(self):
+        self._state[:] = 0
+        self._last_fed = None
+        self._idle = 0
+
+    def _forward(self):
+        self._clear()
+        for keypoints in self._input[0]:
+            result = self._step(keypoints)
+        return result
+
+    def update(self, window, frame_id=None):
+        if frame_id is None:
+            frame_id = self._calls
+            self._calls += 1
+        if self._reset_pending:
+            self._reset_pending = False
+            self._clear()
+
+        new = len(window) if self._last_fed is None else frame_id - self._last_fed
+        if new <= 0:
+            return None
+        if new > len(window):
+            self._clear()
+            new = len(window)
+        self._last_fed = frame_id
+
+        result = None
+        for keypoints in window[-new:]:
+            if keypoints.any():
+                self._idle = 0
+            else:
+                self._idle += 1
+                if self._idle >= self.idle_frames:
+                    # Sin manos durante un rato: la próxima seña empieza desde cero
+                    self._state[:] = 0
+                    continue
+            result = self._step(keypoints)
+        if result is None:
+            return None
+        # El estado avanza en cada frame; el paso solo espacia los resultados
+        if self._last_frame_id is not None and 0 <= frame_id - self._last_frame_id < self.stride:
+            return None
+        self._last_frame_id = frame_id
+        self.last_result = result
+        return result
+
+    def reset(self):
+        super().reset()
+        self._reset_pending = True
+
+    def end_segment(self):
+        self._reset_pending = True
+
+    def warmup(self):
+        super().warmup()
+        self._clear()
+
+
+class EmbeddingPredictor(TFLitePredictor):
+    """Calcula el embedding de la ventana y lo compara con las señas de un `EmbeddingIndex`.
+
+    Devuelve una distribución sobre las señas del índice (softmax de las
+    similitudes), así que se usa como los demás predictores con
+    `load_label_map(models_path, predictor)`.
+    """
+
+    backend = 'embedding'
+
+    def __init__(self, model_path=f'{MODELS_PATH}/actions_embedding.tflite',
+                 index_path=f'{MODELS_PATH}/embedding_index.npz', stride=INFERENCE_STRIDE, num_threads=None):
+        from utils.embedding_index import EmbeddingIndex, extractor_fingerprint
+
+        super().__init__(model_path, stride=stride, num_threads=num_threads)
+        self.index = EmbeddingIndex.load(index_path)
+        if not len(self.index):
+            raise ValueError(f"El índice '{index_path}' no tiene señas registradas")
+        dim = self.interpreter.get_output_details()[0]['shape'][-1]
+        if self.index.dim != dim or self.index.extractor not in (None, extractor_fingerprint(model_path)):
+            raise ValueError(f"El índice '{index_path}' se registró con otro extractor; "
+                             f"vuelve a ejecutar 'python src/enroll_sign.py --all'")
+
+    def embed(self, window):
+        """Embedding (dim,) de una ventana."""
+        self._input[0] = window
+        return super()._forward().copy()
+
+    def _forward(self):
+        return self.index.probabilities(super()._forward())
+
+
+def load_label_map(models_path=MODELS_PATH, predictor=None):
+    """Mapa {índice: seña} de las salidas del predictor.
+
+    Para el backend `embedding` son las señas del índice; para los demás, `label_map.json`.
+    """
+    if isinstance(predictor, EmbeddingPredictor):
+        return {str(i): label for i, label in enumerate(predictor.index.labels)}
+    with open(os.path.join(models_path, 'label_map.json'), 'r') as f:
+        return json.load(f)
+
+
+def resolve_backend(backend=MODEL_BACKEND, models_path=MODELS_PATH):
+    """Backend concreto que usará `load_predictor`.
+
+    Con `auto` se usa TFLite si existe `actions.tflite` y hay un runtime
+    ligero instalado; en caso contrario se recurre a Keras.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend desconocido '{backend}'. Opciones: {', '.join(BACKENDS)}")
+    if backend == 'auto':
+        tflite_path = os.path.join(models_path, 'actions.tflite')
+        return 'tflite' if os.path.exists(tflite_path) and tflite_runtime_available() else 'keras'
+    return backend
+
+
+def load_predictor(backend=MODEL_BACKEND, models_path=MODELS_PATH, stride=INFERENCE_STRIDE):
+    """Crea el predictor del backend indicado (ver `resolve_backend`)."""
+    backend = resolve_backend(backend, models_path)
+    tflite_path = os.path.join(models_path, 'actions.tflite')
+    if backend == 'tflite':
+        return TFLitePredictor(tflite_path, stride=stride)
+    if backend == 'streaming':
+        return StreamingPredictor(os.path.join(models_path, 'actions_streaming.tflite'), stride=stride)
+    if backend == 'embedding':
+        return EmbeddingPredictor(os.path.join(models_path, 'actions_embedding.tflite'),
+                                  os.path.join(models_path, 'embedding_index.npz'), stride=stride)
+    return KerasPredictor(os.path.join(models_path, 'actions.keras'), stride=stride)
@@ -0,0 +1,71 @@
+"""
+Renderizado del video en la GUI a resolución de pantalla.
+
+El frame de la cámara se escala una sola vez, con interpolación lineal, a un
+buffer reutilizado del tamaño del widget. La superposición de landmarks se
+dibuja después sobre ese buffer a partir del vector de keypoints, así que ni
+la conversión de color ni el dibujo trabajan a la resolución de la cámara.
+La GUI llama al renderizador desde un temporizador a DISPLAY_MAX_FPS, así que
+el refresco de pantalla queda limitado por separado del procesamiento.
+"""
+import cv2
+import numpy as np
+from PyQt5.QtGui import QImage
+
+from utils.keypoints import LANDMARKS_PER_HAND, HAND_DIM, MAX_HANDS
+
+# Conexiones entre landmarks de una mano (equivalente a mp.solutions.hands.HAND_CONNECTIONS)
+HAND_CONNECTIONS = (
+    (0, 1), (1, 2), (2, 3), (3, 4),
+    (0, 5), (5, 6), (6, 7), (7, 8),
+    (5, 9), (9, 10), (10, 11), (11, 12),
+    (9, 13), (13, 14), (14, 15), (15, 16),
+    (13, 17), (0, 17), (17, 18), (18, 19), (19, 20),
+)
+_CONNECTIONS = np.array(HAND_CONNECTIONS)
+# Colores en BGR, como el frame de la cámara
+CONNECTION_COLOR = (200, 200, 200)
+LANDMARK_COLORS = ((80, 175, 76), (0, 152, 255))  # Una por mano
+
+
+class FrameRenderer:
+    """Escala el frame y dibuja los landmarks en un buffer reutilizado a tamaño de pantalla."""
+
+    def __init__(self):
+        self._buffer = None
+        self._bgra = None
+
+    def render(self, frame, keypoints, width, height):
+        """Devuelve un QImage de `frame` ajustado a (width, height) con la superposición de manos.
+
+        El QImage apunta al buffer interno: hay que copiarlo (por ejemplo con
+        `QPixmap.fromImage`) antes del siguiente `render`.
+        """
+        h, w = frame.shape[:2]
+        scale = min(width / w, height / h)
+        size = (max(1, int(w * scale)), max(1, int(h * scale)))
+        if self._buffer is None or self._buffer.shape[1::-1] != size:
+            self._buffer = np.empty((size[1], size[0], 3), dtype=np.uint8)
+            self._bgra = np.empty((size[1], size[0], 4), dtype=np.uint8)
+
+        cv2.resize(frame, size, dst=self._buffer, interpolation=cv2.INTER_LINEAR)
+        if keypoints is not None:
+            draw_hands(self._buffer, keypoints)
+
+        # BGRA en memoria es el formato nativo de Qt (RGB32): QPixmap lo adopta sin convertir
+        cv2.cvtColor(self._buffer, cv2.COLOR_BGR2BGRA, dst=self._bgra)
+        return QImage(self._bgra.data, size[0], size[1], self._bgra.strides[0], QImage.Format_RGB32)
+
+
+def draw_hands(image, keypoints):
+    """Dibuja las manos de un vector de keypoints (coordenadas normalizadas) sobre `image`."""
+    h, w = image.shape[:2]
+    for i in range(MAX_HANDS):
+        hand = keypoints[i * HAND_DIM:(i + 1) * HAND_DIM]
+        if not hand.any():
+            continue
+        points = (hand.reshape(LANDMARKS_PER_HAND, 3)[:, :2] * (w, h)).astype(np.int32)
+        # Sin antialiasing: a resolución de pantalla apenas se nota y cuesta el triple
+        cv2.polylines(image, list(points[_CONNECTIONS]), False, CONNECTION_COLOR, 2)
+        for x, y in points:
+            cv2.circle(image, (int(x), int(y)), 3, LANDMARK_COLORS[i], -1)
@@ -0,0 +1,131 @@
+"""
+Seguimiento de la región de las manos y resolución adaptativa antes de MediaPipe.
+
+En lugar de convertir y procesar el frame completo en cada paso:
+- sin manos conocidas, MediaPipe se ejecuta sobre el frame reducido (detección);
+- con manos, solo se recorta, convierte y procesa la región alrededor de los
+  landmarks del frame anterior (seguimiento), reescalada a un tamaño fijo.
+
+Los landmarks se devuelven en coordenadas normalizadas del frame completo,
+igual que si MediaPipe hubiera procesado el frame entero, así que
+`extract_keypoints` y el modelo reciben el mismo vector de KEYPOINT_DIM.
+
+En seguimiento MediaPipe ve siempre una imagen centrada en las manos, así que
+su propio seguimiento entre frames sigue funcionando; cuando las manos salen
+de la región se vuelve a detectar en el frame reducido, y cada
+`redetect_interval` frames también, para descubrir manos nuevas.
+
+Si se fija `target_fps`, la escala de procesamiento baja cuando MediaPipe no
+llega al presupuesto por frame y vuelve a subir cuando sobra tiempo.
+"""
+import time
+
+import cv2
+import numpy as np
+
+from utils.constants import ROI_DETECT_WIDTH
+
+
+class RoiHandTracker:
+    """Envuelve una instancia de `mp.solutions.hands.Hands` con recorte por región de interés."""
+
+    def __init__(self, hands, detect_width=ROI_DETECT_WIDTH, roi_size=256, margin=0.3, redetect_interval=30,
+                 target_fps=None, min_scale=0.4, smoothing=0.8):
+        self.hands = hands
+        self.detect_width = detect_width
+        self.roi_size = roi_size
+        self.margin = margin
+        self.redetect_interval = redetect_interval
+        self.target_fps = target_fps
+        self.min_scale = min_scale
+        self.smoothing = smoothing
+        self.scale = 1.0
+        self.roi = None              # (x0, y0, x1, y1) en píxeles del frame completo
+        self.mode = 'detect'
+        self.detections = 0
+        self.tracked = 0
+        self._since_detect = 0
+        self._avg_time = None
+
+    def process(self, frame):
+        """Procesa un frame BGR y devuelve los resultados de MediaPipe en coordenadas del frame."""
+        start = time.perf_counter()
+        results = None
+        if self.roi is not None and self._since_detect < self.redetect_interval:
+            results = self._track(frame)
+        if results is None:
+            results = self._detect(frame)
+        self._update_roi(frame.shape, results)
+        self._adapt(time.perf_counter() - start)
+        return results
+
+    def reset(self):
+        self.roi = None
+        self.mode = 'detect'
+        self._since_detect = 0
+
+    def _detect(self, frame):
+        self.mode = 'detect'
+        self.detections += 1
+        self._since_detect = 0
+        h, w = frame.shape[:2]
+        width = int(self.detect_width * self.scale)
+        if width < w:
+            small = cv2.resize(frame, (width, int(h * width / w)), interpolation=cv2.INTER_AREA)
+        else:
+            small = frame
+        # Las coordenadas normalizadas no dependen de la resolución: no hay que mapearlas
+        return self.hands.process(cv2.cvtColor(small, cv2.COLOR_BGR2RGB))
+
+    def _track(self, frame):
+        x0, y0, x1, y1 = self.roi
+        crop = frame[y0:y1, x0:x1]
+        size = int(self.roi_size * self.scale)
+        cw, ch = x1 - x0, y1 - y0
+        factor = size / max(cw, ch)
+        if factor < 1:
+            crop = cv2.resize(crop, (max(1, int(cw * factor)), max(1, int(ch * factor))),
+                              interpolation=cv2.INTER_AREA)
+        results = self.hands.process(cv2.cvtColor(crop, cv2.COLOR_BGR2RGB))
+        if not results.multi_hand_landmarks:
+            # Las manos salieron de la región: se vuelve a detectar en este mismo frame
+            return None
+        self.mode = 'track'
+        self.tracked += 1
+        self._since_detect += 1
+
+        h, w = frame.shape[:2]
+        for hand in results.multi_hand_landmarks:
+            for lm in hand.landmark:
+                lm.x = (x0 + lm.x * cw) / w
+                lm.y = (y0 + lm.y * ch) / h
+                # z usa la misma escala que x
+                lm.z = lm.z * cw / w
+        return results
+
+    def _update_roi(self, shape, results):
+        if not results.multi_hand_landmarks:
+            self.roi = None
+            return
+        h, w = shape[:2]
+        coords = np.array([(lm.x, lm.y) for hand in results.multi_hand_landmarks for lm in hand.landmark])
+        (x_min, y_min), (x_max, y_max) = coords.min(axis=0) * (w, h), coords.max(axis=0) * (w, h)
+        # Región cuadrada con margen, para que la mano quepa aunque se mueva entre frames
+        side = max(x_max - x_min, y_max - y_min) * (1 + 2 * self.margin)
+        cx, cy = (x_min + x_max) / 2, (y_min + y_max) / 2
+        x0, y0 = int(max(0, cx - side / 2)), int(max(0, cy - side / 2))
+        x1, y1 = int(min(w, cx + side / 2)), int(min(h, cy + side / 2))
+        self.roi = (x0, y0, x1, y1) if x1 - x0 > 1 and y1 - y0 > 1 else None
+
+    def _adapt(self, elapsed):
+        if self.target_fps is None:
+            return
+        if self._avg_time is None:
+            self._avg_time = elapsed
+        else:
+            self._avg_time = self.smoothing * self._avg_time + (1 - self.smoothing) * elapsed
+        budget = 1.0 / self.target_fps
+        if self._avg_time > budget:
+            self.scale = max(self.min_scale, self.scale * 0.9)
+        elif self._avg_time < 0.6 * budget:
+            self.scale = min(1.0, self.scale * 1.05)
@@ -1,6 +1,192 @@
+"""
+Síntesis de voz con un único hilo de trabajo.
+
+Inicializar `pyttsx3` cuesta cientos de milisegundos y varios motores a la
+vez solapan el audio, así que un solo `SpeechWorker` mantiene el motor vivo y
+atiende una cola acotada:
+- si la misma frase ya está pendiente no se vuelve a encolar;
+- si la cola está llena se descarta la frase más antigua;
+- las frases que llevan demasiado tiempo esperando se descartan.
+
+Opcionalmente cada etiqueta se pre-renderiza a un .wav al arrancar, y hablar
+se reduce a reproducir el archivo con `pygame`.
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import deque
+
 import pyttsx3
 
+from utils.constants import TTS_CACHE_PATH
+
+
+class SpeechWorker(threading.Thread):
+    """Hilo de síntesis de voz con cola acotada, fusión y cancelación de frases."""
+
+    def __init__(self, max_pending=2, max_age=2.0, cache_path=TTS_CACHE_PATH):
+        super().__init__(name="tts", daemon=True)
+        self.max_age = max_age
+        self.cache_path = cache_path
+        self._queue = deque(maxlen=max_pending)
+        self._cond = threading.Condition()
+        self._prerender = []
+        self._cache = {}
+        self._running = True
+        self._generation = 0  # Se incrementa al cancelar para cortar la frase en curso
+        self._speaking_generation = None  # Generación de la frase dentro de `runAndWait`
+        self.engine = None
+        self.mixer = None
+        self.spoken = 0
+        self.dropped = 0
+
+    def say(self, text):
+        with self._cond:
+            if any(pending == text for pending, _ in self._queue):
+                return
+            if len(self._queue) == self._queue.maxlen:
+                self.dropped += 1
+            self._queue.append((text, time.monotonic()))
+            self._cond.notify()
+
+    def prerender(self, texts):
+        """Pide renderizar `texts` a audio en segundo plano para reproducirlos después."""
+        if self.cache_path is None:
+            return
+        with self._cond:
+            self._prerender.extend(texts)
+            self._cond.notify()
+
+    def cancel(self):
+        """Descarta las frases pendientes y corta la frase en curso, pre-renderizada o no."""
+        with self._cond:
+            self.dropped += len(self._queue)
+            self._queue.clear()
+            self._generation += 1
+        if self.mixer is not None:
+            self.mixer.stop()
+        # La frase del motor la corta el propio hilo de voz en `_on_word`:
+        # pyttsx3 no admite llamadas desde otro hilo
+
+    def stop(self, timeout=2.0):
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        self.cancel()
+        if self.is_alive():
+            self.join(timeout)
+
+    def run(self):
+        # El motor debe crearse y usarse siempre en el mismo hilo
+        try:
+            self.engine = pyttsx3.init()
+            self.engine.connect('started-word', self._on_word)
+        except Exception as e:
+            print(f"Error en TTS: {e}")
+            return
+        self.mixer = self._init_mixer() if self.cache_path else None
+
+        while True:
+            with self._cond:
+                while self._running and not self._queue and not self._prerender:
+                    self._cond.wait()
+                if not self._running:
+                    break
+                if self._prerender:
+                    texts, self._prerender = self._prerender, []
+                    item = None
+                else:
+                    item = self._queue.popleft()
+                    generation = self._generation
+
+            if item is None:
+                self._render_cache(texts)
+                continue
+
+            text, queued_at = item
+            if time.monotonic() - queued_at > self.max_age:
+                with self._cond:
+                    self.dropped += 1
+                continue
+            try:
+                self._speak(text, generation)
+                self.spoken += 1
+            except Exception as e:
+                print(f"Error en TTS: {e}")
+
+    def _speak(self, text, generation):
+        sound = self._cache.get(text)
+        if sound is not None:
+            channel = sound.play()
+            while channel is not None and channel.get_busy():
+                if generation != self._generation:
+                    channel.stop()
+                    break
+                time.sleep(0.01)
+            return
+        with self._cond:
+            if generation != self._generation:
+                return
+            self._speaking_generation = generation
+        try:
+            self.engine.say(text)
+            self.engine.runAndWait()
+        finally:
+            with self._cond:
+                self._speaking_generation = None
+
+    def _on_word(self, name, location, length):
+        """Callback de pyttsx3 en cada palabra: corta la frase si se canceló desde otro hilo."""
+        with self._cond:
+            cancelled = self._speaking_generation not in (None, self._generation)
+        if cancelled:
+            # Se ejecuta dentro de `runAndWait`, en el hilo del motor
+            self.engine.stop()
+
+    @staticmethod
+    def _init_mixer():
+        try:
+            import pygame
+            pygame.mixer.init()
+            return pygame.mixer
+        except Exception as e:
+            print(f"Caché de voz desactivada (pygame no disponible): {e}")
+            return None
+
+    def _cache_file(self, text):
+        key = hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.cache_path, f"{key}.wav")
+
+    def _render_cache(self, texts):
+        if self.mixer is None:
+            return
+        os.makedirs(self.cache_path, exist_ok=True)
+        missing = [t for t in texts if not os.path.exists(self._cache_file(t))]
+        for text in missing:
+            self.engine.save_to_file(text, self._cache_file(text))
+        if missing:
+            self.engine.runAndWait()
+        for text in texts:
+            try:
+                self._cache[text] = self.mixer.Sound(self._cache_file(text))
+            except Exception as e:
+                print(f"No se pudo cargar el audio de '{text}': {e}")
+
+
+_default_worker = None
+_default_lock = threading.Lock()
+
+
+def get_speech_worker():
+    """Devuelve el `SpeechWorker` compartido del proceso, arrancándolo si hace falta."""
+    global _default_worker
+    with _default_lock:
+        if _default_worker is None or not _default_worker.is_alive():
+            _default_worker = SpeechWorker()
+            _default_worker.start()
+        return _default_worker
+
+
 def speak(text):
-    engine = pyttsx3.init()
-    engine.say(text)
-    engine.runAndWait()
\ No newline at end of file
+    get_speech_worker().say(text)
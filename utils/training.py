@@ -0,0 +1,120 @@
+"""
+Utilidades de entrenamiento: pipeline `tf.data` en streaming y registro de rendimiento.
+"""
+import time
+
+import numpy as np
+import tensorflow as tf
+
+from utils.augmentation import augment_batch
+from utils.constants import SEQUENCE_LENGTH, KEYPOINT_DIM
+
+
+def make_dataset(X, y, indices, batch_size=32, training=True, augment=True, seed=None):
+    """Crea un `tf.data.Dataset` que lee los lotes de X (array o memmap) bajo demanda.
+
+    Solo se baraja la lista de índices; cada lote se copia desde X al
+    consumirse, así que el dataset completo nunca se materializa en memoria.
+    """
+    indices = np.asarray(indices, dtype=np.int64)
+    y = np.asarray(y, dtype=np.float32)
+    num_classes = y.shape[1]
+
+    def gather(batch_indices):
+        # memmap admite indexación con arrays ordenados de forma eficiente
+        batch_indices = np.sort(batch_indices)
+        return np.asarray(X[batch_indices], dtype=np.float32), y[batch_indices]
+
+    def load(batch_indices):
+        xb, yb = tf.numpy_function(gather, [batch_indices], [tf.float32, tf.float32])
+        xb.set_shape([None, SEQUENCE_LENGTH, KEYPOINT_DIM])
+        yb.set_shape([None, num_classes])
+        return xb, yb
+
+    ds = tf.data.Dataset.from_tensor_slices(indices)
+    if training:
+        ds = ds.shuffle(len(indices), seed=seed, reshuffle_each_iteration=True)
+    ds = ds.batch(batch_size).map(load, num_parallel_calls=tf.data.AUTOTUNE)
+    if training and augment:
+        ds = ds.map(lambda xb, yb: (augment_batch(xb), yb), num_parallel_calls=tf.data.AUTOTUNE)
+    return ds.prefetch(tf.data.AUTOTUNE)
+
+
+class ThroughputLogger(tf.keras.callbacks.Callback):
+    """Registra las muestras de entrenamiento por segundo de cada época (sin contar la validación)."""
+
+    def __init__(self, num_samples, verbose=True):
+        super().__init__()
+        self.num_samples = num_samples
+        self.verbose = verbose
+        self.history = []
+        self._start = None
+        self._train_time = 0.0
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self._start = time.perf_counter()
+        self._train_time = None
+
+    def on_test_begin(self, logs=None):
+        # La validación de `fit` empieza al terminar los lotes de entrenamiento
+        if self._start is not None and self._train_time is None:
+            self._train_time = time.perf_counter() - self._start
+
+    def on_epoch_end(self, epoch, logs=None):
+        train_time = self._train_time or (time.perf_counter() - self._start)
+        samples_per_sec = self.num_samples / train_time
+        self.history.append(samples_per_sec)
+        if logs is not None:
+            logs['samples_per_sec'] = samples_per_sec
+        if self.verbose:
+            print(f"  Época {epoch + 1}: {samples_per_sec:.0f} muestras/s")
+
+
+class MagnitudePruning(tf.keras.callbacks.Callback):
+    """Poda por magnitud: anula los pesos más pequeños de cada matriz y los mantiene a cero.
+
+    La dispersión sube de 0 a `target_sparsity` a lo largo de `ramp_epochs`
+    épocas (calendario cúbico, como en tfmot); las máscaras se recalculan al
+    inicio de cada época y se aplican tras cada lote. Solo se podan matrices
+    de pesos (kernels), no los sesgos.
+    """
+
+    def __init__(self, target_sparsity=0.5, ramp_epochs=1):
+        super().__init__()
+        self.target_sparsity = target_sparsity
+        self.ramp_epochs = max(1, ramp_epochs)
+        self._masks = []
+
+    def sparsity_at(self, epoch):
+        progress = min(1.0, (epoch + 1) / self.ramp_epochs)
+        return self.target_sparsity * (1 - (1 - progress) ** 3)
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self._masks = compute_pruning_masks(self.model, self.sparsity_at(epoch))
+        self._apply()
+
+    def on_train_batch_end(self, batch, logs=None):
+        self._apply()
+
+    def _apply(self):
+        for variable, mask in self._masks:
+            variable.assign(variable * mask)
+
+
+def compute_pruning_masks(model, sparsity):
+    """Devuelve [(variable, máscara)] que anulan la fracción `sparsity` de menor magnitud de cada kernel."""
+    masks = []
+    for variable in model.trainable_variables:
+        if len(variable.shape) < 2:
+            continue
+        values = np.abs(variable.numpy())
+        threshold = np.quantile(values, sparsity) if sparsity > 0 else -1.0
+        masks.append((variable, (values > threshold).astype(values.dtype)))
+    return masks
+
+
+def model_sparsity(model):
+    """Fracción de pesos a cero en las matrices del modelo."""
+    kernels = [v.numpy() for v in model.trainable_variables if len(v.shape) >= 2]
+    total = sum(k.size for k in kernels)
+    return sum(int((k == 0).sum()) for k in kernels) / total if total else 0.0